@@ -1,9 +1,42 @@
+import os
+import sys
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import datetime
 
+# Make the shared market_core package importable when this folder runs standalone
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from market_core.cache import cached_price_matrix
+from market_core.metrics import phase
+from market_core.render import data_fingerprint, render_figure
+from portfolio_engine import parse_weights, normalize_weights, common_window, portfolio_values, portfolio_metrics
+from optimizer import STRATEGIES, monte_carlo_frontier, optimal_weights, portfolio_point, return_stats
+
+# Default sidebar inputs (also precomputed by market_core.warmup)
+DEFAULT_TICKERS = "AAPL,MSFT,RELIANCE.NS"
+DEFAULT_LOOKBACK_DAYS = 100
+
+FRONTIER_SAMPLES = 100_000
+# Random portfolios drawn on the frontier chart (all samples are still scored)
+FRONTIER_PLOT_POINTS = 5_000
+
+def draw_frontier(fig, frontier, markers):
+    ax = fig.subplots()
+    step = max(1, len(frontier["volatility"]) // FRONTIER_PLOT_POINTS)
+    points = ax.scatter(frontier["volatility"][::step], frontier["returns"][::step],
+                        c=frontier["sharpe"][::step], cmap="viridis", s=4, alpha=0.6)
+    fig.colorbar(points, ax=ax, label="Sharpe Ratio")
+    for label, (ret, vol, _), style in markers:
+        ax.scatter([vol], [ret], marker=style, s=160, edgecolors="black", label=label, zorder=3)
+    ax.set_xlabel("Annualized Volatility")
+    ax.set_ylabel("Annualized Return")
+    ax.grid(True, alpha=0.2)
+    ax.legend(loc="best")
+
 def main():
     st.set_page_config(page_title="Welcome Quantum AI Portfolio", layout="wide")
 
@@ -64,76 +97,71 @@ def main():
     st.title("🧠 Welcome to Quantum AI Portfolio Dashboard")
 
     # Sidebar inputs
-    tickers = st.sidebar.text_input("Enter Ticker Symbols (comma-separated)", "AAPL,MSFT,RELIANCE.NS")
+    tickers = st.sidebar.text_input("Enter Ticker Symbols (comma-separated)", DEFAULT_TICKERS)
     symbols = [t.strip() for t in tickers.split(",") if t.strip()]
 
     min_allowed_date = datetime.date(1990, 1, 1)
     today = datetime.date.today()
 
-    start_date = st.sidebar.date_input("Start Date", value=today - datetime.timedelta(days=100), min_value=min_allowed_date)
+    start_date = st.sidebar.date_input("Start Date", value=today - datetime.timedelta(days=DEFAULT_LOOKBACK_DAYS), min_value=min_allowed_date)
     end_date = st.sidebar.date_input("End Date", value=today, min_value=min_allowed_date)
 
     investment_amount = st.sidebar.number_input("Investment Amount", min_value=1000, value=100000, step=1000, format="%d")
+    strategy = st.sidebar.selectbox("Allocation Strategy", STRATEGIES,
+                                    help="Equal Weight uses the weights below (blank = equal); the others are optimized on the selected date range.")
+    weights_text = st.sidebar.text_input("Weights (comma-separated, optional)", "", help="Capital share per ticker, in ticker order. Blank = equal weights.")
+    risk_aversion = 3.0
+    if strategy == "Mean-Variance":
+        risk_aversion = st.sidebar.slider("Risk Aversion", min_value=0.5, max_value=10.0, value=3.0, step=0.5)
 
     if start_date >= end_date:
         st.error("Error: Start date must be before End date.")
         st.stop()
 
-    @st.cache_data(ttl=3600)
-    def get_data(ticker, start, end):
-        df = yf.download(ticker, start=start, end=end)
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [' '.join(col).strip() if isinstance(col, tuple) else col for col in df.columns]
-        df.columns = [col.strip() if isinstance(col, str) else col for col in df.columns]
-        suffix = ticker
-        new_cols = []
-        for col in df.columns:
-            if isinstance(col, str):
-                if col.endswith(suffix):
-                    col = col[:-len(suffix)]
-                elif col.endswith(' ' + suffix):
-                    col = col[:-(len(suffix) + 1)]
-                col = col.strip()
-            new_cols.append(col)
-        df.columns = new_cols
-        return df
-
-    data_dict = {}
-    for sym in symbols:
-        data_dict[sym] = get_data(sym, start_date, end_date)
-
-    weights = np.array([1 / len(symbols)] * len(symbols))
-    portfolio_values = None
-    valid_symbols = []
-
-    for i, sym in enumerate(symbols):
-        df = data_dict[sym]
-        price_col = next((col for col in ['Adj Close', 'Close'] if col in df.columns), None)
-        if not price_col:
-            st.warning(f"Price data missing for {sym}")
-            continue
-        prices = df[price_col].dropna()
-        if prices.empty:
-            st.warning(f"No price data found for {sym}.")
-            continue
-        valid_symbols.append(sym)
-        if portfolio_values is None:
-            portfolio_values = prices * weights[i]
+    # Batched downloads fetched concurrently, aligned on dates (dates x tickers).
+    # Gaps from differing exchange holidays carry the last close forward.
+    # Changing an input mid-fetch reruns the script, which cancels the outstanding batches.
+    fetch_progress = st.empty()
+    def show_progress(done, total):
+        fetch_progress.progress(done / total, text=f"📡 Fetched {done}/{total} price batches")
+    with phase("fetch"):
+        price_matrix, missing_symbols = cached_price_matrix(symbols, start=start_date, end=end_date, missing="ffill",
+                                                            progress=show_progress)
+    fetch_progress.empty()
+    for sym in missing_symbols:
+        st.warning(f"No price data found for {sym}.")
+
+    valid_symbols = list(price_matrix.columns)
+    user_weights = parse_weights(weights_text, len(symbols))
+    if weights_text.strip() and user_weights is None:
+        st.warning("Weights must be one non-negative number per ticker; using equal weights.")
+    if user_weights is not None:
+        # Keep the weights of tickers that actually returned data
+        user_weights = user_weights[[symbols.index(sym) for sym in valid_symbols]]
+        if user_weights.sum() <= 0:
+            user_weights = None
+
+    prices = common_window(price_matrix) if valid_symbols else price_matrix
+    weights = normalize_weights(user_weights, len(valid_symbols)) if valid_symbols else np.array([])
+    mu, cov = return_stats(prices) if len(prices) > 2 else (None, None)
+    if strategy != "Equal Weight":
+        if mu is None:
+            st.warning("Not enough overlapping price history to optimize; using equal weights.")
         else:
-            portfolio_values = portfolio_values.add(prices * weights[i], fill_value=0)
+            with phase("optimize"):
+                weights = optimal_weights(strategy, mu, cov, risk_aversion=risk_aversion)
 
-    if portfolio_values is not None and not portfolio_values.empty:
-        portfolio_values = portfolio_values.dropna()
-        scaled_portfolio_values = portfolio_values / portfolio_values.iloc[0] * investment_amount
+    if not prices.empty:
+        with phase("compute"):
+            scaled_portfolio_values = portfolio_values(prices, weights, investment_amount)
+            metrics = portfolio_metrics(scaled_portfolio_values, weights)
 
-        current_value = scaled_portfolio_values.iloc[-1]
-        initial_value = scaled_portfolio_values.iloc[0]
-        total_return = current_value - initial_value
-        total_return_pct = (total_return / initial_value) * 100
+        current_value = metrics["current_value"]
+        total_return = metrics["total_return"]
+        total_return_pct = metrics["total_return_pct"]
 
-        daily_returns = scaled_portfolio_values.pct_change().dropna()
-        volatility = daily_returns.std() * np.sqrt(252)
-        hhi = np.sum(weights ** 2)
+        volatility = metrics["volatility"]
+        hhi = metrics["hhi"]
 
         np.random.seed(len(valid_symbols) + (end_date - start_date).days)
         sentiment_counts = {"positive": 0, "neutral": 0, "negative": 0}
@@ -176,8 +204,25 @@ def main():
         st.subheader(f"Portfolio Trend (Last {display_days} Days)")
         st.line_chart(scaled_portfolio_values.tail(display_days))
 
-        st.subheader("Portfolio Composition")
-        st.table(pd.DataFrame({"Ticker": valid_symbols, "Weight": [round(1 / len(valid_symbols), 3)] * len(valid_symbols)}))
+        st.subheader(f"Portfolio Composition ({strategy})")
+        st.table(pd.DataFrame({"Ticker": valid_symbols, "Weight": np.round(weights, 3)}))
+
+        if mu is not None and len(valid_symbols) > 1:
+            st.subheader("Efficient Frontier (Monte Carlo)")
+            with phase("optimize"):
+                frontier = monte_carlo_frontier(mu, cov, samples=FRONTIER_SAMPLES)
+                markers = [
+                    ("Selected", portfolio_point(weights, mu, cov), "*"),
+                    ("Minimum Variance", portfolio_point(optimal_weights("Minimum Variance", mu, cov), mu, cov), "D"),
+                    ("Max Sharpe", portfolio_point(optimal_weights("Max Sharpe", mu, cov), mu, cov), "P"),
+                ]
+            png = render_figure(
+                ("quantum", "frontier", data_fingerprint(prices), tuple(np.round(weights, 6))),
+                lambda fig: draw_frontier(fig, frontier, markers),
+                figsize=(10, 6),
+            )
+            st.image(png, use_container_width=True)
+            st.caption(f"{FRONTIER_SAMPLES:,} random long-only portfolios, colored by Sharpe ratio (risk-free rate 0).")
 
         st.subheader("AI Recommendations")
         if hhi > 0.5:
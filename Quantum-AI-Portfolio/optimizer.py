@@ -0,0 +1,101 @@
+# optimizer.py - long-only portfolio optimisation and Monte Carlo efficient frontier
+
+import numpy as np
+from scipy.optimize import minimize
+
+from portfolio_engine import TRADING_DAYS
+
+STRATEGIES = ["Equal Weight", "Minimum Variance", "Max Sharpe", "Mean-Variance"]
+
+# Random portfolios are scored this many at a time, so memory stays at chunk x assets
+FRONTIER_CHUNK = 10_000
+
+def return_stats(prices):
+    """Annualised mean returns and covariance matrix of daily simple returns."""
+    returns = prices.pct_change().dropna().to_numpy(dtype=float)
+    mu = returns.mean(axis=0) * TRADING_DAYS
+    cov = np.atleast_2d(np.cov(returns, rowvar=False)) * TRADING_DAYS
+    return mu, cov
+
+def _solve(objective, count, max_weight=1.0):
+    # Long-only, fully invested; SLSQP from equal weights with analytic gradients
+    start = np.full(count, 1.0 / count)
+    result = minimize(
+        objective, start, jac=True, method="SLSQP",
+        bounds=[(0.0, max_weight)] * count,
+        constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1.0, "jac": lambda w: np.ones_like(w)}],
+        options={"maxiter": 500, "ftol": 1e-12},
+    )
+    weights = np.clip(result.x, 0.0, None)
+    return weights / weights.sum()
+
+def min_variance(cov, max_weight=1.0):
+    def objective(w):
+        cw = cov @ w
+        return w @ cw, 2.0 * cw
+    return _solve(objective, len(cov), max_weight)
+
+def mean_variance(mu, cov, risk_aversion=3.0, max_weight=1.0):
+    """Maximise ``w.mu - risk_aversion / 2 * w'Cw``."""
+    def objective(w):
+        cw = cov @ w
+        return -(w @ mu) + 0.5 * risk_aversion * (w @ cw), -mu + risk_aversion * cw
+    return _solve(objective, len(mu), max_weight)
+
+def max_sharpe(mu, cov, risk_free=0.0, max_weight=1.0):
+    excess = mu - risk_free
+    def objective(w):
+        cw = cov @ w
+        vol = np.sqrt(w @ cw)
+        ret = w @ excess
+        # Gradient of -(ret / vol)
+        return -ret / vol, -(excess * vol - ret * cw / vol) / vol ** 2
+    return _solve(objective, len(mu), max_weight)
+
+def optimal_weights(strategy, mu, cov, risk_free=0.0, risk_aversion=3.0):
+    if strategy == "Minimum Variance":
+        return min_variance(cov)
+    if strategy == "Max Sharpe":
+        return max_sharpe(mu, cov, risk_free)
+    if strategy == "Mean-Variance":
+        return mean_variance(mu, cov, risk_aversion)
+    return np.full(len(mu), 1.0 / len(mu))
+
+def portfolio_point(weights, mu, cov, risk_free=0.0):
+    """Annualised (return, volatility, Sharpe) of one weight vector."""
+    ret = float(weights @ mu)
+    vol = float(np.sqrt(weights @ cov @ weights))
+    return ret, vol, (ret - risk_free) / vol if vol > 0 else np.nan
+
+def monte_carlo_frontier(mu, cov, samples=100_000, risk_free=0.0, seed=0, chunk=FRONTIER_CHUNK):
+    """Score ``samples`` random long-only portfolios (uniform on the simplex) in batched chunks.
+
+    Returns ``returns``, ``volatility`` and ``sharpe`` arrays (one entry per
+    sample) plus the weights of the best-Sharpe and lowest-volatility samples;
+    the weight vectors themselves are never all held at once.
+    """
+    rng = np.random.default_rng(seed)
+    count = len(mu)
+    returns = np.empty(samples)
+    volatility = np.empty(samples)
+    best_sharpe = (-np.inf, None)
+    lowest_vol = (np.inf, None)
+    for lo in range(0, samples, chunk):
+        hi = min(lo + chunk, samples)
+        weights = rng.dirichlet(np.ones(count), hi - lo)
+        returns[lo:hi] = weights @ mu
+        # Row-wise w'Cw without forming a (chunk x chunk) product
+        volatility[lo:hi] = np.sqrt(np.einsum("ij,ij->i", weights @ cov, weights))
+        sharpe = (returns[lo:hi] - risk_free) / volatility[lo:hi]
+        i, j = int(np.argmax(sharpe)), int(np.argmin(volatility[lo:hi]))
+        if sharpe[i] > best_sharpe[0]:
+            best_sharpe = (sharpe[i], weights[i].copy())
+        if volatility[lo + j] < lowest_vol[0]:
+            lowest_vol = (volatility[lo + j], weights[j].copy())
+    return {
+        "returns": returns,
+        "volatility": volatility,
+        "sharpe": (returns - risk_free) / volatility,
+        "best_sharpe_weights": best_sharpe[1],
+        "min_volatility_weights": lowest_vol[1],
+    }
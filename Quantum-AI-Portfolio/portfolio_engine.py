@@ -0,0 +1,61 @@
+# portfolio_engine.py - vectorized portfolio maths over an aligned price matrix
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+def parse_weights(text, count):
+    """Parse comma-separated weights; returns None when blank or not usable for ``count`` tickers."""
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    if not parts:
+        return None
+    try:
+        weights = np.array([float(p) for p in parts])
+    except ValueError:
+        return None
+    if len(weights) != count or (weights < 0).any() or weights.sum() <= 0:
+        return None
+    return weights
+
+def normalize_weights(weights, count):
+    if weights is None:
+        return np.full(count, 1.0 / count)
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+def common_window(prices):
+    # Start where every ticker has a price, so no position is bought on a missing quote
+    complete = prices.notna().all(axis=1)
+    if not complete.any():
+        return prices.iloc[0:0]
+    return prices.loc[complete.idxmax():].ffill()
+
+def portfolio_values(prices, weights, investment_amount=1.0):
+    """Buy-and-hold value of ``investment_amount`` split by ``weights`` (capital shares).
+
+    ``weights`` may be one vector (n,) or a stack of portfolios (k, n); the
+    result is a Series, or a (dates x k) DataFrame, on the price index.
+    """
+    matrix = prices.to_numpy(dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    growth = matrix / matrix[0]
+    values = growth @ (weights * investment_amount).T
+    if values.ndim == 1:
+        return pd.Series(values, index=prices.index)
+    return pd.DataFrame(values, index=prices.index)
+
+def portfolio_metrics(values, weights):
+    initial_value = values.iloc[0]
+    current_value = values.iloc[-1]
+    total_return = current_value - initial_value
+    daily_returns = values.pct_change().dropna()
+    return {
+        "initial_value": initial_value,
+        "current_value": current_value,
+        "total_return": total_return,
+        "total_return_pct": total_return / initial_value * 100,
+        "daily_returns": daily_returns,
+        "volatility": daily_returns.std() * np.sqrt(TRADING_DAYS),
+        "hhi": float(np.sum(np.asarray(weights) ** 2)),
+    }
@@ -0,0 +1,149 @@
+"""Deterministic offline market-data provider used by the benchmark suite.
+
+``FixtureProvider`` serves synthetic OHLCV and fundamentals seeded from the
+symbol name, so every run sees the same data without touching the network.
+"""
+
+import contextlib
+import os
+import tempfile
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from market_core.providers import MarketDataProvider, set_provider
+
+ORIGIN = pd.Timestamp("1980-01-01")
+
+
+def _seed(symbol):
+    return zlib.crc32(symbol.upper().encode())
+
+
+def synthetic_daily(symbol, end=None):
+    """Business-day OHLCV from 1980 to ``end`` (today); a given date always gets the same bar."""
+    end = pd.Timestamp(end or pd.Timestamp.today().normalize())
+    index = pd.bdate_range(ORIGIN, end)
+    rng = np.random.default_rng(_seed(symbol))
+    returns = rng.normal(0.0003, 0.015, len(index))
+    close = 50.0 * np.exp(np.cumsum(returns))
+    spread = np.abs(rng.normal(0, 0.01, len(index))) * close
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.003, len(index))),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(100_000, 5_000_000, len(index)).astype(float),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    }, index=index)
+
+
+def synthetic_intraday(symbol, days=30, minutes=15, end=None):
+    end = pd.Timestamp(end or pd.Timestamp.today().normalize())
+    sessions = pd.bdate_range(end - pd.Timedelta(days=days), end)
+    bars_per_session = int(375 / minutes)
+    index = pd.DatetimeIndex([
+        session + pd.Timedelta(hours=9, minutes=15) + pd.Timedelta(minutes=minutes * i)
+        for session in sessions for i in range(bars_per_session)
+    ])
+    rng = np.random.default_rng(_seed(symbol) + minutes)
+    close = 50.0 * np.exp(np.cumsum(rng.normal(0, 0.002, len(index))))
+    return pd.DataFrame({
+        "Open": close, "High": close * 1.001, "Low": close * 0.999, "Close": close,
+        "Volume": rng.integers(1_000, 50_000, len(index)).astype(float),
+        "Dividends": 0.0, "Stock Splits": 0.0,
+    }, index=index)
+
+
+def synthetic_info(symbol):
+    rng = np.random.default_rng(_seed(symbol))
+    price = float(rng.uniform(50, 5000))
+    book = price / float(rng.uniform(1, 12))
+    eps = price / float(rng.uniform(8, 60))
+    return {
+        "longName": f"{symbol} Synthetic Ltd",
+        "currency": "INR" if symbol.upper().endswith(".NS") else "USD",
+        "currentPrice": price,
+        "bookValue": book,
+        "trailingEps": eps,
+        "trailingPE": price / eps,
+        "revenueGrowth": float(rng.uniform(-0.1, 0.3)),
+        "returnOnEquity": float(rng.uniform(0.02, 0.35)),
+        "marketCap": price * 1e9,
+        "dividendYield": float(rng.uniform(0, 0.04)),
+        "volume": int(rng.integers(1e5, 1e7)),
+        "debtToEquity": float(rng.uniform(0, 200)),
+        "operatingMargins": float(rng.uniform(0.05, 0.4)),
+    }
+
+
+class FixtureProvider(MarketDataProvider):
+    """Provider serving the synthetic data above, with optional per-call latency."""
+
+    name = "fixture"
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def history(self, symbol, interval="1d", start=None):
+        self._wait()
+        return self._frame(symbol, interval, start)
+
+    def history_many(self, symbols, interval="1d", start=None):
+        # Like a bulk download endpoint: one round trip per batch
+        self._wait()
+        return {symbol: self._frame(symbol, interval, start) for symbol in symbols}
+
+    @staticmethod
+    def _frame(symbol, interval, start):
+        if interval == "1d":
+            frame = synthetic_daily(symbol)
+        else:
+            frame = synthetic_intraday(symbol, minutes=60 if interval == "1h" else int(interval.rstrip("m")))
+        if start is not None:
+            if start.tz is not None:
+                start = start.tz_convert("UTC").tz_localize(None)
+            frame = frame[frame.index >= start]
+        return frame.copy()
+
+    def info(self, symbol):
+        self._wait()
+        return synthetic_info(symbol)
+
+    def major_holders(self, symbol):
+        return pd.DataFrame({"Value": [0.5, 0.3, 0.35, 1200]},
+                            index=["insidersPercentHeld", "institutionsPercentHeld",
+                                   "institutionsFloatPercentHeld", "institutionsCount"])
+
+
+@contextlib.contextmanager
+def installed(latency=0.0, store_dir=None):
+    """Make ``FixtureProvider`` the active provider and use throwaway OHLCV / fundamentals / shared stores."""
+    import market_core.fundamentals_store as fundamentals_store
+    import market_core.ohlcv_store as ohlcv_store
+    import market_core.shared_frames as shared_frames
+
+    fixture = FixtureProvider(latency)
+    saved_store = ohlcv_store.default_store
+    saved_fundamentals = fundamentals_store.default_store
+    saved_shared = shared_frames.default_store
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = set_provider(fixture)
+        root = store_dir or tmp
+        try:
+            ohlcv_store.default_store = ohlcv_store.OHLCVStore(root)
+            fundamentals_store.default_store = fundamentals_store.FundamentalsStore(os.path.join(root, "fundamentals"))
+            shared_frames.default_store = shared_frames.SharedFrameStore(os.path.join(root, "shared"))
+            yield fixture
+        finally:
+            set_provider(previous)
+            ohlcv_store.default_store = saved_store
+            fundamentals_store.default_store = saved_fundamentals
+            shared_frames.default_store = saved_shared
@@ -0,0 +1,338 @@
+"""Offline benchmark suite for the dashboard hot paths.
+
+Every upstream call is served by ``fixture_provider.FixtureProvider``, so runs are
+reproducible and need no network. Results go to ``<out>/bench-<label>.jsonl``
+(one record per case/size) and a matching CSV.
+
+Usage:
+    python benchmarks/run_benchmarks.py --label baseline
+    python benchmarks/run_benchmarks.py --quick --label dev
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/bench-baseline.jsonl benchmarks/results/bench-dev.jsonl
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+for folder in ("", "Quantum-AI-Portfolio", "stock_analysis", "nifty50-stock-analysis", "pure_math_analytics"):
+    path = os.path.join(ROOT_DIR, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+sys.path.insert(0, BENCH_DIR)
+
+import numpy as np
+import pandas as pd
+
+import fixture_provider
+import market_core.ohlcv_store as ohlcv_store
+from market_core.cache import cached_history, history_cache, info_cache
+from market_core.correlation import cluster_order, correlation, daily_returns, rolling_correlation
+from market_core.exchange_calendar import data_expiry
+from market_core.indicators import compute_indicators, indicator_frame
+from market_core.intraday import RESAMPLE_MINUTES, IntradayBars
+from market_core.price_matrix import align_prices
+from market_core.render import image_cache, render_figure
+
+# Bars per history horizon (daily bars, except 1d = one session of 15m bars)
+HISTORY_BARS = {"1d": 25, "1mo": 21, "1y": 252, "10y": 2520, "max": 11700}
+PERIODS = ["1d", "1mo", "1y", "10y", "max"]
+UNIVERSE_SIZES = [3, 50, 500]
+REGRESSION_THRESHOLD = 1.10
+
+
+def timeit(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def record(results, case, size, samples):
+    results.append({
+        "case": case,
+        "size": str(size),
+        "repeat": len(samples),
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+    })
+    print(f"{case:<32} {str(size):>6}  median {statistics.median(samples) * 1000:10.2f} ms")
+
+
+def synthetic_close(bars, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2025-12-31", periods=bars)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars))), index=index)
+
+
+def synthetic_universe(tickers, bars=2520):
+    rng = np.random.default_rng(tickers)
+    index = pd.bdate_range(end="2025-12-31", periods=bars)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (bars, tickers)), axis=0))
+    return pd.DataFrame(prices, index=index, columns=[f"SYM{i}.NS" for i in range(tickers)])
+
+
+# ------------------- Cases -------------------
+
+def bench_fetch_stock_data(results, repeat, periods, scratch):
+    import stock_analysis_app
+
+    def cold():
+        history_cache.clear()
+        ohlcv_store.default_store = ohlcv_store.OHLCVStore(tempfile.mkdtemp(dir=scratch))
+
+    for period in periods:
+        record(results, "fetch_stock_data[cold]", period,
+               timeit(lambda: stock_analysis_app.fetch_stock_data("RELIANCE.NS", period), repeat, cold))
+        record(results, "fetch_stock_data[warm-store]", period,
+               timeit(lambda: stock_analysis_app.fetch_stock_data("RELIANCE.NS", period), repeat, history_cache.clear))
+
+
+def bench_shared_history(results, repeat, sessions=20):
+    # Every session reads the same cached 'max' history: each gets a shallow view of one mapped copy
+    history_cache.clear()
+    cached_history("RELIANCE.NS", period="max")
+
+    def views():
+        frames = [cached_history("RELIANCE.NS", period="max") for _ in range(sessions)]
+        for frame in frames:
+            frame["Return"] = frame["Close"].pct_change()
+
+    record(results, "shared.history_views", sessions, timeit(views, repeat))
+
+
+def bench_calendar(results, repeat, lookups=1000):
+    # Every cache miss asks the listing exchange's calendar when its data goes stale
+    symbols = ["RELIANCE.NS", "AAPL", "0700.HK", "VOD.L"] * (lookups // 4)
+    data_expiry(symbols[:4])
+    record(results, "calendar.data_expiry", lookups, timeit(lambda: [data_expiry([s]) for s in symbols], repeat))
+
+
+def bench_math(results, repeat, periods):
+    from entropy_engine import (multiscale_entropy, rolling_entropy_panel, rolling_permutation_entropy,
+                                rolling_sample_entropy, rolling_shannon_entropy)
+
+    for period in periods:
+        close = synthetic_close(HISTORY_BARS[period])
+        record(results, "math.entropy", period, timeit(lambda: rolling_shannon_entropy(close), repeat))
+        record(results, "math.permutation_entropy", period, timeit(lambda: rolling_permutation_entropy(close), repeat))
+        record(results, "math.sample_entropy", period, timeit(lambda: rolling_sample_entropy(close), repeat))
+        record(results, "math.multiscale_entropy", period, timeit(lambda: multiscale_entropy(close), repeat))
+        record(results, "math.indicators", period, timeit(lambda: indicator_frame(close, sma_windows=()), repeat))
+
+    for tickers in UNIVERSE_SIZES:
+        universe = synthetic_universe(tickers)
+        record(results, "math.entropy_panel", tickers,
+               timeit(lambda: rolling_entropy_panel(universe, windows=(10, 20)), repeat))
+        matrix = universe.to_numpy().T.copy()
+        record(results, "indicators.batched_2d", tickers, timeit(lambda: compute_indicators(matrix), repeat))
+
+    # One month of stored 5m base bars, resampled per display interval
+    base = fixture_provider.synthetic_intraday("RELIANCE.NS", minutes=5)
+    for interval in RESAMPLE_MINUTES:
+        record(results, "math.intraday_resample", interval,
+               timeit(lambda: IntradayBars(base).resample(interval).session_mask(5), repeat))
+
+
+def bench_nifty(results, repeat):
+    from nifty50_data import TICKERS, fetch_nifty50_data, load_fundamentals
+
+    for size in (3, len(TICKERS), 500):
+        tickers = TICKERS[:size] if size <= len(TICKERS) else [f"SYN{i}.NS" for i in range(size)]
+        # No upstream to protect offline, so the limiter is opened fully
+        record(results, "fetch_nifty50_data", size,
+               timeit(lambda: load_fundamentals(tickers, requests_per_second=1e9), repeat, info_cache.clear))
+    # Second visit of the day: everything comes from today's snapshot partition
+    fetch_nifty50_data()
+    record(results, "fetch_nifty50_data[snapshot]", len(TICKERS), timeit(fetch_nifty50_data, repeat, info_cache.clear))
+
+    # Screener table over a 500-name universe: one presorted index, then per-interaction queries
+    from screener_index import ScreenerIndex
+    universe = fetch_nifty50_data([f"SYN{i}.NS" for i in range(500)])
+    record(results, "nifty.screener_index[build]", 500, timeit(lambda: ScreenerIndex(universe), repeat))
+    index = ScreenerIndex(universe)
+    record(results, "nifty.screener_index[query]", 500,
+           timeit(lambda: index.query("P/B Ratio", False, "syn", {"ROE (%)": (10, None)}, page=3), repeat))
+
+    # Correlation engine over one year of returns: full matrix, rolling rebuild, and a new day's update
+    for tickers in (49, 500):
+        returns = daily_returns(synthetic_universe(tickers, bars=253))
+        record(results, "nifty.correlation[full+cluster]", tickers,
+               timeit(lambda: cluster_order(correlation(returns)), repeat))
+        record(results, "nifty.rolling_correlation[build]", tickers,
+               timeit(lambda: rolling_correlation(returns, 60), repeat))
+        key = ("bench", tickers)
+
+        def new_day():
+            rolling_correlation(returns.iloc[:-1], 60, key=key)
+            return lambda: rolling_correlation(returns, 60, key=key)
+
+        samples = []
+        for _ in range(repeat):
+            update = new_day()
+            started = time.perf_counter()
+            update()
+            samples.append(time.perf_counter() - started)
+        record(results, "nifty.rolling_correlation[new_day]", tickers, samples)
+
+
+def bench_quantum(results, repeat):
+    from portfolio_engine import common_window, normalize_weights, portfolio_metrics, portfolio_values
+
+    for tickers in UNIVERSE_SIZES:
+        universe = synthetic_universe(tickers)
+        frames = {symbol: universe[[symbol]].rename(columns={symbol: "Close"}) for symbol in universe.columns}
+
+        def aggregate():
+            matrix, _ = align_prices(frames, missing="ffill")
+            prices = common_window(matrix)
+            weights = normalize_weights(None, prices.shape[1])
+            portfolio_metrics(portfolio_values(prices, weights, 100000), weights)
+
+        record(results, "quantum.portfolio_aggregation", tickers, timeit(aggregate, repeat))
+
+    # Optimizers and the 100k-sample frontier at a typical watchlist size
+    from optimizer import monte_carlo_frontier, optimal_weights, return_stats
+    mu, cov = return_stats(synthetic_universe(50))
+    for strategy in ("Minimum Variance", "Max Sharpe", "Mean-Variance"):
+        record(results, f"quantum.optimize[{strategy}]", 50, timeit(lambda: optimal_weights(strategy, mu, cov), repeat))
+    record(results, "quantum.frontier_100k", 50, timeit(lambda: monte_carlo_frontier(mu, cov), repeat))
+
+
+def bench_backtest(results, repeat):
+    from backtest import parameter_grid, run_sweep
+
+    close = synthetic_close(HISTORY_BARS["10y"]).to_numpy()
+    # 13 RSI windows x 9 oversold x 9 overbought = 1,053 parameter sets over 10y of daily bars
+    grid = parameter_grid(rsi_window=list(range(5, 31, 2)), oversold=list(range(10, 46, 4)),
+                          overbought=list(range(56, 92, 4)))
+    record(results, "backtest.rsi_sweep", len(grid), timeit(lambda: run_sweep(close, "rsi", grid), repeat))
+
+
+def bench_charts(results, repeat, periods):
+    from math_app import draw_analytics_panels
+    from plot_utils import plot_dark_mode
+
+    for tickers in (3, 49, 500):
+        rng = np.random.default_rng(tickers)
+        df = pd.DataFrame({
+            "Current Price": rng.uniform(100, 3000, tickers),
+            "Book Value": rng.uniform(50, 900, tickers),
+            "P/B Ratio": rng.uniform(1, 12, tickers),
+            "ROE (%)": rng.uniform(2, 35, tickers),
+        }, index=[f"SYM{i}.NS" for i in range(tickers)])
+
+        def dark_mode():
+            fig = plot_dark_mode(df)
+            fig.savefig(os.devnull, format="png")
+
+        record(results, "nifty.plot_dark_mode", tickers, timeit(dark_mode, repeat))
+
+    for period in periods:
+        close = synthetic_close(HISTORY_BARS[period])
+        df = indicator_frame(close, sma_windows=(20,)).rename(columns={"Signal": "Signal_Line", "SMA20": "SMA"})
+        df["Close"] = close
+        df["Entropy"] = 0.0
+        df["Permutation_Entropy"] = 0.0
+        df["Sample_Entropy"] = 0.0
+        draw = lambda fig: draw_analytics_panels(fig, df, "SYM", period, 20)
+        record(results, "math.render_panels[miss]", period,
+               timeit(lambda: render_figure(("bench", period), draw, figsize=(11, 12)), repeat,
+                      lambda: image_cache._images.clear()))
+        record(results, "math.render_panels[hit]", period,
+               timeit(lambda: render_figure(("bench", period), draw, figsize=(11, 12)), repeat))
+
+
+# ------------------- Output -------------------
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "timestamp": pd.Timestamp.now(tz="UTC").isoformat(),
+    }
+
+
+def write_results(results, out_dir, label):
+    os.makedirs(out_dir, exist_ok=True)
+    meta = environment()
+    jsonl_path = os.path.join(out_dir, f"bench-{label}.jsonl")
+    with open(jsonl_path, "w") as f:
+        for row in results:
+            f.write(json.dumps({**row, "label": label, **meta}) + "\n")
+    csv_path = os.path.join(out_dir, f"bench-{label}.csv")
+    pd.DataFrame(results).assign(label=label, commit=meta["commit"]).to_csv(csv_path, index=False)
+    return jsonl_path, csv_path
+
+
+def load_results(path):
+    with open(path) as f:
+        return pd.DataFrame([json.loads(line) for line in f if line.strip()])
+
+
+def compare(old_path, new_path, threshold=REGRESSION_THRESHOLD):
+    """Print new/old median ratios per case; returns the number of regressions over ``threshold``."""
+    old, new = load_results(old_path), load_results(new_path)
+    merged = old.merge(new, on=["case", "size"], suffixes=("_old", "_new"))
+    merged["ratio"] = merged["median_s_new"] / merged["median_s_old"]
+    regressions = 0
+    for row in merged.itertuples():
+        flag = ""
+        if row.ratio > threshold:
+            flag = "  <-- regression"
+            regressions += 1
+        print(f"{row.case:<32} {row.size:>6}  {row.median_s_old * 1000:10.2f} -> {row.median_s_new * 1000:10.2f} ms"
+              f"  x{row.ratio:.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline dashboard benchmarks.")
+    parser.add_argument("--label", default="local", help="Name used in the output file names")
+    parser.add_argument("--out", default=os.path.join(BENCH_DIR, "results"), help="Output directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per case")
+    parser.add_argument("--quick", action="store_true", help="Skip the 10y/max history sizes")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    periods = PERIODS[:3] if args.quick else PERIODS
+    results = []
+    with tempfile.TemporaryDirectory() as scratch, fixture_provider.installed():
+        bench_fetch_stock_data(results, args.repeat, periods, scratch)
+        bench_shared_history(results, args.repeat)
+        bench_calendar(results, args.repeat)
+        bench_math(results, args.repeat, periods)
+        bench_nifty(results, args.repeat)
+        bench_quantum(results, args.repeat)
+        bench_backtest(results, args.repeat)
+        bench_charts(results, args.repeat, periods)
+
+    for path in write_results(results, args.out, args.label):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,67 @@
 import streamlit as st
-import importlib.util
 import os
 import sys
+import time
 
 # =====================================================================
 # MODULE PATH ROUTING & IMPORTS
 # =====================================================================
-def import_from_path(name, path):
-    spec = importlib.util.spec_from_file_location(name, path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[name] = module
-    spec.loader.exec_module(module)
-    return module
-
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
 # Add application sub-folders to core Python environment search paths
+sys.path.insert(0, current_dir)
 sys.path.insert(0, os.path.join(current_dir, "Quantum-AI-Portfolio"))
 sys.path.insert(0, os.path.join(current_dir, "stock_analysis"))
 sys.path.insert(0, os.path.join(current_dir, "nifty50-stock-analysis"))
 sys.path.insert(0, os.path.join(current_dir, "pure_math_analytics"))
 
-try:
-    quantum_app = import_from_path("quantum_app", os.path.join(current_dir, "Quantum-AI-Portfolio", "app.py"))
-    stock_app = import_from_path("stock_app", os.path.join(current_dir, "stock_analysis", "stock_analysis_app.py"))
-    nifty_app = import_from_path("nifty_app", os.path.join(current_dir, "nifty50-stock-analysis", "app.py"))
+# Sidebar label -> (module name, file path, entry function). Sub-apps are imported
+# only when selected, so a visitor who opens one page never pays for the others.
+SUB_APPS = {
+    "Stock Analysis": ("stock_app", os.path.join(current_dir, "stock_analysis", "stock_analysis_app.py"), "main"),
+    "Quantum AI Portfolio": ("quantum_app", os.path.join(current_dir, "Quantum-AI-Portfolio", "app.py"), "main"),
+    "Nifty50 Stock Analysis": ("nifty_app", os.path.join(current_dir, "nifty50-stock-analysis", "app.py"), "main"),
     # Dynamically mounting the math_app as a clean, separated dependency module
-    math_app = import_from_path("math_app", os.path.join(current_dir, "pure_math_analytics", "math_app.py"))
-except Exception as e:
-    st.error(f"Error importing infrastructure sub-apps: {e}")
-    st.stop()
+    "Pure Math Technical Analytics": ("math_app", os.path.join(current_dir, "pure_math_analytics", "math_app.py"), "run_pure_math_dashboard_ui"),
+}
+
+from market_core import metrics
+from market_core.app_loader import APP_IMPORT_LOCK, load_app_module
+
+@st.cache_resource
+def start_metrics_endpoint():
+    # Prometheus scrape target at http://$METRICS_HOST:$METRICS_PORT/metrics (JSON at /metrics.json);
+    # METRICS_HOST defaults to 127.0.0.1 since the endpoint is unauthenticated
+    port = os.environ.get("METRICS_PORT")
+    return metrics.start_metrics_server(int(port)) if port else None
+
+start_metrics_endpoint()
+
+@st.cache_resource
+def start_warmup():
+    # Opt-in: precompute every page's default view on a background thread of this server process
+    if os.environ.get("WARMUP_IN_PROCESS") == "1":
+        from market_core.warmup import start_background_warmup
+        return start_background_warmup()
+    return None
+
+start_warmup()
+
+@st.cache_resource
+def loader_state():
+    # Process-wide: survives reruns and is shared by every session
+    return {"timings": {}}
+
+def load_sub_app(name, path):
+    """Import a sub-app once per process; later reruns reuse the loaded module."""
+    # The same lock the warm-up scheduler loads through, so only one of them executes the module
+    with APP_IMPORT_LOCK:
+        if name in sys.modules:
+            return sys.modules[name]
+        started = time.perf_counter()
+        module = load_app_module(name, path)
+        loader_state()["timings"].setdefault(name, {})["import"] = time.perf_counter() - started
+        return module
 
 # =====================================================================
 # RENDER VISUAL BRAND HEADERS
@@ -47,22 +79,24 @@ st.markdown(
 )
 
 # Sidebar application choice options
-app_choice = st.sidebar.radio("Select an app:", [
-    "Stock Analysis",
-    "Quantum AI Portfolio",
-    "Nifty50 Stock Analysis",
-    "Pure Math Technical Analytics"
-])
+app_choice = st.sidebar.radio("Select an app:", list(SUB_APPS))
 
 def run_app(module, entry_function="main"):
     if hasattr(module, entry_function):
         try:
             func = getattr(module, entry_function)
-            func()
+            timings = loader_state()["timings"].setdefault(module.__name__, {})
+            if "first_render" not in timings:
+                started = time.perf_counter()
+                func()
+                timings["first_render"] = time.perf_counter() - started
+            else:
+                func()
         # Catch Yahoo Finance rate limiting errors gracefully
         except Exception as e:
             error_str = str(e)
             if "YFRateLimitError" in error_str or "Too Many Requests" in error_str:
+                metrics.increment("rate_limit_errors_total", provider="page")
                 st.error("⚠️ **Yahoo Finance data service is temporarily unavailable due to heavy traffic limits. Please try again after some time.**")
             else:
                 # Let other unexpected system bugs surface normally for easier debugging
@@ -73,12 +107,38 @@ def run_app(module, entry_function="main"):
 # =====================================================================
 # GLOBAL TRAFFIC ROUTER TRIGGER MATCHES
 # =====================================================================
-if app_choice == "Stock Analysis":
-    run_app(stock_app, entry_function="main")
-elif app_choice == "Quantum AI Portfolio":
-    run_app(quantum_app, entry_function="main")
-elif app_choice == "Nifty50 Stock Analysis":
-    run_app(nifty_app, entry_function="main")
-elif app_choice == "Pure Math Technical Analytics":
-    # Explicitly routes to the standalone function isolated inside math_app.py
-    run_app(math_app, entry_function="run_pure_math_dashboard_ui")
+module_name, module_path, entry_function = SUB_APPS[app_choice]
+metrics.begin_rerun(app_choice)
+try:
+    selected_app = load_sub_app(module_name, module_path)
+except Exception as e:
+    st.error(f"Error importing infrastructure sub-apps: {e}")
+    st.stop()
+
+run_app(selected_app, entry_function=entry_function)
+
+timings = loader_state()["timings"].get(module_name, {})
+if timings:
+    st.sidebar.caption(
+        f"⏱️ Import: {timings.get('import', 0) * 1000:.0f} ms · "
+        f"First render: {timings.get('first_render', 0) * 1000:.0f} ms"
+    )
+
+# =====================================================================
+# PERFORMANCE DEBUG PANEL
+# =====================================================================
+rerun = metrics.end_rerun()
+if st.sidebar.checkbox("🛠️ Show performance debug panel", value=False):
+    with st.sidebar.expander("⏱️ This rerun", expanded=True):
+        st.write(f"Total: **{rerun['total_seconds'] * 1000:.0f} ms**")
+        if rerun["phases"]:
+            st.table({phase: f"{seconds * 1000:.1f} ms" for phase, seconds in rerun["phases"].items()})
+        if rerun["counters"]:
+            st.table(rerun["counters"])
+    with st.sidebar.expander("📈 Process totals"):
+        snapshot = metrics.snapshot()
+        st.table({
+            name + "".join(f"[{v}]" for v in labels.values()): value
+            for name, labels, value in snapshot["counters"]
+        })
+        st.download_button("📥 Prometheus metrics", metrics.prometheus_text(), file_name="metrics.prom", mime="text/plain")
@@ -0,0 +1 @@
+"""Shared market-data infrastructure used by every dashboard sub-app."""
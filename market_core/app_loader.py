@@ -0,0 +1,34 @@
+"""Process-wide loader for the dashboard sub-app modules.
+
+``combined_app.py`` and the warm-up scheduler both load the sub-apps from
+their file paths under fixed module names (``stock_app``, ``math_app`` ...),
+so a page and its warm-up job share one copy of the module and its caches.
+Both go through ``load_app_module`` and the same lock, so a module is
+executed once per process, and it is published to ``sys.modules`` only
+after it imported cleanly: a concurrent caller never sees a half-executed
+module, and a failed import leaves nothing behind.
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+
+# Re-entrant: a sub-app that loads another sub-app while importing doesn't deadlock
+APP_IMPORT_LOCK = threading.RLock()
+
+
+def load_app_module(name, path):
+    """Import the file at ``path`` as module ``name`` once per process and return it."""
+    with APP_IMPORT_LOCK:
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        folder = os.path.dirname(path)
+        if folder not in sys.path:
+            sys.path.insert(0, folder)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[name] = module
+        return module
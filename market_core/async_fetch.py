@@ -0,0 +1,164 @@
+"""Bounded-concurrency asyncio fetch layer for large symbol lists.
+
+``fetch_all`` runs a blocking ``fetch(key)`` for every key on a worker pool,
+at most ``concurrency`` at a time. Each attempt has a timeout, failures are
+retried with full-jitter exponential backoff, and the whole run can be
+cancelled, either through ``cancel_event`` or by ``on_progress`` raising
+(Streamlit does this when the user changes an input mid-run). On cancellation
+no new attempts start and pending ones are abandoned.
+
+``iter_fetch`` runs the same loop on a helper thread and yields results in
+batches as they finish, so a page can render rows long before the last key.
+"""
+
+import asyncio
+import queue
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from market_core.metrics import bind_rerun, increment
+
+FETCH_CONCURRENCY = 8
+FETCH_TIMEOUT_SECONDS = 30
+FETCH_RETRIES = 2
+BACKOFF_SECONDS = 0.5
+
+
+class FetchCancelled(Exception):
+    """Raised by ``fetch_all`` when ``cancel_event`` is set before every key finished."""
+
+
+def _retryable(error):
+    # Unknown symbols and malformed requests will not succeed on a second try
+    return not isinstance(error, (LookupError, ValueError))
+
+
+async def _fetch_one(key, fetch, loop, executor, semaphore, timeout, retries, backoff, retryable):
+    for attempt in range(retries + 1):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(executor, fetch, key), timeout)
+            except asyncio.TimeoutError:
+                increment("fetch_timeouts_total")
+                error = TimeoutError(f"timed out after {timeout}s")
+            except Exception as e:
+                error = e
+        if attempt == retries or not retryable(error):
+            increment("fetch_failures_total")
+            raise error
+        increment("fetch_retries_total")
+        await asyncio.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+
+async def fetch_all_async(keys, fetch, concurrency=FETCH_CONCURRENCY, timeout=FETCH_TIMEOUT_SECONDS,
+                          retries=FETCH_RETRIES, backoff=BACKOFF_SECONDS, on_progress=None,
+                          cancel_event=None, retryable=_retryable, on_result=None):
+    keys = list(keys)
+    results, errors = {}, {}
+    if not keys:
+        return results, errors
+
+    loop = asyncio.get_running_loop()
+    # Executor threads don't inherit the caller's context; carry the rerun trace over explicitly
+    fetch = bind_rerun(fetch)
+    semaphore = asyncio.Semaphore(concurrency)
+    # Timed-out attempts keep their thread until upstream returns, so leave headroom for retries
+    executor = ThreadPoolExecutor(max_workers=concurrency * 2, thread_name_prefix="fetch")
+    tasks = {
+        asyncio.ensure_future(_fetch_one(key, fetch, loop, executor, semaphore, timeout, retries, backoff, retryable)): key
+        for key in keys
+    }
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=0.2, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                key = tasks[task]
+                if task.exception() is not None:
+                    errors[key] = task.exception()
+                else:
+                    results[key] = task.result()
+                if on_result is not None:
+                    on_result(key, results.get(key), errors.get(key))
+            if cancel_event is not None and cancel_event.is_set():
+                raise FetchCancelled(f"cancelled with {len(pending)} of {len(keys)} fetches outstanding")
+            if done and on_progress is not None:
+                on_progress(len(results) + len(errors), len(keys))
+    finally:
+        for task in pending:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results, errors
+
+
+def fetch_all(keys, fetch, **kwargs):
+    """Fetch every key concurrently; returns ``(results, errors)`` dicts keyed like ``keys``.
+
+    Blocks the calling thread. Accepts the keyword arguments of ``fetch_all_async``.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(fetch_all_async(keys, fetch, **kwargs))
+    # Already inside an event loop (e.g. a notebook): drive a private loop on a helper thread
+    outcome = {}
+
+    def run():
+        try:
+            outcome["value"] = asyncio.run(fetch_all_async(keys, fetch, **kwargs))
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=bind_rerun(run))
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+_FINISHED = object()
+
+
+def iter_fetch(keys, fetch, **kwargs):
+    """Fetch every key concurrently, yielding ``[(key, result, error), ...]`` batches as they finish.
+
+    Each batch holds everything that completed since the previous one. The
+    fetch runs on a helper thread, so ``on_progress`` is not accepted; count
+    the yielded keys instead. Closing the generator early, or an exception in
+    the consumer (e.g. a Streamlit rerun), cancels the outstanding fetches.
+    """
+    finished = queue.Queue()
+    cancel_event = threading.Event()
+
+    def run():
+        try:
+            fetch_all(keys, fetch, cancel_event=cancel_event,
+                      on_result=lambda key, value, error: finished.put((key, value, error)), **kwargs)
+        except FetchCancelled:
+            pass
+        except BaseException as e:
+            finished.put(e)
+        finally:
+            finished.put(_FINISHED)
+
+    threading.Thread(target=bind_rerun(run), name="iter-fetch", daemon=True).start()
+    try:
+        while True:
+            items = [finished.get()]
+            while True:
+                try:
+                    items.append(finished.get_nowait())
+                except queue.Empty:
+                    break
+            for item in items:
+                if isinstance(item, BaseException):
+                    raise item
+            batch = [item for item in items if item is not _FINISHED]
+            if batch:
+                yield batch
+            if _FINISHED in items:
+                return
+    finally:
+        cancel_event.set()
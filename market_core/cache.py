@@ -0,0 +1,190 @@
+"""Process-wide request-coalescing cache for market data and ``Ticker.info``.
+
+Streamlit runs every browser session as a thread in one server process, so
+module-level caches here are shared by all sessions. Entries expire after a
+TTL, or at an explicit expiry instant such as the next exchange session
+boundary (see ``exchange_calendar.data_expiry``); the least recently used
+entry is evicted once ``maxsize`` is reached, and concurrent misses on the
+same key wait for a single in-flight fetch (single-flight) instead of each
+calling upstream.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from market_core.exchange_calendar import data_expiry
+from market_core.intraday import BASE_INTERVAL, BASE_PERIOD, IntradayBars
+from market_core.metrics import increment
+from market_core.ohlcv_store import get_history
+from market_core.providers import get_provider
+from market_core.price_matrix import load_price_matrix
+from market_core.shared_frames import share
+
+HISTORY_TTL_SECONDS = 300
+INFO_TTL_SECONDS = 900
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.abandoned = False
+
+
+class TTLCache:
+    def __init__(self, name, maxsize=256, ttl=300):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _fresh(self, entry, ttl):
+        loaded, _, expires_at = entry
+        if ttl is None and expires_at is not None:
+            return time.time() < expires_at
+        return time.monotonic() - loaded < (self.ttl if ttl is None else ttl)
+
+    def get_or_load(self, key, loader, ttl=None, expires=None):
+        """Return the cached value for ``key`` or load it once, however many callers ask.
+
+        ``ttl`` overrides the cache default for this read, so a caller wanting a
+        fresher value (e.g. a live quote) can accept only recent entries.
+        ``expires()`` is called on a miss and returns the epoch second the
+        loaded entry goes stale, replacing the age check for reads without ``ttl``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._fresh(entry, ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                hit = True
+            else:
+                hit = False
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = _Flight()
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+
+        if hit:
+            increment("cache_hits_total", cache=self.name)
+            return entry[1]
+        increment("cache_misses_total" if leader else "cache_coalesced_total", cache=self.name)
+
+        if not leader:
+            flight.done.wait()
+            if flight.abandoned:
+                # The leader was interrupted (e.g. by a Streamlit rerun) rather than failing; load for this caller
+                return self.get_or_load(key, loader, ttl, expires)
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            # Taken before loading, so data fetched across a session boundary errs on stale
+            expires_at = expires() if expires is not None else None
+            flight.value = loader()
+        except Exception as e:
+            flight.error = e
+            raise
+        except BaseException:
+            flight.abandoned = True
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = (time.monotonic(), flight.value, expires_at)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            return flight.value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+history_cache = TTLCache("history", maxsize=256, ttl=HISTORY_TTL_SECONDS)
+info_cache = TTLCache("info", maxsize=1024, ttl=INFO_TTL_SECONDS)
+
+
+def _session_expiry(cache, symbols):
+    # Within a session: the TTL, capped at the close. Once it has closed: the next open.
+    return lambda: data_expiry(symbols, ttl=cache.ttl)
+
+
+def _key_name(key):
+    return "_".join("" if part is None else str(part) for part in key)
+
+
+def cached_history(symbol, period=None, start=None, end=None, interval="1d"):
+    """OHLCV history through the shared cache.
+
+    The cached frame is a read-only memory-mapped view shared by every
+    session; callers get a shallow copy, which under pandas copy-on-write they
+    can modify freely without duplicating the columns they leave alone.
+    """
+    key = (symbol.upper(), period, str(start) if start else None, str(end) if end else None, interval)
+    frame = history_cache.get_or_load(
+        key, lambda: share(_key_name(key), get_history(symbol, period=period, start=start, end=end, interval=interval)),
+        expires=_session_expiry(history_cache, [symbol]),
+    )
+    return frame.copy(deep=False)
+
+
+def cached_price_matrix(symbols, period=None, start=None, end=None, interval="1d", field="Close", missing="ffill",
+                        progress=None):
+    """Aligned dates x tickers matrix through the shared cache; returns ``(matrix, missing_symbols)``.
+
+    ``progress(done, total)`` reports finished fetch batches when this call does the loading.
+    """
+    key = ("matrix", tuple(s.upper() for s in symbols), period,
+           str(start) if start else None, str(end) if end else None, interval, field, missing)
+    def load():
+        matrix, empty = load_price_matrix(symbols, period=period, start=start, end=end,
+                                          interval=interval, field=field, missing=missing, progress=progress)
+        return share(_key_name(key[:1] + ("-".join(key[1]),) + key[2:]), matrix), empty
+
+    matrix, empty = history_cache.get_or_load(key, load, expires=_session_expiry(history_cache, symbols))
+    return matrix.copy(deep=False), list(empty)
+
+
+def _load_intraday(symbol):
+    frame = get_history(symbol, period=BASE_PERIOD, interval=BASE_INTERVAL)
+    return IntradayBars(frame.dropna(subset=["Close"]) if not frame.empty else frame)
+
+
+def cached_intraday(symbol):
+    """Shared ``IntradayBars`` over the stored base-resolution bars; read-only, resamples are memoised on it."""
+    return history_cache.get_or_load(("intraday", symbol.upper()), lambda: _load_intraday(symbol),
+                                     expires=_session_expiry(history_cache, [symbol]))
+
+
+def cached_info(symbol, loader=None, ttl=None):
+    """Fundamentals (``Ticker.info``) through the shared cache.
+
+    ``loader`` lets callers wrap the upstream call on a miss (e.g. to apply a
+    rate limit); it defaults to the active provider.
+    """
+    loader = loader or (lambda: get_provider().info(symbol))
+    return copy.copy(info_cache.get_or_load(symbol.upper(), loader, ttl=ttl,
+                                            expires=_session_expiry(info_cache, [symbol])))
+
+
+def cached_major_holders(symbol):
+    holders = info_cache.get_or_load(("holders", symbol.upper()), lambda: get_provider().major_holders(symbol),
+                                     expires=_session_expiry(info_cache, [symbol]))
+    return holders.copy()
@@ -0,0 +1,253 @@
+"""Full and rolling covariance / correlation over a universe of daily returns.
+
+``RollingCovariance`` keeps the mean vector and co-moment matrix of the last
+``window`` return rows and updates them Welford-style: adding a day and
+dropping the oldest one costs O(assets^2), whatever the window length. The
+module keeps one such state per (universe, window), so a dashboard rerun
+after a new trading day pushes just that day instead of recomputing every
+window from scratch. The state remembers a fingerprint of the rows in its
+window and is rebuilt when the data under it changed (a revised live bar,
+split-adjusted history), and it recomputes its moments exactly every
+``RESYNC_EVERY`` pushes so floating-point drift cannot accumulate. Only the
+``MAX_STATES`` most recently used states are kept.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.spatial.distance import squareform
+
+# Assets need at least this share of the rows in the window to be kept
+MIN_COVERAGE = 0.9
+# Recompute the mean and co-moment from the window's rows after this many incremental updates
+RESYNC_EVERY = 250
+# Rolling states kept between calls, least recently used evicted first; one is ~assets^2 floats
+# plus the window's rows (a few MB at 500 assets)
+MAX_STATES = 8
+
+
+def daily_returns(prices, min_coverage=MIN_COVERAGE):
+    """Simple daily returns of a dates x tickers matrix, on rows where every kept ticker traded.
+
+    Tickers with less than ``min_coverage`` of the history (recent listings)
+    are dropped rather than cutting every other ticker's window short, and so
+    are tickers whose price never moved (suspended, forward-filled): their
+    correlation with anything is undefined.
+    """
+    returns = prices.pct_change(fill_method=None).iloc[1:]
+    keep = returns.notna().mean() >= min_coverage
+    returns = returns.loc[:, keep].dropna(how="any")
+    return returns.loc[:, returns.std() > 0]
+
+
+def _std(cov):
+    # Incremental updates leave a flat asset ~1e-10 of volatility rather than exactly 0; count it as flat
+    std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+    return np.where(std > 1e-6 * std.max(initial=0.0), std, 0.0)
+
+
+def _corr_from_cov(cov):
+    std = _std(cov)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    corr[~np.isfinite(corr)] = np.nan
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def covariance(returns):
+    values = returns.to_numpy(dtype=float)
+    centered = values - values.mean(axis=0)
+    cov = centered.T @ centered / (len(values) - 1)
+    return pd.DataFrame(cov, index=returns.columns, columns=returns.columns)
+
+
+def correlation(returns):
+    cov = covariance(returns)
+    return pd.DataFrame(_corr_from_cov(cov.to_numpy()), index=cov.index, columns=cov.columns)
+
+
+class RollingCovariance:
+    """Sliding-window covariance with O(assets^2) add/remove updates."""
+
+    def __init__(self, window, assets, resync_every=RESYNC_EVERY):
+        self.window = window
+        self.resync_every = resync_every
+        self.rows = deque()
+        self.mean = np.zeros(assets)
+        self.comoment = np.zeros((assets, assets))
+        self._updates = 0
+
+    def _add(self, x):
+        self.rows.append(x)
+        delta = x - self.mean
+        self.mean += delta / len(self.rows)
+        self.comoment += np.outer(delta, x - self.mean)
+
+    def _remove(self):
+        y = self.rows.popleft()
+        if not self.rows:
+            self.mean[:] = 0.0
+            self.comoment[:] = 0.0
+            return
+        delta = y - self.mean
+        self.mean -= delta / len(self.rows)
+        self.comoment -= np.outer(delta, y - self.mean)
+
+    def push(self, x):
+        self._add(np.asarray(x, dtype=float))
+        if len(self.rows) > self.window:
+            self._remove()
+        self._updates += 1
+        if self._updates >= self.resync_every:
+            self.resync()
+
+    def resync(self):
+        """Recompute the moments from the rows in the window, discarding accumulated rounding error."""
+        values = self.values()
+        self.mean = values.mean(axis=0)
+        centered = values - self.mean
+        self.comoment = centered.T @ centered
+        self._updates = 0
+
+    def values(self):
+        return np.array(self.rows, dtype=float).reshape(len(self.rows), len(self.mean))
+
+    def fingerprint(self):
+        return _fingerprint(self.values())
+
+    @property
+    def ready(self):
+        return len(self.rows) == self.window
+
+    def covariance(self):
+        return self.comoment / (len(self.rows) - 1)
+
+    def correlation(self):
+        return _corr_from_cov(self.covariance())
+
+
+def _mean_pairwise_correlation(cov):
+    # sum_ij cov_ij / (s_i s_j) as one quadratic form, without building the correlation matrix.
+    # Assets flat for the whole window have no correlation and are left out of the average.
+    std = _std(cov)
+    moving = std > 0
+    if not moving.all():
+        cov, std = cov[np.ix_(moving, moving)], std[moving]
+    n = len(cov)
+    if n < 2:
+        return np.nan
+    inv = 1.0 / std
+    return (inv @ cov @ inv - n) / (n * (n - 1))
+
+
+def _fingerprint(values):
+    return hashlib.blake2b(np.ascontiguousarray(values, dtype=float).tobytes(), digest_size=16).hexdigest()
+
+
+class _RollingEntry:
+    def __init__(self, columns, window):
+        self.columns = list(columns)
+        self.state = RollingCovariance(window, len(self.columns))
+        self.last_date = None
+        self.fingerprint = None
+        self.average = {}
+
+    def matches(self, returns):
+        """True when ``returns`` still holds, unchanged, every row this state has consumed in its window."""
+        if self.columns != list(returns.columns):
+            return False
+        if self.last_date is None:
+            return True
+        if self.last_date not in returns.index:
+            return False
+        seen = returns.loc[:self.last_date].iloc[-len(self.state.rows):]
+        return len(seen) == len(self.state.rows) and _fingerprint(seen.to_numpy(dtype=float)) == self.fingerprint
+
+
+_states = OrderedDict()
+_key_locks = {}
+_states_lock = threading.Lock()
+
+
+def _lock_for(state_key):
+    with _states_lock:
+        return _key_locks.setdefault(state_key, threading.Lock())
+
+
+def _get_state(state_key):
+    with _states_lock:
+        entry = _states.get(state_key)
+        if entry is not None:
+            _states.move_to_end(state_key)
+        return entry
+
+
+def _put_state(state_key, entry):
+    with _states_lock:
+        _states[state_key] = entry
+        _states.move_to_end(state_key)
+        while len(_states) > MAX_STATES:
+            _states.popitem(last=False)
+        # Locks of evicted states go too, unless a call still holds one (it is dropped on a later pass)
+        for key in [k for k, lock in _key_locks.items() if k not in _states and not lock.locked()]:
+            del _key_locks[key]
+
+
+def rolling_correlation(returns, window, key=None):
+    """Latest ``window``-day correlation matrix and the mean pairwise correlation of every window.
+
+    Returns ``(matrix, average)``: a tickers x tickers DataFrame (None until a
+    full window exists) and a Series indexed by each window's last date. With
+    a ``key`` the rolling state is kept between calls, so only days after the
+    last one seen are pushed; a different ticker set, or a history whose rows
+    in the current window no longer match what was pushed, rebuilds it.
+    Calls for different keys run concurrently.
+    """
+    if key is None:
+        return _rolling_correlation(returns, window, None)
+    with _lock_for((key, window)):
+        return _rolling_correlation(returns, window, (key, window))
+
+
+def _rolling_correlation(returns, window, state_key):
+    entry = _get_state(state_key) if state_key is not None else None
+    if entry is None or not entry.matches(returns):
+        entry = _RollingEntry(returns.columns, window)
+
+    new_rows = returns if entry.last_date is None else returns.loc[returns.index > entry.last_date]
+    values = new_rows.to_numpy(dtype=float)
+    for date, row in zip(new_rows.index, values):
+        entry.state.push(row)
+        if entry.state.ready:
+            entry.average[date] = _mean_pairwise_correlation(entry.state.covariance())
+    if len(new_rows):
+        entry.last_date = new_rows.index[-1]
+        entry.fingerprint = entry.state.fingerprint()
+    # Only dates still inside the caller's history are ever returned, so older ones are dropped
+    if len(returns):
+        entry.average = {date: value for date, value in entry.average.items() if date >= returns.index[0]}
+
+    matrix = None
+    if entry.state.ready:
+        matrix = pd.DataFrame(entry.state.correlation(), index=entry.columns, columns=entry.columns)
+    average = pd.Series(entry.average, dtype=float).sort_index()
+    if state_key is not None:
+        _put_state(state_key, entry)
+    return matrix, average
+
+
+def cluster_order(corr):
+    """Ticker order that groups co-moving names (average-linkage on ``sqrt((1 - corr) / 2)``)."""
+    if len(corr) < 3:
+        return list(corr.index)
+    distance = np.sqrt(np.clip((1.0 - corr.to_numpy()) / 2.0, 0.0, None))
+    # A ticker flat over the window has NaN correlations; place it as far from everything as possible
+    distance = np.nan_to_num(distance, nan=1.0)
+    np.fill_diagonal(distance, 0.0)
+    order = leaves_list(linkage(squareform(distance, checks=False), method="average"))
+    return [corr.index[i] for i in order]
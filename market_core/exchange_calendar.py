@@ -0,0 +1,352 @@
+"""Exchange calendars: trading sessions, holidays and session-aligned cache expiry.
+
+Each ``ExchangeCalendar`` precomputes its sessions once (open and close
+instants as sorted int64 UTC nanoseconds, early closes included), so "is it
+open", "last close" and "next open" are binary searches. Holidays come from
+rules (weekend substitution, Easter, n-th weekday) plus ``ANNOUNCED_HOLIDAYS``
+for dates that follow a lunar calendar or are declared each year; append
+each year's exchange circular there. A missing announced holiday only costs
+a redundant refresh on that day.
+
+``data_expiry`` is what the caches use: data loaded while a market is
+trading expires by that session's close, and data loaded once it has closed
+(and the final bars have settled) stays valid until the next open.
+"""
+
+import datetime
+import logging
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Final daily bars and fundamentals reach upstream a few minutes after the close
+SETTLE_MINUTES = 20
+SESSION_YEARS_BEHIND = 10
+SESSION_YEARS_AHEAD = 5
+
+logger = logging.getLogger(__name__)
+
+# Holidays declared per year by circular (lunar festivals, elections, one-off closures)
+ANNOUNCED_HOLIDAYS = {
+    "NSE": [
+        "2024-01-22", "2024-03-08", "2024-03-25", "2024-04-11", "2024-04-17", "2024-05-20", "2024-06-17",
+        "2024-07-17", "2024-11-01", "2024-11-15", "2024-11-20",
+        "2025-02-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-08-27", "2025-10-21", "2025-10-22",
+        "2025-11-05",
+        "2026-03-03", "2026-03-26", "2026-03-31", "2026-05-28", "2026-06-26", "2026-09-14", "2026-10-20",
+        "2026-11-10", "2026-11-24",
+    ],
+    "HKEX": [
+        "2024-02-12", "2024-02-13", "2024-04-04", "2024-05-15", "2024-06-10", "2024-09-18", "2024-10-11",
+        "2025-01-29", "2025-01-30", "2025-01-31", "2025-04-04", "2025-05-05", "2025-10-07", "2025-10-29",
+        "2026-02-17", "2026-02-18", "2026-02-19", "2026-04-07", "2026-05-25", "2026-06-19", "2026-10-19",
+    ],
+    "NYSE": ["2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14", "2004-06-11", "2007-01-02",
+             "2012-10-29", "2012-10-30", "2018-12-05", "2025-01-09"],
+    "LSE": ["2011-04-29", "2012-06-05", "2022-06-03", "2022-09-19", "2023-05-08"],
+}
+# Exchanges whose lunar holidays come only from the table above, so a missing year means wrong sessions
+ANNOUNCED_EVERY_YEAR = ("NSE", "HKEX")
+
+
+# ------------------- Holiday rules -------------------
+
+def easter(year):
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def _nth_weekday(year, month, weekday, n):
+    """n-th (1-based; -1 = last) ``weekday`` (Mon=0) of a month."""
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _us_observed(day):
+    # Saturday holidays move to Friday, Sunday holidays to Monday
+    if day.weekday() == 5:
+        return day - datetime.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + datetime.timedelta(days=1)
+    return day
+
+
+def _next_weekday(day, taken=()):
+    while day.weekday() >= 5 or day in taken:
+        day += datetime.timedelta(days=1)
+    return day
+
+
+def _nyse_holidays(year):
+    good_friday = easter(year) - datetime.timedelta(days=2)
+    days = [
+        good_friday,
+        _nth_weekday(year, 2, 0, 3),   # Washington's Birthday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _us_observed(datetime.date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),   # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _us_observed(datetime.date(year, 12, 25)),
+    ]
+    # A Saturday New Year's Day is not observed on the Friday before
+    new_year = datetime.date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.append(_us_observed(new_year))
+    if year >= 1998:
+        days.append(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    if year >= 2022:
+        days.append(_us_observed(datetime.date(year, 6, 19)))
+    return days
+
+
+def _nyse_early_closes(year):
+    # 13:00 closes: the day before Independence Day, the day after Thanksgiving, Christmas Eve
+    days = [_nth_weekday(year, 11, 3, 4) + datetime.timedelta(days=1)]
+    for day in (datetime.date(year, 7, 3), datetime.date(year, 12, 24)):
+        if day.weekday() < 4:
+            days.append(day)
+    return {day: datetime.time(13, 0) for day in days}
+
+
+def _uk_christmas(year):
+    christmas, boxing = datetime.date(year, 12, 25), datetime.date(year, 12, 26)
+    first = _next_weekday(christmas)
+    return [first, _next_weekday(boxing, taken=(first,))]
+
+
+def _lse_holidays(year):
+    sunday = easter(year)
+    early_may = _nth_weekday(year, 5, 0, 1)
+    spring = _nth_weekday(year, 5, 0, -1)
+    # Bank holidays moved for VE-day anniversaries and jubilees
+    early_may = {1995: datetime.date(1995, 5, 8), 2020: datetime.date(2020, 5, 8)}.get(year, early_may)
+    spring = {2002: datetime.date(2002, 6, 4), 2012: datetime.date(2012, 6, 4),
+              2022: datetime.date(2022, 6, 2)}.get(year, spring)
+    return [
+        _next_weekday(datetime.date(year, 1, 1)),
+        sunday - datetime.timedelta(days=2),
+        sunday + datetime.timedelta(days=1),
+        early_may,
+        spring,
+        _nth_weekday(year, 8, 0, -1),
+        *_uk_christmas(year),
+    ]
+
+
+def _half_days(year, close):
+    days = (datetime.date(year, 12, 24), datetime.date(year, 12, 31))
+    return {day: close for day in days if day.weekday() < 5}
+
+
+def _hkex_holidays(year):
+    sunday = easter(year)
+
+    def sunday_to_monday(day):
+        return day + datetime.timedelta(days=1) if day.weekday() == 6 else day
+
+    christmas = _uk_christmas(year)
+    return [
+        sunday_to_monday(datetime.date(year, 1, 1)),
+        sunday - datetime.timedelta(days=2),
+        sunday + datetime.timedelta(days=1),
+        sunday_to_monday(datetime.date(year, 5, 1)),
+        sunday_to_monday(datetime.date(year, 7, 1)),
+        sunday_to_monday(datetime.date(year, 10, 1)),
+        *christmas,
+    ]
+
+
+def _nse_holidays(year):
+    # Fixed-date national holidays are not moved when they fall on a weekend
+    fixed = [(1, 26), (4, 14), (5, 1), (8, 15), (10, 2), (12, 25)]
+    return [datetime.date(year, m, d) for m, d in fixed] + [easter(year) - datetime.timedelta(days=2)]
+
+
+# ------------------- Calendars -------------------
+
+class ExchangeCalendar:
+    def __init__(self, name, tz, open_time, close_time, holiday_rule=None, early_close_rule=None):
+        self.name = name
+        self.tz = tz
+        self.open_time = open_time
+        self.close_time = close_time
+        self._holiday_rule = holiday_rule
+        self._early_close_rule = early_close_rule
+        self._announced = {datetime.date.fromisoformat(d) for d in ANNOUNCED_HOLIDAYS.get(name, [])}
+
+        this_year = datetime.date.today().year
+        if name in ANNOUNCED_EVERY_YEAR and not any(day.year == this_year for day in self._announced):
+            logger.warning("No announced %s holidays for %d in ANNOUNCED_HOLIDAYS; lunar and declared "
+                           "holidays will be treated as sessions until the circular is added", name, this_year)
+        self.first_year = this_year - SESSION_YEARS_BEHIND
+        self.last_year = this_year + SESSION_YEARS_AHEAD
+        days = pd.bdate_range(f"{self.first_year}-01-01", f"{self.last_year}-12-31")
+        holidays = set()
+        early = {}
+        for year in range(self.first_year, self.last_year + 1):
+            holidays.update(self.holidays(year))
+            early.update(self.early_closes(year))
+        days = days[~days.isin(pd.DatetimeIndex(sorted(holidays)))]
+        self.sessions = days
+
+        # Early closes override the regular close; wall-clock times are localized afterwards for DST
+        close_offsets = pd.Series(self._offset(close_time), index=days)
+        early = pd.Series({pd.Timestamp(day): self._offset(t) for day, t in early.items()}, dtype="timedelta64[ns]")
+        close_offsets.update(early[early.index.isin(days)])
+        closes = days + pd.TimedeltaIndex(close_offsets)
+        self._opens = (days + self._offset(open_time)).tz_localize(tz).tz_convert("UTC").as_unit("ns").asi8
+        self._closes = closes.tz_localize(tz).tz_convert("UTC").as_unit("ns").asi8
+
+    @staticmethod
+    def _offset(t):
+        return pd.Timedelta(hours=t.hour, minutes=t.minute)
+
+    @staticmethod
+    def _now_ns(ts):
+        ts = pd.Timestamp.now(tz="UTC") if ts is None else pd.Timestamp(ts)
+        if ts.tz is None:
+            ts = ts.tz_localize("UTC")
+        return ts.as_unit("ns").value
+
+    def _timestamp(self, ns):
+        return pd.Timestamp(ns, tz="UTC").tz_convert(self.tz)
+
+    def holidays(self, year):
+        days = set(self._holiday_rule(year)) if self._holiday_rule else set()
+        return days | {d for d in self._announced if d.year == year}
+
+    def early_closes(self, year):
+        return self._early_close_rule(year) if self._early_close_rule else {}
+
+    def is_session(self, day):
+        day = pd.Timestamp(day).date()
+        return day.weekday() < 5 and day not in self.holidays(day.year)
+
+    def session_close(self, day):
+        """Local close instant of ``day`` (an early close if it has one), whether or not it traded."""
+        day = pd.Timestamp(day).date()
+        close = self.early_closes(day.year).get(day, self.close_time)
+        return pd.Timestamp(datetime.datetime.combine(day, close)).tz_localize(self.tz)
+
+    def is_open(self, ts=None):
+        t = self._now_ns(ts)
+        i = np.searchsorted(self._opens, t, side="right") - 1
+        return bool(i >= 0 and t < self._closes[i])
+
+    def session_date(self, ts=None):
+        """Exchange-local date of the latest session opened at or before ``ts``: the bar a quote at ``ts`` belongs to."""
+        i = np.searchsorted(self._opens, self._now_ns(ts), side="right") - 1
+        return self.sessions[max(i, 0)].date()
+
+    def last_close(self, ts=None):
+        """Latest session close at or before ``ts`` (default now), in exchange time."""
+        i = np.searchsorted(self._closes, self._now_ns(ts), side="right") - 1
+        return self._timestamp(self._closes[max(i, 0)])
+
+    def next_open(self, ts=None):
+        """First session open after ``ts``, in exchange time."""
+        i = np.searchsorted(self._opens, self._now_ns(ts), side="right")
+        return self._timestamp(self._opens[min(i, len(self._opens) - 1)])
+
+    def next_close(self, ts=None):
+        i = np.searchsorted(self._closes, self._now_ns(ts), side="right")
+        return self._timestamp(self._closes[min(i, len(self._closes) - 1)])
+
+    def last_settled(self, ts=None):
+        """Latest close whose final data should be upstream by ``ts`` (close + ``SETTLE_MINUTES``)."""
+        settle = pd.Timedelta(minutes=SETTLE_MINUTES)
+        close = self.last_close(pd.Timestamp(self._now_ns(ts), tz="UTC") - settle)
+        return close + settle
+
+    def is_settled(self, ts=None):
+        """True when no session is trading or settling, so data fetched now stays current until the next open."""
+        t = self._now_ns(ts)
+        i = np.searchsorted(self._opens, t, side="right") - 1
+        return bool(i < 0 or t >= self._closes[i] + pd.Timedelta(minutes=SETTLE_MINUTES).value)
+
+    def data_expiry(self, ts=None, ttl=None):
+        """When data loaded at ``ts`` goes stale: the next open once settled, else ``ttl`` capped at the close."""
+        t = self._now_ns(ts)
+        if self.is_settled(t):
+            return self.next_open(t)
+        close = self._closes[np.searchsorted(self._opens, t, side="right") - 1]
+        # Within the session expire by the close; while settling, once the final bars are due
+        cap = close if t < close else close + pd.Timedelta(minutes=SETTLE_MINUTES).value
+        if ttl is not None:
+            cap = min(cap, t + int(ttl * 1e9))
+        return self._timestamp(cap)
+
+
+_CALENDARS = {
+    "NSE": lambda: ExchangeCalendar("NSE", "Asia/Kolkata", datetime.time(9, 15), datetime.time(15, 30),
+                                    _nse_holidays),
+    "NYSE": lambda: ExchangeCalendar("NYSE", "America/New_York", datetime.time(9, 30), datetime.time(16, 0),
+                                     _nyse_holidays, _nyse_early_closes),
+    "HKEX": lambda: ExchangeCalendar("HKEX", "Asia/Hong_Kong", datetime.time(9, 30), datetime.time(16, 0),
+                                     _hkex_holidays, lambda y: _half_days(y, datetime.time(12, 0))),
+    "LSE": lambda: ExchangeCalendar("LSE", "Europe/London", datetime.time(8, 0), datetime.time(16, 30),
+                                    _lse_holidays, lambda y: _half_days(y, datetime.time(12, 30))),
+    # Unknown venues: plain weekdays with the dashboard's historical 16:00 UTC close
+    "UTC": lambda: ExchangeCalendar("UTC", "UTC", datetime.time(0, 0), datetime.time(16, 0)),
+}
+ALIASES = {"BSE": "NSE", "NASDAQ": "NYSE"}
+
+# Yahoo ticker suffix -> exchange; no suffix means a US listing
+SUFFIXES = {".NS": "NSE", ".BO": "BSE", ".HK": "HKEX", ".L": "LSE", ".US": "NYSE", ".NYSE": "NYSE",
+            ".NASDAQ": "NASDAQ"}
+# Other Yahoo exchange suffixes: real venues without a calendar here, so plain weekdays. Any other
+# dotted suffix is a US share class (BRK.B, BF.A) and stays on NYSE.
+OTHER_SUFFIXES = frozenset({
+    ".AS", ".AT", ".AX", ".BA", ".BE", ".BK", ".BR", ".CN", ".CO", ".DE", ".DU", ".F", ".HA", ".HE", ".HM",
+    ".IC", ".IL", ".IR", ".IS", ".JK", ".JO", ".KL", ".KQ", ".KS", ".LS", ".MC", ".ME", ".MI", ".MU", ".MX",
+    ".NE", ".NZ", ".OL", ".PA", ".PR", ".QA", ".SA", ".SAU", ".SG", ".SI", ".SN", ".SR", ".SS", ".ST", ".SW",
+    ".SZ", ".T", ".TA", ".TO", ".TW", ".TWO", ".V", ".VI",
+})
+INDEX_EXCHANGES = {"^NSEI": "NSE", "^NSEBANK": "NSE", "^BSESN": "BSE", "^HSI": "HKEX", "^FTSE": "LSE"}
+
+
+@lru_cache(maxsize=None)
+def get_calendar(exchange):
+    exchange = ALIASES.get(exchange.upper(), exchange.upper())
+    if exchange not in _CALENDARS:
+        raise KeyError(f"unknown exchange {exchange!r}; known: {', '.join(sorted(_CALENDARS) + sorted(ALIASES))}")
+    return _CALENDARS[exchange]()
+
+
+def exchange_of(symbol):
+    symbol = symbol.upper()
+    if symbol in INDEX_EXCHANGES:
+        return INDEX_EXCHANGES[symbol]
+    if symbol.startswith("^"):
+        return "UTC"
+    dot = symbol.rfind(".")
+    if dot == -1:
+        return "NYSE"
+    suffix = symbol[dot:]
+    if suffix in SUFFIXES:
+        return SUFFIXES[suffix]
+    return "UTC" if suffix in OTHER_SUFFIXES else "NYSE"
+
+
+def calendar_for(symbol):
+    return get_calendar(exchange_of(symbol))
+
+
+def data_expiry(symbols, ttl=None, ts=None):
+    """Epoch seconds when data for ``symbols`` loaded at ``ts`` goes stale: the earliest across their exchanges."""
+    calendars = {get_calendar(exchange) for exchange in {exchange_of(symbol) for symbol in symbols}}
+    if not calendars:
+        return None
+    return min(calendar.data_expiry(ts, ttl) for calendar in calendars).timestamp()
@@ -0,0 +1,91 @@
+"""Daily fundamentals snapshots, one Parquet partition per calendar day.
+
+Each day's projected per-ticker fields live in
+``STORE_DIR/fundamentals/date=YYYY-MM-DD/snapshot.parquet`` (indexed by
+ticker). A dashboard visit reads today's partition, fetches only the tickers
+that are missing or stale, and merges them back in; older partitions form a
+free time series of every stored field.
+"""
+
+import os
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+
+from market_core.ohlcv_store import STORE_DIR
+
+FETCHED_AT = "Fetched At"
+
+
+class FundamentalsStore:
+    def __init__(self, root=os.path.join(STORE_DIR, "fundamentals")):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, day):
+        return os.path.join(self.root, f"date={pd.Timestamp(day).date().isoformat()}", "snapshot.parquet")
+
+    def days(self):
+        """Dates that have a stored snapshot, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        found = []
+        for name in os.listdir(self.root):
+            if name.startswith("date=") and os.path.exists(os.path.join(self.root, name, "snapshot.parquet")):
+                found.append(date.fromisoformat(name[len("date="):]))
+        return sorted(found)
+
+    def load(self, day=None, columns=None):
+        """Return the snapshot for ``day`` (default today); empty frame if there is none."""
+        path = self._path(day or date.today())
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        return pd.read_parquet(path, columns=columns)
+
+    def stale(self, tickers, day=None, max_age=None):
+        """Tickers without a row in ``day``'s snapshot, or whose row is older than ``max_age`` seconds."""
+        snapshot = self.load(day, columns=[FETCHED_AT])
+        if snapshot.empty:
+            return list(tickers)
+        fetched_at = snapshot[FETCHED_AT]
+        cutoff = None if max_age is None else time.time() - max_age
+        return [t for t in tickers
+                if t not in fetched_at.index or (cutoff is not None and fetched_at[t] < cutoff)]
+
+    def save(self, frame, day=None):
+        """Merge ``frame`` (indexed by ticker) into ``day``'s snapshot; newer rows replace older ones."""
+        if frame.empty:
+            return
+        frame = frame.copy()
+        frame[FETCHED_AT] = time.time()
+        path = self._path(day or date.today())
+        with self._lock:
+            stored = self.load(day)
+            if not stored.empty:
+                frame = pd.concat([stored[~stored.index.isin(frame.index)], frame])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write-then-rename so concurrent readers never see a half-written file
+            frame.to_parquet(path + ".tmp")
+            os.replace(path + ".tmp", path)
+
+    def history(self, column, tickers=None, start=None, end=None):
+        """Time series of one stored field as a dates x tickers frame, read from local snapshots only."""
+        series = {}
+        for day in self.days():
+            if (start is not None and day < pd.Timestamp(start).date()) or \
+                    (end is not None and day > pd.Timestamp(end).date()):
+                continue
+            # Snapshots written before a field existed lack its column; those days read as NaN
+            snapshot = self.load(day)
+            snapshot = snapshot.reindex(columns=[column])
+            if tickers is not None:
+                snapshot = snapshot.reindex([t for t in tickers if t in snapshot.index])
+            series[pd.Timestamp(day)] = snapshot[column]
+        if not series:
+            return pd.DataFrame()
+        return pd.DataFrame(series).T.sort_index()
+
+
+default_store = FundamentalsStore()
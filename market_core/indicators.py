@@ -0,0 +1,283 @@
+"""Shared NumPy indicator engine (RSI, EMA, MACD, SMA) for every sub-app.
+
+All indicators are computed from one contiguous array in a single call. The
+input may be 1-D (one price series) or 2-D (tickers x bars), in which case the
+whole universe is processed in one batched pass along the bar axis. Rows may
+start with NaN (e.g. later listing dates); interior gaps should be filled by
+the caller.
+
+``warmup=True`` reproduces the ``ta`` library conventions (values are NaN
+until each indicator has a full window, and the signal line is seeded from
+the first valid MACD). ``warmup=False`` reproduces plain pandas ``ewm`` with
+``adjust=False``, as used by the pure-math dashboard.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+def _as_2d(values, dtype):
+    arr = np.ascontiguousarray(values, dtype=dtype)
+    return arr.reshape(1, -1) if arr.ndim == 1 else arr
+
+
+def _first_valid(arr):
+    valid = ~np.isnan(arr)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), arr.shape[1])
+
+
+def _ema_2d(arr, alpha, min_periods=0):
+    out = np.full_like(arr, np.nan)
+    first = _first_valid(arr)
+    # y[t] = alpha * x[t] + (1 - alpha) * y[t-1], seeded with the first valid value;
+    # rows sharing a start offset are filtered together
+    for start in np.unique(first):
+        if start >= arr.shape[1]:
+            continue
+        rows = first == start
+        segment = arr[rows, start:]
+        zi = (1.0 - alpha) * segment[:, :1]
+        out[rows, start:], _ = lfilter([alpha], [1.0, alpha - 1.0], segment, axis=1, zi=zi.astype(arr.dtype))
+        if min_periods > 1:
+            out[rows, start:start + min_periods - 1] = np.nan
+    return out
+
+
+def _sma_2d(arr, window):
+    valid = ~np.isnan(arr)
+    # Cumulative sums in float64 keep float32 inputs accurate over long histories
+    sums = np.cumsum(np.where(valid, arr, 0.0), axis=1, dtype=np.float64)
+    counts = np.cumsum(valid, axis=1)
+    window_sums = sums.copy()
+    window_counts = counts.copy()
+    window_sums[:, window:] -= sums[:, :-window]
+    window_counts[:, window:] -= counts[:, :-window]
+    out = np.where(window_counts == window, window_sums / window, np.nan)
+    return out.astype(arr.dtype)
+
+
+def _restore_shape(arr, ndim):
+    return arr[0] if ndim == 1 else arr
+
+
+def ema(values, span, warmup=False, dtype=np.float64):
+    arr = _as_2d(values, dtype)
+    out = _ema_2d(arr, 2.0 / (span + 1.0), span if warmup else 0)
+    return _restore_shape(out, np.ndim(values))
+
+
+def sma(values, window, dtype=np.float64):
+    arr = _as_2d(values, dtype)
+    return _restore_shape(_sma_2d(arr, window), np.ndim(values))
+
+
+def compute_indicators(close, rsi_window=14, fast=12, slow=26, signal=9,
+                       sma_windows=(20, 50), warmup=False, dtype=np.float64):
+    """Compute RSI, EMAs, MACD/signal/histogram and SMAs for ``close`` in one pass.
+
+    Returns a dict of arrays shaped like ``close``: ``RSI``, ``EMA{fast}``,
+    ``EMA{slow}``, ``MACD``, ``Signal``, ``MACD_Diff`` and ``SMA{w}`` per window.
+    """
+    ndim = np.ndim(close)
+    arr = _as_2d(close, dtype)
+
+    # Wilder RSI on gains/losses of the bar-to-bar change
+    delta = np.full_like(arr, np.nan)
+    delta[:, 1:] = arr[:, 1:] - arr[:, :-1]
+    if warmup:
+        # ta counts the first bar as a zero change
+        first = _first_valid(arr)
+        has_data = first < arr.shape[1]
+        delta[has_data, first[has_data]] = 0.0
+    gain = np.where(np.isnan(delta), delta, np.clip(delta, 0.0, None))
+    loss = np.where(np.isnan(delta), delta, -np.clip(delta, None, 0.0))
+    rsi_periods = rsi_window if warmup else 0
+    avg_gain = _ema_2d(gain, 1.0 / rsi_window, rsi_periods)
+    avg_loss = _ema_2d(loss, 1.0 / rsi_window, rsi_periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+    rsi[np.isnan(avg_gain) | np.isnan(avg_loss)] = np.nan
+
+    ema_fast = _ema_2d(arr, 2.0 / (fast + 1.0), fast if warmup else 0)
+    ema_slow = _ema_2d(arr, 2.0 / (slow + 1.0), slow if warmup else 0)
+    macd = ema_fast - ema_slow
+    macd_signal = _ema_2d(macd, 2.0 / (signal + 1.0), signal if warmup else 0)
+
+    result = {
+        "RSI": rsi,
+        f"EMA{fast}": ema_fast,
+        f"EMA{slow}": ema_slow,
+        "MACD": macd,
+        "Signal": macd_signal,
+        "MACD_Diff": macd - macd_signal,
+    }
+    for window in sma_windows:
+        result[f"SMA{window}"] = _sma_2d(arr, window)
+    return {name: _restore_shape(values.astype(dtype, copy=False), ndim) for name, values in result.items()}
+
+
+def indicator_frame(close, **kwargs):
+    """``compute_indicators`` for a single pandas Series, returned as a DataFrame on its index."""
+    return pd.DataFrame(compute_indicators(close.to_numpy(), **kwargs), index=close.index)
+
+
+# ------------------- Incremental (live) state -------------------
+
+class _EmaState:
+    """One EMA recursion, seeded with its first input; ``peek`` previews the next value without committing it."""
+
+    __slots__ = ("alpha", "value", "count")
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.value = None
+        self.count = 0
+
+    def peek(self, x):
+        return x if self.value is None else self.value + self.alpha * (x - self.value)
+
+    def push(self, x):
+        self.value = self.peek(x)
+        self.count += 1
+
+
+class _WindowSum:
+    """Running sum of the last ``size`` committed values (NaNs are counted but add nothing)."""
+
+    __slots__ = ("values", "total", "valid")
+
+    def __init__(self, size):
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+        self.valid = 0
+
+    def push(self, x):
+        if self.values.maxlen == 0:
+            return
+        if len(self.values) == self.values.maxlen:
+            dropped = self.values[0]
+            if not np.isnan(dropped):
+                self.total -= dropped
+                self.valid -= 1
+        self.values.append(x)
+        if not np.isnan(x):
+            self.total += x
+            self.valid += 1
+
+
+class IndicatorState:
+    """Constant-time indicator updates for live prices.
+
+    Holds the EMA state, Wilder RSI averages and rolling SMA / MACD-trend sums
+    for every committed bar. ``append`` opens a new bar, ``update`` revises the
+    still-forming last bar with a new tick; both return the same indicators as
+    ``compute_indicators`` for that bar (plus ``Close`` and ``MACD_Avg``, the
+    mean MACD over the last ``trend_lookback`` bars) without touching history.
+    """
+
+    def __init__(self, rsi_window=14, fast=12, slow=26, signal=9, sma_windows=(20, 50),
+                 trend_lookback=30, warmup=True):
+        self.rsi_window, self.fast, self.slow, self.signal = rsi_window, fast, slow, signal
+        self.sma_windows = tuple(sma_windows)
+        self.warmup = warmup
+        self._prev_close = None
+        self._bars = 0
+        self._avg_gain = _EmaState(1.0 / rsi_window)
+        self._avg_loss = _EmaState(1.0 / rsi_window)
+        self._ema_fast = _EmaState(2.0 / (fast + 1.0))
+        self._ema_slow = _EmaState(2.0 / (slow + 1.0))
+        self._ema_signal = _EmaState(2.0 / (signal + 1.0))
+        self._sma_sums = {w: _WindowSum(w - 1) for w in self.sma_windows}
+        self._macd_sum = _WindowSum(trend_lookback - 1)
+        self._last = None
+
+    @classmethod
+    def from_closes(cls, closes, **kwargs):
+        """Replay a close history; the last close becomes the live bar ``update`` revises."""
+        state = cls(**kwargs)
+        for close in np.asarray(closes, dtype=np.float64):
+            state.append(close)
+        return state
+
+    def _periods(self, n):
+        return n if self.warmup else 0
+
+    def _evaluate(self, close):
+        """Indicators for ``close`` as the next bar after the committed ones, plus the inputs to commit."""
+        nan = float("nan")
+        if self._prev_close is None:
+            delta = 0.0 if self.warmup else nan
+        else:
+            delta = close - self._prev_close
+        if np.isnan(delta):
+            rsi, gain, loss = nan, None, None
+        else:
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            avg_gain, avg_loss = self._avg_gain.peek(gain), self._avg_loss.peek(loss)
+            if self._avg_gain.count + 1 < self._periods(self.rsi_window):
+                rsi = nan
+            else:
+                rsi = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        bars = self._bars + 1
+        ema_fast, ema_slow = self._ema_fast.peek(close), self._ema_slow.peek(close)
+        out_fast = ema_fast if bars >= self._periods(self.fast) else nan
+        out_slow = ema_slow if bars >= self._periods(self.slow) else nan
+        macd = out_fast - out_slow
+        if np.isnan(macd):
+            signal = nan
+        else:
+            signal = self._ema_signal.peek(macd)
+            if self._ema_signal.count + 1 < self._periods(self.signal):
+                signal = nan
+
+        values = {
+            "Close": close,
+            "RSI": rsi,
+            f"EMA{self.fast}": out_fast,
+            f"EMA{self.slow}": out_slow,
+            "MACD": macd,
+            "Signal": signal,
+            "MACD_Diff": macd - signal,
+        }
+        for window, window_sum in self._sma_sums.items():
+            full = self._bars >= window - 1
+            values[f"SMA{window}"] = (window_sum.total + close) / window if full else nan
+        valid = self._macd_sum.valid + (0 if np.isnan(macd) else 1)
+        values["MACD_Avg"] = (self._macd_sum.total + np.nan_to_num(macd)) / valid if valid else nan
+        return values, (gain, loss, macd)
+
+    def _commit(self, close):
+        _, (gain, loss, macd) = self._evaluate(close)
+        if gain is not None:
+            self._avg_gain.push(gain)
+            self._avg_loss.push(loss)
+        self._ema_fast.push(close)
+        self._ema_slow.push(close)
+        if not np.isnan(macd):
+            self._ema_signal.push(macd)
+        for window_sum in self._sma_sums.values():
+            window_sum.push(close)
+        self._macd_sum.push(macd)
+        self._prev_close = close
+        self._bars += 1
+
+    def append(self, close):
+        """Close the current live bar and open a new one at ``close``."""
+        if self._last is not None:
+            self._commit(self._last)
+        self._last = float(close)
+        return self._evaluate(self._last)[0]
+
+    def update(self, close):
+        """Revise the live bar with a new tick; nothing is committed."""
+        if self._last is None:
+            return self.append(close)
+        self._last = float(close)
+        return self._evaluate(self._last)[0]
+
+    def latest(self):
+        return self._evaluate(self._last)[0] if self._last is not None else None
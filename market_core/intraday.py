@@ -0,0 +1,93 @@
+"""Intraday bars stored once at base resolution and resampled on demand.
+
+The OHLCV store keeps ``BASE_INTERVAL`` bars; ``IntradayBars`` wraps them with
+a precomputed per-bar session-day code and the position where each session
+starts. Coarser intervals are built with vectorized session bucketing
+(``reduceat`` over contiguous buckets), so switching horizon or interval
+never needs another download.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+BASE_INTERVAL = "5m"
+BASE_PERIOD = "1mo"
+
+# Supported display intervals, in minutes
+RESAMPLE_MINUTES = {"5m": 5, "15m": 15, "30m": 30, "1h": 60}
+
+_NS_PER_DAY = 86_400 * 10**9
+_NS_PER_MINUTE = 60 * 10**9
+
+
+def _wall_clock_ns(index):
+    # Session dates and bucket offsets are defined in exchange-local wall-clock time
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+class IntradayBars:
+    def __init__(self, frame):
+        self.frame = frame.sort_index()
+        wall = _wall_clock_ns(self.frame.index)
+        self.day_codes = wall // _NS_PER_DAY
+        new_day = np.r_[True, self.day_codes[1:] != self.day_codes[:-1]] if len(wall) else np.zeros(0, dtype=bool)
+        # Position of the first bar of every session, and each bar's session number
+        self.day_starts = np.flatnonzero(new_day)
+        self._day_ids = np.cumsum(new_day) - 1
+        self._wall = wall
+        self._resampled = {}
+        self._lock = threading.Lock()
+
+    @property
+    def sessions(self):
+        return len(self.day_starts)
+
+    def session_mask(self, sessions):
+        """Boolean mask selecting the last ``sessions`` trading days."""
+        mask = np.zeros(len(self.frame), dtype=bool)
+        if self.sessions:
+            mask[self.day_starts[-min(sessions, self.sessions)]:] = True
+        return mask
+
+    def last_sessions(self, sessions):
+        return self.frame.loc[self.session_mask(sessions)]
+
+    def resample(self, interval):
+        """Bars aggregated to ``interval`` (a ``RESAMPLE_MINUTES`` key), memoised per instance.
+
+        Buckets are anchored on each session's first bar, so an hourly bar on a
+        09:15 open covers 09:15-10:14 and never spans two sessions.
+        """
+        if interval not in RESAMPLE_MINUTES:
+            raise ValueError(f"interval must be one of {tuple(RESAMPLE_MINUTES)}")
+        with self._lock:
+            if interval not in self._resampled:
+                self._resampled[interval] = self._aggregate(RESAMPLE_MINUTES[interval])
+            return self._resampled[interval]
+
+    def _aggregate(self, minutes):
+        frame = self.frame
+        if frame.empty:
+            return self
+        # Minutes since the session's first bar, then bucket number within the day
+        session_open = self._wall[self.day_starts][self._day_ids]
+        offset = (self._wall - session_open) // (_NS_PER_MINUTE * minutes)
+        bucket = self._day_ids * (_NS_PER_DAY // _NS_PER_MINUTE) + offset
+        starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+        ends = np.r_[starts[1:], len(frame)] - 1
+
+        columns = {}
+        if "Open" in frame:
+            columns["Open"] = frame["Open"].to_numpy()[starts]
+        if "High" in frame:
+            columns["High"] = np.maximum.reduceat(frame["High"].to_numpy(), starts)
+        if "Low" in frame:
+            columns["Low"] = np.minimum.reduceat(frame["Low"].to_numpy(), starts)
+        columns["Close"] = frame["Close"].to_numpy()[ends]
+        if "Volume" in frame:
+            columns["Volume"] = np.add.reduceat(frame["Volume"].to_numpy(), starts)
+        return IntradayBars(pd.DataFrame(columns, index=frame.index[starts]))
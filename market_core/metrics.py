@@ -0,0 +1,181 @@
+"""Process-wide performance instrumentation.
+
+Tracks phase timings (fetch / compute / entropy / render ...), upstream call
+counts, cache hits and misses, rate-limit events and bytes received, both in
+aggregate and for the Streamlit rerun currently executing. The rerun trace
+lives in a context variable; work handed to other threads (fetch pools,
+streaming helpers) is wrapped with ``bind_rerun`` so it is counted towards
+the rerun that started it.
+Aggregates are exported as Prometheus text (optionally served over HTTP) and
+each finished rerun can be appended to a JSON-lines file.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_lock = threading.Lock()
+_counters = {}
+_phases = {}
+_collectors = []
+_trace = contextvars.ContextVar("rerun_trace", default=None)
+_server = None
+
+# The metrics endpoint has no authentication, so it only listens locally unless told otherwise
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+
+# Optional JSON-lines sink for finished reruns, e.g. METRICS_JSONL=metrics/reruns.jsonl
+JSONL_PATH = os.environ.get("METRICS_JSONL")
+
+
+def _key(name, labels):
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def increment(name, value=1, **labels):
+    """Add ``value`` to a counter, in aggregate and on the current rerun."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    trace = _trace.get()
+    if trace is not None:
+        label = name + "".join(f"[{v}]" for _, v in key[1])
+        with _lock:
+            trace["counters"][label] = trace["counters"].get(label, 0) + value
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Time the enclosed block as phase ``name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with _lock:
+            count, total, longest = _phases.get(name, (0, 0.0, 0.0))
+            _phases[name] = (count + 1, total + elapsed, max(longest, elapsed))
+            trace = _trace.get()
+            if trace is not None:
+                trace["phases"][name] = trace["phases"].get(name, 0.0) + elapsed
+
+
+def register_collector(collect):
+    """Register ``collect() -> [(name, labels_dict, value), ...]`` for gauges owned elsewhere."""
+    with _lock:
+        _collectors.append(collect)
+
+
+# ------------------- Per-rerun traces -------------------
+
+def begin_rerun(page):
+    _trace.set({"page": page, "started": time.time(), "phases": {}, "counters": {},
+                "_perf_started": time.perf_counter()})
+
+
+def current_rerun():
+    return _trace.get()
+
+
+def bind_rerun(fn):
+    """Wrap ``fn`` so calls on any thread count towards the rerun active where it was wrapped."""
+    trace = _trace.get()
+    if trace is None:
+        return fn
+
+    @functools.wraps(fn)
+    def bound(*args, **kwargs):
+        token = _trace.set(trace)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _trace.reset(token)
+    return bound
+
+
+def end_rerun():
+    """Close the current rerun trace, append it to ``JSONL_PATH`` if set, and return it."""
+    trace = _trace.get()
+    if trace is None:
+        return None
+    _trace.set(None)
+    trace["total_seconds"] = time.perf_counter() - trace.pop("_perf_started")
+    with _lock:
+        count, total, longest = _phases.get("rerun", (0, 0.0, 0.0))
+        _phases["rerun"] = (count + 1, total + trace["total_seconds"], max(longest, trace["total_seconds"]))
+    if JSONL_PATH:
+        folder = os.path.dirname(JSONL_PATH)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with _lock, open(JSONL_PATH, "a") as f:
+            f.write(json.dumps(trace) + "\n")
+    return trace
+
+
+# ------------------- Export -------------------
+
+def snapshot():
+    """Current aggregates as plain data: ``{"counters": [...], "phases": {...}}``."""
+    with _lock:
+        counters = [(name, dict(labels), value) for (name, labels), value in _counters.items()]
+        phases = {name: {"count": c, "sum_seconds": t, "max_seconds": m} for name, (c, t, m) in _phases.items()}
+        collectors = list(_collectors)
+    for collect in collectors:
+        counters.extend(collect())
+    return {"counters": counters, "phases": phases}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+
+def prometheus_text():
+    data = snapshot()
+    lines = []
+    for name, labels, value in sorted(data["counters"], key=lambda row: (row[0], sorted(row[1].items()))):
+        lines.append(f"dashboard_{name}{_format_labels(labels)} {value}")
+    for name, stats in sorted(data["phases"].items()):
+        labels = _format_labels({"phase": name})
+        lines.append(f"dashboard_phase_seconds_count{labels} {stats['count']}")
+        lines.append(f"dashboard_phase_seconds_sum{labels} {stats['sum_seconds']:.6f}")
+        lines.append(f"dashboard_phase_seconds_max{labels} {stats['max_seconds']:.6f}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") == "/metrics":
+            body, content_type = prometheus_text().encode(), "text/plain; version=0.0.4"
+        elif self.path.rstrip("/") == "/metrics.json":
+            body, content_type = json.dumps(snapshot()).encode(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port, host=None):
+    """Serve ``/metrics`` (Prometheus) and ``/metrics.json`` on ``host:port``; no-op if already running.
+
+    ``host`` defaults to ``METRICS_HOST`` (localhost); bind ``0.0.0.0`` only behind a trusted network.
+    """
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host or METRICS_HOST, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True, name="metrics-server").start()
+    return _server
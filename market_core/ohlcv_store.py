@@ -0,0 +1,303 @@
+"""Persistent columnar OHLCV store with incremental "fetch only the missing bars" updates.
+
+Each (symbol, interval) pair lives in one Parquet file under ``STORE_DIR`` plus a
+small JSON sidecar recording how far back the file is known to be complete. A
+request loads the local copy, pulls only the bars after the last stored
+timestamp, and serves any period or start/end sub-range from disk.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+from market_core.async_fetch import fetch_all
+from market_core.exchange_calendar import calendar_for
+from market_core.providers import get_provider
+
+STORE_DIR = os.environ.get(
+    "MARKET_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".market_store"),
+)
+
+# Don't go back upstream for the same series more often than this
+MIN_REFRESH_SECONDS = 60
+
+# Backfills start this much earlier, so short ranges over weekends/holidays still get the last session
+BACKFILL_PAD = pd.Timedelta(days=7)
+
+# Symbols per batched upstream call in ``sync_many``; batches are fetched concurrently,
+# each allowed this long before it is abandoned and retried
+BATCH_SIZE = 50
+BATCH_TIMEOUT_SECONDS = 120
+
+_PERIOD_OFFSETS = {
+    "mo": lambda n: pd.DateOffset(months=n),
+    "y": lambda n: pd.DateOffset(years=n),
+    "wk": lambda n: pd.DateOffset(weeks=n),
+    "d": lambda n: pd.DateOffset(days=n),
+}
+
+
+def period_start(period, now):
+    """Translate a yfinance-style period ('5d', '3mo', 'ytd', 'max', ...) to a start timestamp.
+
+    Returns ``None`` for 'max', meaning the full available history.
+    """
+    period = period.lower()
+    if period == "max":
+        return None
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+    match = re.fullmatch(r"(\d+)(mo|y|wk|d)", period)
+    if not match:
+        raise ValueError(f"Unsupported period '{period}'")
+    n, unit = int(match.group(1)), match.group(2)
+    return now - _PERIOD_OFFSETS[unit](n)
+
+
+DAILY_INTERVALS = ("1d", "5d", "1wk", "1mo", "3mo")
+ACTION_COLUMNS = ("Dividends", "Stock Splits", "Capital Gains")
+
+
+def _normalize(frame, interval):
+    """Daily and longer bars are stored on tz-naive session dates, whatever source produced them."""
+    if not frame.empty and interval in DAILY_INTERVALS and frame.index.tz is not None:
+        frame = frame.copy()
+        frame.index = frame.index.tz_localize(None)
+    return frame
+
+
+def provider_fetch(symbol, interval, start=None):
+    """Default upstream source: full history when ``start`` is None, else bars from ``start`` onwards."""
+    return get_provider().history(symbol, interval, start)
+
+
+def provider_fetch_many(symbols, interval, start=None):
+    """Batched upstream source; returns ``{symbol: frame}``."""
+    return get_provider().history_many(symbols, interval, start)
+
+
+def _align(ts, tz):
+    """Express ``ts`` in ``tz``; naive timestamps are read as wall-clock time in ``tz``."""
+    if ts.tz is None:
+        return ts.tz_localize(tz) if tz is not None else ts
+    return ts.tz_convert(tz) if tz is not None else ts.tz_convert("UTC").tz_localize(None)
+
+
+class OHLCVStore:
+    def __init__(self, root=STORE_DIR, fetcher=provider_fetch, batch_fetcher=provider_fetch_many,
+                 min_refresh_seconds=MIN_REFRESH_SECONDS):
+        self.root = root
+        self.fetcher = fetcher
+        self.batch_fetcher = batch_fetcher
+        self.min_refresh_seconds = min_refresh_seconds
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------------- Files -------------------
+
+    def _paths(self, symbol, interval):
+        safe = re.sub(r"[^A-Za-z0-9._&^=-]", "_", symbol.upper())
+        folder = os.path.join(self.root, interval)
+        return os.path.join(folder, f"{safe}.parquet"), os.path.join(folder, f"{safe}.json")
+
+    def _lock(self, symbol, interval):
+        key = (symbol.upper(), interval)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def load(self, symbol, interval="1d"):
+        """Return ``(frame, meta)`` for what is stored locally; empty frame if nothing is."""
+        data_path, meta_path = self._paths(symbol, interval)
+        if not os.path.exists(data_path) or not os.path.exists(meta_path):
+            return pd.DataFrame(), {}
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return pd.read_parquet(data_path), meta
+
+    def _save(self, symbol, interval, frame, meta):
+        data_path, meta_path = self._paths(symbol, interval)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        # Write-then-rename so concurrent readers never see a half-written file
+        frame.to_parquet(data_path + ".tmp")
+        os.replace(data_path + ".tmp", data_path)
+        self._save_meta(symbol, interval, meta)
+
+    def _save_meta(self, symbol, interval, meta):
+        _, meta_path = self._paths(symbol, interval)
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    # ------------------- Sync -------------------
+
+    @staticmethod
+    def _merge(stored, fresh):
+        if stored.empty:
+            return fresh.sort_index()
+        if fresh.empty:
+            return stored
+        merged = pd.concat([stored, fresh])
+        # Corporate-action columns can be absent from one source; no action means 0, not missing
+        for column in ACTION_COLUMNS:
+            if column in merged.columns:
+                merged[column] = merged[column].fillna(0.0)
+        # The last stored bar may have been a partial (still-trading) bar; keep the newest copy
+        return merged[~merged.index.duplicated(keep="last")].sort_index()
+
+    @staticmethod
+    def _covers(meta, required_start, tz):
+        covers_from = meta.get("covers_from")
+        if covers_from is None:
+            return False
+        if covers_from == "max":
+            return True
+        if required_start is None:
+            return False
+        return _align(pd.Timestamp(covers_from), tz) <= _align(required_start, tz)
+
+    def _plan(self, symbol, stored, meta, required_start):
+        """Decide what to fetch: ``(needs_fetch, fetch_start, is_backfill)``."""
+        if stored.empty or not self._covers(meta, required_start, stored.index.tz):
+            fetch_start = None if required_start is None else required_start - BACKFILL_PAD
+            return True, fetch_start, True
+        updated_at = meta.get("updated_at", 0)
+        if time.time() - updated_at < self.min_refresh_seconds:
+            return False, None, False
+        # Synced after the last session settled and the market has not reopened: nothing new upstream
+        calendar = calendar_for(symbol)
+        if calendar.is_settled() and updated_at >= calendar.last_settled().timestamp():
+            return False, None, False
+        return True, stored.index[-1], False
+
+    @staticmethod
+    def _wider(covers_from, other):
+        """The older of two ``covers_from`` values; ``None`` means unknown, "max" beats any date."""
+        if covers_from is None or other is None:
+            return other if covers_from is None else covers_from
+        if "max" in (covers_from, other):
+            return "max"
+        return min(covers_from, other, key=lambda value: _align(pd.Timestamp(value), "UTC"))
+
+    def _commit(self, symbol, interval, stored, meta, fresh, required_start, is_backfill):
+        """Merge ``fresh`` into ``stored``; call with the symbol's lock held and ``stored`` loaded under it."""
+        fresh = _normalize(fresh, interval)
+        if fresh.empty:
+            # Nothing new upstream still counts as a refresh, so min_refresh_seconds holds off the next call
+            if not stored.empty:
+                self._save_meta(symbol, interval, {**meta, "updated_at": time.time()})
+            return stored
+        covers_from = meta.get("covers_from")
+        if is_backfill:
+            requested = "max" if required_start is None else _align(required_start, fresh.index.tz).isoformat()
+            covers_from = self._wider(covers_from, requested)
+        frame = self._merge(stored, fresh)
+        self._save(symbol, interval, frame, {"covers_from": covers_from, "updated_at": time.time()})
+        return frame
+
+    def sync(self, symbol, interval="1d", required_start=None):
+        """Bring the stored series up to date and make sure it reaches back to ``required_start``.
+
+        ``required_start=None`` asks for the full ('max') history.
+        """
+        with self._lock(symbol, interval):
+            stored, meta = self.load(symbol, interval)
+            needs_fetch, fetch_start, is_backfill = self._plan(symbol, stored, meta, required_start)
+            if not needs_fetch:
+                return stored
+            fresh = self.fetcher(symbol, interval, fetch_start)
+            return self._commit(symbol, interval, stored, meta, fresh, required_start, is_backfill)
+
+    def sync_many(self, symbols, interval="1d", required_start=None, progress=None):
+        """``sync`` for a list of symbols, fetching what is missing in as few batched calls as possible.
+
+        Symbols that need the same fetch start (a backfill to ``required_start``,
+        or an incremental update from the same last stored bar) share
+        ``batch_fetcher`` calls of up to ``BATCH_SIZE`` symbols, run
+        concurrently through ``fetch_all``; ``progress(done, total)`` is called
+        as batches finish. A batch that still fails after its retries leaves
+        its symbols at whatever was stored. Returns ``{symbol: frame}``.
+        """
+        frames, groups, state = {}, {}, {}
+        for symbol in dict.fromkeys(symbols):
+            with self._lock(symbol, interval):
+                stored, meta = self.load(symbol, interval)
+                needs_fetch, fetch_start, is_backfill = self._plan(symbol, stored, meta, required_start)
+            if not needs_fetch:
+                frames[symbol] = stored
+                continue
+            state[symbol] = stored
+            groups.setdefault((fetch_start, is_backfill), []).append(symbol)
+
+        batches = [
+            (fetch_start, is_backfill, tuple(group[i:i + BATCH_SIZE]))
+            for (fetch_start, is_backfill), group in groups.items()
+            for i in range(0, len(group), BATCH_SIZE)
+        ]
+        fetched, errors = fetch_all(
+            batches, lambda batch: self.batch_fetcher(list(batch[2]), interval, batch[0]),
+            timeout=BATCH_TIMEOUT_SECONDS, on_progress=progress,
+        )
+        for batch in batches:
+            fetch_start, is_backfill, group = batch
+            for symbol in group:
+                if batch in errors:
+                    frames[symbol] = state[symbol]
+                    continue
+                with self._lock(symbol, interval):
+                    # The lock is not held across the fetch, so merge into whatever a concurrent sync wrote since
+                    stored, meta = self.load(symbol, interval)
+                    fresh = fetched[batch].get(symbol, pd.DataFrame())
+                    frames[symbol] = self._commit(symbol, interval, stored, meta, fresh, required_start, is_backfill)
+        return frames
+
+    # ------------------- Queries -------------------
+
+    @staticmethod
+    def _required_start(period, start):
+        if start is not None:
+            return pd.Timestamp(start)
+        return period_start(period or "max", pd.Timestamp.now(tz="UTC"))
+
+    @staticmethod
+    def _slice(frame, required_start, start, end):
+        if frame.empty:
+            return frame.copy()
+        tz = frame.index.tz
+        if required_start is not None:
+            lower = _align(required_start, tz)
+            # Short periods ('1d' on a weekend) still include the latest session
+            if start is None:
+                lower = min(lower, frame.index[-1].normalize())
+            frame = frame[frame.index >= lower]
+        if end is not None:
+            frame = frame[frame.index < _align(pd.Timestamp(end), tz)]
+        return frame.copy()
+
+    def history(self, symbol, period=None, start=None, end=None, interval="1d"):
+        """Serve ``period`` (yfinance style) or ``start``/``end`` (end exclusive) from the local copy."""
+        required_start = self._required_start(period, start)
+        frame = self.sync(symbol, interval, required_start)
+        return self._slice(frame, required_start, start, end)
+
+    def history_many(self, symbols, period=None, start=None, end=None, interval="1d", progress=None):
+        """``history`` for several symbols at once; returns ``{symbol: frame}``."""
+        required_start = self._required_start(period, start)
+        frames = self.sync_many(symbols, interval, required_start, progress=progress)
+        return {symbol: self._slice(frames[symbol], required_start, start, end) for symbol in symbols}
+
+
+default_store = OHLCVStore()
+
+
+def get_history(symbol, period=None, start=None, end=None, interval="1d"):
+    return default_store.history(symbol, period=period, start=start, end=end, interval=interval)
+
+
+def get_history_many(symbols, period=None, start=None, end=None, interval="1d", progress=None):
+    return default_store.history_many(symbols, period=period, start=start, end=end, interval=interval,
+                                      progress=progress)
@@ -0,0 +1,44 @@
+"""Date-aligned price matrices (dates x tickers) for multi-symbol analytics."""
+
+import pandas as pd
+
+from market_core.ohlcv_store import get_history_many
+
+MISSING_POLICIES = ("ffill", "drop", "keep")
+
+
+def align_prices(frames, field="Close", missing="ffill"):
+    """Join one ``field`` from each per-symbol frame into a single dates x tickers matrix.
+
+    ``missing`` controls gaps from differing exchange calendars:
+    ``"ffill"`` carries the last price across another market's sessions (leading
+    NaNs before a listing stay NaN), ``"drop"`` keeps only dates every symbol
+    traded, ``"keep"`` leaves gaps as NaN. Symbols without any data are
+    dropped and returned separately as ``(matrix, missing_symbols)``.
+    """
+    if missing not in MISSING_POLICIES:
+        raise ValueError(f"missing must be one of {MISSING_POLICIES}")
+    columns = {}
+    empty = []
+    for symbol, frame in frames.items():
+        if frame.empty or field not in frame.columns or frame[field].dropna().empty:
+            empty.append(symbol)
+            continue
+        columns[symbol] = frame[field]
+    if not columns:
+        return pd.DataFrame(), empty
+
+    matrix = pd.concat(columns, axis=1).sort_index()
+    if missing == "ffill":
+        matrix = matrix.ffill()
+    elif missing == "drop":
+        matrix = matrix.dropna(how="any")
+    return matrix, empty
+
+
+def load_price_matrix(symbols, period=None, start=None, end=None, interval="1d", field="Close", missing="ffill",
+                      progress=None):
+    """Fetch ``symbols`` through the OHLCV store in concurrent batched calls and align them; see ``align_prices``."""
+    frames = get_history_many(list(symbols), period=period, start=start, end=end, interval=interval,
+                              progress=progress)
+    return align_prices(frames, field=field, missing=missing)
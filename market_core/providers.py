@@ -0,0 +1,323 @@
+"""Pluggable market-data providers.
+
+Every sub-app reaches upstream data through the active provider, never
+through yfinance directly, so the source can be swapped without touching UI
+code. Three implementations ship here:
+
+* ``YFinanceProvider`` - live Yahoo Finance data (the default).
+* ``RecordingProvider`` - wraps another provider and writes every response to disk.
+* ``ReplayProvider`` - serves those recordings with no network access at all.
+
+The active provider is chosen with ``set_provider()`` or the
+``MARKET_DATA_PROVIDER`` environment variable: ``yfinance``,
+``record:<dir>`` or ``replay:<dir>``.
+"""
+
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+
+from market_core.metrics import increment, phase
+
+
+class ReplayMissError(LookupError):
+    """Raised by ``ReplayProvider`` when a request was never recorded."""
+
+
+class MarketDataProvider:
+    """Interface for history and fundamentals sources.
+
+    ``history`` returns the bars from ``start`` onwards, or the full history
+    when ``start`` is None. Subclasses with a bulk endpoint should override
+    ``history_many``.
+    """
+
+    name = "base"
+
+    def history(self, symbol, interval="1d", start=None):
+        raise NotImplementedError
+
+    def history_many(self, symbols, interval="1d", start=None):
+        return {symbol: self.history(symbol, interval, start) for symbol in symbols}
+
+    def info(self, symbol):
+        raise NotImplementedError
+
+    def major_holders(self, symbol):
+        return pd.DataFrame()
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = "yfinance"
+
+    # yf.download collects results in a module-level dict, so concurrent calls can mix up
+    # symbols; batches queue here while each download still fetches its symbols in parallel
+    _download_lock = threading.Lock()
+
+    def __init__(self):
+        # Imported on first use so replay-only processes never load yfinance
+        import yfinance
+        self.yf = yfinance
+
+    def history(self, symbol, interval="1d", start=None):
+        ticker = self.yf.Ticker(symbol)
+        if start is None:
+            return ticker.history(period="max", interval=interval)
+        return ticker.history(start=start.strftime("%Y-%m-%d"), interval=interval)
+
+    def history_many(self, symbols, interval="1d", start=None):
+        # One yf.download call for the whole list
+        kwargs = {"period": "max"} if start is None else {"start": start.strftime("%Y-%m-%d")}
+        with self._download_lock:
+            raw = self.yf.download(
+                symbols, interval=interval, group_by="ticker", auto_adjust=True,
+                actions=True, threads=True, progress=False, **kwargs,
+            )
+        frames = {}
+        for symbol in symbols:
+            if isinstance(raw.columns, pd.MultiIndex) and symbol in raw.columns.get_level_values(0):
+                frame = raw[symbol]
+            elif not isinstance(raw.columns, pd.MultiIndex) and len(symbols) == 1:
+                frame = raw
+            else:
+                continue
+            # The shared index spans every symbol's sessions; keep only this symbol's bars
+            frames[symbol] = frame.dropna(subset=["Close"]) if "Close" in frame.columns else frame.iloc[0:0]
+        return frames
+
+    def info(self, symbol):
+        return self.yf.Ticker(symbol).info
+
+    def major_holders(self, symbol):
+        return self.yf.Ticker(symbol).major_holders
+
+
+def _align(start, tz):
+    """Express ``start`` in the timezone of an index with zone ``tz``."""
+    if tz is not None and start.tz is None:
+        return start.tz_localize(tz)
+    if tz is None and start.tz is not None:
+        return start.tz_convert("UTC").tz_localize(None)
+    return start
+
+
+def _safe_name(symbol):
+    return re.sub(r"[^A-Za-z0-9._&^=-]", "_", symbol.upper())
+
+
+class _RecordingFiles:
+    """On-disk layout shared by the recording and replay providers."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def history_path(self, symbol, interval):
+        return os.path.join(self.root, "history", interval, f"{_safe_name(symbol)}.parquet")
+
+    def coverage_path(self, symbol, interval):
+        return os.path.join(self.root, "history", interval, f"{_safe_name(symbol)}.json")
+
+    def info_path(self, symbol):
+        return os.path.join(self.root, "info", f"{_safe_name(symbol)}.json")
+
+    def holders_path(self, symbol):
+        return os.path.join(self.root, "holders", f"{_safe_name(symbol)}.parquet")
+
+
+def _read_coverage(path):
+    """Earliest recorded start, None when the full history was recorded.
+
+    Recordings made before the coverage file existed fall back to their
+    first bar, since nothing older is known to have been requested.
+    """
+    if os.path.exists(path):
+        with open(path) as f:
+            covers_from = json.load(f)["covers_from"]
+        return None if covers_from is None else pd.Timestamp(covers_from)
+    frame = pd.read_parquet(path[:-len(".json")] + ".parquet")
+    return frame.index.min()
+
+
+class RecordingProvider(MarketDataProvider):
+    """Pass requests to ``inner`` and record every response under ``root``.
+
+    History responses for one (symbol, interval) are merged into a single
+    file, so a replay can serve any later start date that was covered. The
+    earliest requested start is kept next to it (None for a full-history
+    request) so a replay can tell a short recording from a short listing.
+    """
+
+    name = "record"
+
+    def __init__(self, root, inner=None):
+        self.files = _RecordingFiles(root)
+        self.inner = inner or YFinanceProvider()
+        self._lock = threading.Lock()
+
+    def _write_history(self, symbol, interval, frame, start):
+        if frame is None or frame.empty:
+            return
+        path = self.files.history_path(symbol, interval)
+        coverage_path = self.files.coverage_path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            covers_from = None if start is None else pd.Timestamp(start)
+            if os.path.exists(path):
+                frame = pd.concat([pd.read_parquet(path), frame])
+                frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+                recorded = _read_coverage(coverage_path)
+                if recorded is None or covers_from is None:
+                    covers_from = None
+                else:
+                    covers_from = min(recorded, _align(covers_from, recorded.tz))
+            frame.to_parquet(path)
+            with open(coverage_path, "w") as f:
+                json.dump({"covers_from": None if covers_from is None else covers_from.isoformat()}, f)
+
+    def history(self, symbol, interval="1d", start=None):
+        frame = self.inner.history(symbol, interval, start)
+        self._write_history(symbol, interval, frame, start)
+        return frame
+
+    def history_many(self, symbols, interval="1d", start=None):
+        frames = self.inner.history_many(symbols, interval, start)
+        for symbol, frame in frames.items():
+            self._write_history(symbol, interval, frame, start)
+        return frames
+
+    def info(self, symbol):
+        info = self.inner.info(symbol)
+        path = self.files.info_path(symbol)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(info, f, default=str)
+        return info
+
+    def major_holders(self, symbol):
+        holders = self.inner.major_holders(symbol)
+        if holders is not None and not holders.empty:
+            path = self.files.holders_path(symbol)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            holders.to_parquet(path)
+        return holders
+
+
+class ReplayProvider(MarketDataProvider):
+    """Serve recordings written by ``RecordingProvider``; never touches the network."""
+
+    name = "replay"
+
+    def __init__(self, root):
+        self.files = _RecordingFiles(root)
+
+    def history(self, symbol, interval="1d", start=None):
+        path = self.files.history_path(symbol, interval)
+        if not os.path.exists(path):
+            raise ReplayMissError(f"No recorded {interval} history for {symbol}")
+        frame = pd.read_parquet(path)
+        covers_from = _read_coverage(self.files.coverage_path(symbol, interval))
+        if covers_from is not None:
+            if start is None:
+                raise ReplayMissError(
+                    f"{symbol} {interval} was recorded from {covers_from:%Y-%m-%d}, not the full history"
+                )
+            if _align(start, covers_from.tz) < covers_from:
+                raise ReplayMissError(
+                    f"{symbol} {interval} was recorded from {covers_from:%Y-%m-%d}, "
+                    f"requested from {start:%Y-%m-%d}"
+                )
+        if start is not None:
+            frame = frame[frame.index >= _align(start, frame.index.tz)]
+        return frame
+
+    def info(self, symbol):
+        path = self.files.info_path(symbol)
+        if not os.path.exists(path):
+            raise ReplayMissError(f"No recorded info for {symbol}")
+        with open(path) as f:
+            return json.load(f)
+
+    def major_holders(self, symbol):
+        path = self.files.holders_path(symbol)
+        return pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame()
+
+
+def _frame_bytes(frame):
+    return int(frame.memory_usage(index=True).sum()) if frame is not None else 0
+
+
+def _is_rate_limit(error):
+    return "RateLimit" in type(error).__name__ or "Too Many Requests" in str(error)
+
+
+class InstrumentedProvider(MarketDataProvider):
+    """Wraps a provider to count upstream calls, payload bytes and rate-limit errors."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.name = inner.name
+
+    def _call(self, kind, fn, size):
+        increment("upstream_calls_total", provider=self.name, kind=kind)
+        try:
+            with phase("upstream"):
+                result = fn()
+        except Exception as e:
+            if _is_rate_limit(e):
+                increment("rate_limit_errors_total", provider=self.name)
+            raise
+        # Decoded payload size; a close proxy for what crossed the wire
+        increment("upstream_bytes_total", size(result), provider=self.name)
+        return result
+
+    def history(self, symbol, interval="1d", start=None):
+        return self._call("history", lambda: self.inner.history(symbol, interval, start), _frame_bytes)
+
+    def history_many(self, symbols, interval="1d", start=None):
+        return self._call("history_batch", lambda: self.inner.history_many(symbols, interval, start),
+                          lambda frames: sum(_frame_bytes(f) for f in frames.values()))
+
+    def info(self, symbol):
+        return self._call("info", lambda: self.inner.info(symbol), lambda info: len(json.dumps(info, default=str)))
+
+    def major_holders(self, symbol):
+        return self._call("major_holders", lambda: self.inner.major_holders(symbol), _frame_bytes)
+
+
+def provider_from_spec(spec):
+    """Build a provider from ``yfinance``, ``record:<dir>`` or ``replay:<dir>``."""
+    kind, _, root = spec.partition(":")
+    if kind == "yfinance":
+        return YFinanceProvider()
+    if kind == "record" and root:
+        return RecordingProvider(root)
+    if kind == "replay" and root:
+        return ReplayProvider(root)
+    raise ValueError(f"Unknown market data provider '{spec}'")
+
+
+_active_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    global _active_provider
+    with _provider_lock:
+        if _active_provider is None:
+            _active_provider = InstrumentedProvider(
+                provider_from_spec(os.environ.get("MARKET_DATA_PROVIDER", "yfinance"))
+            )
+        return _active_provider
+
+
+def set_provider(provider):
+    """Make ``provider`` the source for every sub-app; returns the previous one."""
+    global _active_provider
+    if provider is not None and not isinstance(provider, InstrumentedProvider):
+        provider = InstrumentedProvider(provider)
+    with _provider_lock:
+        previous, _active_provider = _active_provider, provider
+        return previous
@@ -0,0 +1,41 @@
+"""Thread-safe token-bucket rate limiter shared by the upstream data fetchers."""
+
+import threading
+import time
+
+from market_core.metrics import increment
+
+
+class RateLimiter:
+    """Allow at most ``rate`` calls per second with bursts up to ``burst``.
+
+    A single instance is meant to be shared by every worker thread that talks
+    to the same upstream service, so the combined request rate stays bounded
+    no matter how many workers are running.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            increment("rate_limit_waits_total")
+            time.sleep(wait)
@@ -0,0 +1,96 @@
+"""Bounded-memory chart rendering with a rendered-image cache.
+
+Charts are drawn on ``matplotlib.figure.Figure`` objects created outside
+pyplot's global figure manager, saved to PNG/SVG bytes and then dropped, so
+no figure outlives the rerun that drew it. The bytes are kept in a
+process-wide LRU bounded by total size and keyed by whatever identifies the
+chart (symbol, period, chart type) plus a fingerprint of the plotted data,
+so an unchanged chart is served without drawing anything.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from matplotlib.figure import Figure
+
+from market_core.metrics import increment, phase
+
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def data_fingerprint(*objs):
+    """Stable content hash of the DataFrames/Series that feed a chart."""
+    digest = hashlib.blake2b(digest_size=16)
+    for obj in objs:
+        hashed = pd.util.hash_pandas_object(obj, index=True)
+        digest.update(hashed.to_numpy().tobytes())
+        if isinstance(obj, pd.DataFrame):
+            digest.update("|".join(map(str, obj.columns)).encode())
+    return digest.hexdigest()
+
+
+class ImageCache:
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._images = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._images.get(key)
+            if data is None:
+                self.misses += 1
+            else:
+                self._images.move_to_end(key)
+                self.hits += 1
+        increment("cache_misses_total" if data is None else "cache_hits_total", cache="charts")
+        return data
+
+    def put(self, key, data):
+        with self._lock:
+            old = self._images.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._images[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self._size -= len(evicted)
+
+
+image_cache = ImageCache()
+
+# Style contexts swap process-wide rcParams, so draws are serialized across sessions
+_draw_lock = threading.Lock()
+
+
+def render_figure(key, draw, figsize=None, fmt="png", dpi=200, style=None):
+    """Return chart bytes for ``key``, calling ``draw(fig)`` only on a cache miss.
+
+    ``style`` is an optional matplotlib style applied to this figure only,
+    instead of changing the process-wide rcParams.
+    """
+    full_key = (fmt, dpi) + tuple(key)
+    cached = image_cache.get(full_key)
+    if cached is not None:
+        return cached
+
+    with phase("render"), _draw_lock, plt.style.context(style or "default"):
+        fig = Figure(figsize=figsize)
+        try:
+            draw(fig)
+            buf = io.BytesIO()
+            fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches="tight", facecolor=fig.get_facecolor())
+            data = buf.getvalue()
+        finally:
+            fig.clear()
+
+    image_cache.put(full_key, data)
+    return data
@@ -0,0 +1,162 @@
+"""Read-only, memory-mapped DataFrames shared by every session (and process).
+
+``share(name, frame)`` writes the frame once as an uncompressed Arrow IPC file
+and returns a DataFrame whose columns are zero-copy NumPy views over the
+memory map. Every session that reads the same dataset therefore sees one
+physical copy in the OS page cache, and other processes mapping the same
+content (same name and fingerprint) reuse the file instead of writing their
+own.
+
+The mapped buffers are read-only. Callers get a shallow ``copy(deep=False)``
+of the shared view: with pandas copy-on-write (always on from pandas 3, which
+the requirements pin), adding or replacing columns only allocates what
+changes.
+
+The directory is bounded by ``MAX_SHARED_BYTES``: writing a new file evicts
+the least recently shared ones beyond it. Processes still mapping an evicted
+file keep their pages until they let go.
+"""
+
+import hashlib
+import os
+import re
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from market_core.ohlcv_store import STORE_DIR
+
+SHARED_DIR = os.environ.get("MARKET_SHARED_DIR", os.path.join(STORE_DIR, "shared"))
+# Size cap of the shared directory; it may point at /dev/shm, where files occupy RAM
+MAX_SHARED_BYTES = int(os.environ.get("MARKET_SHARED_MAX_BYTES", 1024 * 1024 * 1024))
+
+_INDEX_COLUMN = "__index__"
+
+
+def _fingerprint(frame):
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    digest.update("|".join(f"{c}:{t}" for c, t in frame.dtypes.items()).encode())
+    return digest.hexdigest()
+
+
+def _shareable(frame):
+    return (
+        isinstance(frame, pd.DataFrame)
+        and isinstance(frame.index, pd.DatetimeIndex)
+        and not isinstance(frame.columns, pd.MultiIndex)
+        and frame.columns.is_unique
+        and all(str(c) != _INDEX_COLUMN for c in frame.columns)
+        # Only fixed-width numeric columns convert back to NumPy without a copy
+        and all(dtype.kind in "fiu" for dtype in frame.dtypes)
+    )
+
+
+class SharedFrameStore:
+    def __init__(self, root=SHARED_DIR, max_bytes=MAX_SHARED_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _prefix(self, name):
+        readable = re.sub(r"[^A-Za-z0-9._&^=-]", "_", name)[:80]
+        return f"{readable}-{hashlib.blake2b(name.encode(), digest_size=6).hexdigest()}"
+
+    def _write(self, path, frame):
+        index = frame.index
+        arrays = [pa.array(frame[c].to_numpy(), from_pandas=False) for c in frame.columns]
+        # Timestamps travel as int64 nanoseconds (UTC for tz-aware indexes); the zone goes in the metadata
+        arrays.append(pa.array(index.as_unit("ns").asi8))
+        schema_meta = {
+            "tz": str(index.tz) if index.tz is not None else "",
+            "unit": index.unit,
+            "name": index.name or "",
+        }
+        table = pa.table(arrays, names=[str(c) for c in frame.columns] + [_INDEX_COLUMN]).replace_schema_metadata(schema_meta)
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        # Write-then-rename so concurrent readers never map a half-written file
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _map(path, columns):
+        table = ipc.open_file(pa.memory_map(path)).read_all()
+        meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+        data = {
+            column: table.column(str(column)).chunk(0).to_numpy(zero_copy_only=True)
+            for column in columns
+        }
+        ticks = table.column(_INDEX_COLUMN).chunk(0).to_numpy(zero_copy_only=True)
+        index = pd.DatetimeIndex(ticks.view("M8[ns]"), name=meta.get("name") or None)
+        if meta.get("unit", "ns") != "ns":
+            index = index.as_unit(meta["unit"])
+        if meta.get("tz"):
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+        return pd.DataFrame(data, index=index, columns=columns, copy=False)
+
+    def share(self, name, frame):
+        """Return a shared, read-only, memory-mapped equivalent of ``frame``.
+
+        Frames that can't be mapped without copies (non-numeric columns,
+        non-datetime index) or that fail to write are returned unchanged.
+        """
+        if frame.empty or not _shareable(frame):
+            return frame
+        prefix = self._prefix(name)
+        path = os.path.join(self.root, f"{prefix}-{_fingerprint(frame)}.arrow")
+        try:
+            with self._lock:
+                if os.path.exists(path):
+                    # The modification time doubles as last use for eviction
+                    os.utime(path)
+                else:
+                    self._write(path, frame)
+                    self._drop_stale(prefix, path)
+                    self._evict(path)
+            return self._map(path, frame.columns)
+        except (OSError, pa.ArrowException):
+            return frame
+
+    def _drop_stale(self, prefix, keep):
+        # Older versions of this dataset; processes still mapping them keep their pages until they let go
+        for entry in os.listdir(self.root):
+            path = os.path.join(self.root, entry)
+            if entry.startswith(prefix + "-") and entry.endswith(".arrow") and path != keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _evict(self, keep):
+        """Remove the least recently shared files until the directory fits in ``max_bytes``."""
+        files = []
+        for entry in os.listdir(self.root):
+            path = os.path.join(self.root, entry)
+            if entry.endswith(".arrow") and path != keep:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = os.path.getsize(keep) + sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+default_store = SharedFrameStore()
+
+
+def share(name, frame):
+    return default_store.share(name, frame)
+
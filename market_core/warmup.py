@@ -0,0 +1,233 @@
+"""Market-aware warm-up of the dashboards' default views.
+
+    python -m market_core.warmup            # run now, then again after every exchange close
+    python -m market_core.warmup --once     # a single pass (cron, deploy hooks)
+
+Run standalone, a pass fills the layers every server process shares: the
+parquet OHLCV store, today's fundamentals snapshot and the memory-mapped
+shared frames. Started inside the Streamlit server (``WARMUP_IN_PROCESS=1``,
+see ``combined_app.py``) the same jobs also build that process's indicators,
+entropy series, screener index and rendered charts, so the first visitor of
+each default view gets a cache hit.
+
+Each job records the exchange session it last covered and a fingerprint of
+its data. A pass within the same session skips the job outright, and a new
+session whose data did not change (a holiday) skips the rebuild.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from market_core.app_loader import load_app_module
+from market_core.exchange_calendar import SETTLE_MINUTES, exchange_of, get_calendar
+from market_core.metrics import increment, phase
+from market_core.ohlcv_store import STORE_DIR
+from market_core.render import data_fingerprint
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_PATH = os.path.join(STORE_DIR, "warmup_state.json")
+
+DEFAULT_SYMBOL = "RELIANCE.NS"
+
+
+def last_session(exchange, now=None):
+    """UTC timestamp of the latest settled close at or before ``now``; holidays and early closes included."""
+    return get_calendar(exchange).last_settled(now).tz_convert("UTC")
+
+
+def next_session(exchanges, now=None):
+    """Earliest settled close after ``now`` among ``exchanges``."""
+    now = pd.Timestamp(now or pd.Timestamp.now(tz="UTC"))
+    settle = pd.Timedelta(minutes=SETTLE_MINUTES)
+    return min(get_calendar(exchange).next_close(now - settle) + settle for exchange in exchanges).tz_convert("UTC")
+
+
+class WarmupJob:
+    """``load()`` fills the shared stores and returns the job's data; ``build(data)`` primes in-process caches."""
+
+    def __init__(self, name, exchange, load, build=None):
+        self.name = name
+        self.exchange = exchange
+        self.load = load
+        self.build = build
+
+
+class Warmup:
+    def __init__(self, jobs, in_process=False, state_path=STATE_PATH):
+        self.jobs = list(jobs)
+        self.in_process = in_process
+        # In-process caches start empty with the process, so their state must not outlive it
+        self.state_path = None if in_process else state_path
+        self.state = self._read_state()
+        self._stop = threading.Event()
+
+    def _read_state(self):
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                return json.load(f)
+        return {}
+
+    def _write_state(self):
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.state, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.state_path)
+
+    def run_job(self, job, now=None):
+        """Run ``job`` unless its inputs are unchanged; returns "ran", "unchanged", "skipped" or "failed"."""
+        session = last_session(job.exchange, now).isoformat()
+        previous = self.state.get(job.name, {})
+        if previous.get("session") == session:
+            return "skipped"
+        try:
+            with phase(f"warmup:{job.name}"):
+                data = job.load()
+                fingerprint = data_fingerprint(data) if isinstance(data, (pd.DataFrame, pd.Series)) else None
+                unchanged = fingerprint is not None and fingerprint == previous.get("fingerprint")
+                if self.in_process and job.build is not None and not unchanged:
+                    job.build(data)
+        except Exception as e:
+            increment("warmup_failures_total", job=job.name)
+            print(f"warmup: {job.name} failed: {e}")
+            return "failed"
+        self.state[job.name] = {"session": session, "fingerprint": fingerprint, "finished": time.time()}
+        increment("warmup_runs_total", job=job.name)
+        return "unchanged" if unchanged else "ran"
+
+    def run_once(self, now=None):
+        outcomes = {job.name: self.run_job(job, now) for job in self.jobs}
+        self._write_state()
+        return outcomes
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            outcomes = self.run_once()
+            print(f"warmup: {outcomes}")
+            due = next_session({job.exchange for job in self.jobs})
+            self._stop.wait(max(0.0, (due - pd.Timestamp.now(tz="UTC")).total_seconds()))
+
+    def stop(self):
+        self._stop.set()
+
+
+# ------------------- Default jobs -------------------
+
+def _app_module(name, relative_path):
+    """A dashboard module under the name ``combined_app`` loads it with, so both share one copy."""
+    return load_app_module(name, os.path.join(ROOT_DIR, relative_path))
+
+
+def _stock_jobs(symbol=DEFAULT_SYMBOL, period="1d"):
+    from market_core.cache import cached_history, cached_info
+
+    def build(hist):
+        app = _app_module("stock_app", "stock_analysis/stock_analysis_app.py")
+        view, _ = app.fetch_stock_data(symbol, period)
+        for chart_type in app.CHARTS:
+            app.chart_png(view, symbol, period, chart_type)
+        cached_info(symbol)
+
+    return [WarmupJob(f"stock:{symbol}:{period}", exchange_of(symbol),
+                      lambda: cached_history(symbol, period=period), build)]
+
+
+def _math_jobs(symbol=DEFAULT_SYMBOL, period_choice="3mo"):
+    from market_core.cache import cached_history, cached_intraday
+
+    def build(_):
+        app = _app_module("math_app", "pure_math_analytics/math_app.py")
+        df, window_size = app.analytics_frame(symbol, period_choice)
+        app.analytics_png(df, symbol, period_choice, window_size)
+        app.multiscale_series(df['Close'])
+
+    # Syncing the full daily history covers every horizon the page reads from the store
+    return [
+        WarmupJob(f"math:{symbol}:{period_choice}", exchange_of(symbol),
+                  lambda: cached_history(symbol, period="max", interval="1d"), build),
+        WarmupJob(f"intraday:{symbol}", exchange_of(symbol), lambda: cached_intraday(symbol).frame),
+    ]
+
+
+def _quantum_jobs():
+    from market_core.cache import cached_price_matrix
+
+    app = _app_module("quantum_app", "Quantum-AI-Portfolio/app.py")
+    symbols = [t.strip() for t in app.DEFAULT_TICKERS.split(",") if t.strip()]
+
+    def load():
+        today = datetime.date.today()
+        start = today - datetime.timedelta(days=app.DEFAULT_LOOKBACK_DAYS)
+        return cached_price_matrix(symbols, start=start, end=today, missing="ffill")[0]
+
+    # Mixed-exchange portfolio: refreshed after the last of its markets closes
+    return [WarmupJob("quantum:default", "NYSE", load)]
+
+
+def _nifty_jobs():
+    from market_core.cache import cached_price_matrix
+    from market_core.correlation import correlation, daily_returns, rolling_correlation
+
+    app = _app_module("nifty_app", "nifty50-stock-analysis/app.py")
+    from nifty50_data import fetch_nifty50_data
+    from screener_index import cached_index
+    from universes import DEFAULT_UNIVERSE, load_universe
+
+    tickers = load_universe(DEFAULT_UNIVERSE)
+
+    def build_prices(prices):
+        returns = daily_returns(prices)
+        rolling_correlation(returns, app.DEFAULT_WINDOW, key=(DEFAULT_UNIVERSE, app.DEFAULT_LOOKBACK))
+        correlation(returns)
+
+    return [
+        WarmupJob("nifty:fundamentals", "NSE", lambda: fetch_nifty50_data(tickers), cached_index),
+        WarmupJob("nifty:prices", "NSE",
+                  lambda: cached_price_matrix(tickers, period=app.DEFAULT_LOOKBACK, missing="ffill")[0], build_prices),
+    ]
+
+
+def default_jobs():
+    """Jobs for every dashboard's default view: the first page each visitor sees."""
+    return _stock_jobs() + _math_jobs() + _quantum_jobs() + _nifty_jobs()
+
+
+_background = None
+_background_lock = threading.Lock()
+
+
+def start_background_warmup(jobs=None):
+    """Run the scheduler on a daemon thread of this process (idempotent); returns the ``Warmup``."""
+    global _background
+    with _background_lock:
+        if _background is None:
+            _background = Warmup(jobs if jobs is not None else default_jobs(), in_process=True)
+            threading.Thread(target=_background.run_forever, name="warmup", daemon=True).start()
+        return _background
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prefetch and precompute the dashboards' default views.")
+    parser.add_argument("--once", action="store_true", help="Run one pass and exit")
+    parser.add_argument("--force", action="store_true", help="Ignore the recorded state and redo every job")
+    args = parser.parse_args(argv)
+
+    warmup = Warmup(default_jobs())
+    if args.force:
+        warmup.state = {}
+    if args.once:
+        print(json.dumps(warmup.run_once(), indent=1))
+    else:
+        warmup.run_forever()
+
+
+if __name__ == "__main__":
+    main()
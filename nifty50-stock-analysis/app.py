@@ -2,36 +2,183 @@
 
 import streamlit as st
 import pandas as pd
-import io
-from nifty50_data import fetch_nifty50_data
-from plot_utils import plot_dark_mode
+from nifty50_data import combine_batches, fundamentals_history, stream_nifty50_data
+from plot_utils import draw_correlation_heatmap, draw_dark_mode
+from screener_index import PAGE_SIZES, cached_index
+from universes import DEFAULT_UNIVERSE, available_universes, load_universe, parse_constituents
+from market_core.cache import cached_price_matrix
+from market_core.correlation import cluster_order, correlation, daily_returns, rolling_correlation
+from market_core.metrics import phase
+from market_core.render import data_fingerprint, render_figure
+
+CUSTOM_UNIVERSE = "Custom (upload)"
+CHART_TOP_N = 30
+CORRELATION_LOOKBACKS = ["6mo", "1y", "2y", "5y"]
+DEFAULT_LOOKBACK = "1y"
+DEFAULT_WINDOW = 60
+
+def choose_universe():
+    universes = list(available_universes())
+    label = st.sidebar.selectbox("Universe", universes + [CUSTOM_UNIVERSE], index=universes.index(DEFAULT_UNIVERSE))
+    if label != CUSTOM_UNIVERSE:
+        return label, load_universe(label)
+    upload = st.sidebar.file_uploader("Constituent file (CSV with a Symbol column, or one symbol per line)",
+                                      type=["csv", "txt"])
+    tickers = parse_constituents(upload.getvalue().decode("utf-8-sig")) if upload else []
+    return "Custom", tickers
+
+def show_summary(slot, df, total):
+    loaded = int(df["Current Price"].notna().sum())
+    with slot.container():
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Tickers Loaded", f"{loaded}/{total}")
+        col2.metric("Median P/B", f"{df['P/B Ratio'].median():.2f}" if loaded else "-")
+        col3.metric("Median ROE (%)", f"{df['ROE (%)'].median():.1f}" if loaded else "-")
+        col4.metric("Median P/E", f"{df['P/E Ratio'].median():.1f}" if loaded else "-")
+
+def stream_fundamentals(tickers, refresh, universe, summary_slot, table_slot):
+    """Render rows into the page as each batch lands; returns the complete frame."""
+    fetch_progress = st.empty()
+    batches = []
+    with phase("fetch"):
+        for batch in stream_nifty50_data(tickers, refresh=refresh):
+            batches.append(batch)
+            partial = combine_batches(tickers, batches)
+            done = sum(len(rows) for rows, _, _ in batches)
+            fetch_progress.progress(done / len(tickers), text=f"📡 Fetched {done}/{len(tickers)} {universe} tickers")
+            show_summary(summary_slot, partial, len(tickers))
+            # Rows still in flight stay blank until their batch arrives
+            table_slot.dataframe(partial, use_container_width=True)
+    fetch_progress.empty()
+    return combine_batches(tickers, batches)
 
 def main():
     st.set_page_config(layout="wide", page_title="Nifty 50 Financial Dashboard")
-    st.title("📊 Nifty 50 Stock Dashboard")
-    st.markdown("Visualizing Book Value, Current Price, and P/B Ratios for Nifty 50 companies")
-
-    with st.spinner("📡 Fetching Nifty 50 data..."):
-        df = fetch_nifty50_data()
-        st.success("✅ Data loaded successfully!")
+    universe, tickers = choose_universe()
+    st.title(f"📊 {universe} Stock Dashboard")
+    st.markdown(f"Visualizing Book Value, Current Price, and P/B Ratios for {universe} companies")
+    if not tickers:
+        st.info("Upload a constituent file in the sidebar to load a custom universe.")
+        return
 
+    refresh = st.sidebar.button("🔄 Refetch all tickers")
+    status_slot = st.empty()
+    summary_slot = st.empty()
     st.subheader("📈 Financial Data")
-    st.dataframe(df, use_container_width=True)
+    table_slot = st.empty()
+    df = stream_fundamentals(tickers, refresh, universe, summary_slot, table_slot)
+
+    failed = [t for t, status in df.attrs.get("fetch_status", {}).items() if status != "ok"]
+    if failed:
+        status_slot.warning(f"⚠️ Loaded {len(df) - len(failed)}/{len(df)} tickers. Missing: {', '.join(failed)}")
+    else:
+        status_slot.success("✅ Data loaded successfully!")
+
+    # The interactive table takes the streamed table's place once every row is in
+    table_area = table_slot.container()
+    # Sorted once per snapshot; every control below only masks and slices precomputed row orders
+    index = cached_index(df)
+    with table_area:
+        numeric = [c for c in index.columns if pd.api.types.is_numeric_dtype(df[c])]
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            sort_by = st.selectbox("Sort By", index.columns, index=index.columns.index("P/B Ratio"))
+        with col2:
+            descending = st.radio("Order", ["Descending", "Ascending"], horizontal=True) == "Descending"
+        with col3:
+            search = st.text_input("Search Ticker / Company")
+        with col4:
+            page_size = st.selectbox("Rows Per Page", PAGE_SIZES, index=1)
+        col1, col2 = st.columns(2)
+        with col1:
+            filter_column = st.selectbox("Filter Column", numeric, index=numeric.index("P/B Ratio"))
+        with col2:
+            min_col, max_col = st.columns(2)
+            low = min_col.number_input("Min", value=None)
+            high = max_col.number_input("Max", value=None)
+        ranges = {filter_column: (low, high)} if low is not None or high is not None else None
+
+        matches = int(index.mask(search, ranges).sum())
+        page_count = max(1, -(-matches // page_size))
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
+        page_df, matches, _ = index.query(sort_by, not descending, search, ranges, page=page, page_size=page_size)
+        st.dataframe(page_df, use_container_width=True)
+        st.caption(f"{matches} of {len(df)} tickers match; fetched {df.attrs.get('refreshed', 0)} upstream, "
+                   "the rest came from today's snapshot.")
 
     st.subheader("📉 Financial Chart")
-    fig = plot_dark_mode(df)
-    st.pyplot(fig)
+    col1, col2 = st.columns(2)
+    with col1:
+        chart_rows = st.radio("Chart Rows", [f"Top N by {sort_by}", "Current page"], horizontal=True)
+    with col2:
+        top_n = st.slider("N", min_value=5, max_value=min(100, max(5, len(df))), value=min(CHART_TOP_N, len(df)))
+    # One bar and label per ticker: capped to a readable subset rather than the whole universe
+    chart_df = page_df if chart_rows == "Current page" else \
+        index.query(sort_by, not descending, search, ranges, page=1, page_size=top_n)[0]
+    title = f"{universe} - Current Price, Book Value, P/B Ratio & ROE (%)"
+    # Drawn once per distinct dataset; the same PNG bytes feed the page and the download
+    png = render_figure(
+        ("nifty50", "dark_mode", title, data_fingerprint(chart_df)),
+        lambda fig: draw_dark_mode(fig, chart_df, title),
+        figsize=(15, 10),
+        style='dark_background',
+    )
+    st.image(png, use_container_width=True)
+
+    st.subheader("🕰️ P/B Ratio and ROE History")
+    with phase("history"):
+        pb_history = fundamentals_history("P/B Ratio", tickers)
+        roe_history = fundamentals_history("ROE (%)", tickers)
+    if len(pb_history) < 2:
+        st.info("History builds up from daily snapshots; come back on another day to see trends.")
+    else:
+        selected = st.multiselect("Tickers", tickers, default=tickers[:5])
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**P/B Ratio**")
+            st.line_chart(pb_history[selected])
+        with col2:
+            st.markdown("**ROE (%)**")
+            st.line_chart(roe_history[selected])
+
+    st.subheader("🔗 Return Correlations")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        lookback = st.selectbox("Return History", CORRELATION_LOOKBACKS,
+                                index=CORRELATION_LOOKBACKS.index(DEFAULT_LOOKBACK))
+    with col2:
+        view = st.radio("Matrix", ["Full period", "Latest rolling window"], horizontal=True)
+    with col3:
+        window = st.slider("Rolling Window (trading days)", min_value=20, max_value=250, value=DEFAULT_WINDOW, step=10)
+
+    with phase("correlation"):
+        prices, _ = cached_price_matrix(tickers, period=lookback, missing="ffill")
+        returns = daily_returns(prices)
+        # Rolling state persists per universe/window, so a new trading day is a single O(n^2) update
+        rolling_matrix, average_corr = rolling_correlation(returns, window, key=(universe, lookback))
+        corr = correlation(returns) if view == "Full period" or rolling_matrix is None else rolling_matrix
+        order = cluster_order(corr)
+        corr = corr.loc[order, order]
 
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches='tight', facecolor=fig.get_facecolor())
-    buf.seek(0)
+    if len(returns) <= window:
+        st.info(f"Only {len(returns)} return days available; showing the full-period matrix.")
+    heatmap = render_figure(
+        ("nifty50", "correlation", view, window, data_fingerprint(corr)),
+        lambda fig: draw_correlation_heatmap(fig, corr, f"Daily Return Correlation ({view.lower()}, clustered)"),
+        figsize=(12, 10),
+        style='dark_background',
+    )
+    st.image(heatmap, use_container_width=True)
+    if not average_corr.empty:
+        st.markdown(f"**Average pairwise correlation, rolling {window}-day window**")
+        st.line_chart(average_corr.rename("Average correlation"))
 
     # Download button in sidebar
     with st.sidebar:
         st.download_button(
             label="📥 Download Chart as PNG",
-            data=buf,
-            file_name="nifty50chart.png",
+            data=png,
+            file_name=f"{universe.lower().replace(' ', '')}chart.png",
             mime="image/png"
         )
 
@@ -1,83 +1,216 @@
 # nifty50_data.py
 
-import yfinance as yf
+import os
+import sys
+import threading
 import pandas as pd
-import time
 from datetime import date
 
-TICKERS = [
-    'ADANIENT.NS', 'ADANIPORTS.NS', 'APOLLOHOSP.NS', 'ASIANPAINT.NS', 'AXISBANK.NS',
-    'BAJAJ-AUTO.NS', 'BAJAJFINSV.NS', 'BHARTIARTL.NS', 'BPCL.NS', 'BRITANNIA.NS',
-    'CIPLA.NS', 'COALINDIA.NS', 'DRREDDY.NS', 'EICHERMOT.NS', 'GRASIM.NS',
-    'HCLTECH.NS', 'HDFCBANK.NS', 'HDFCLIFE.NS', 'HEROMOTOCO.NS', 'HINDALCO.NS',
-    'HINDUNILVR.NS', 'ICICIBANK.NS', 'INDUSINDBK.NS', 'INFY.NS', 'ITC.NS',
-    'JSWSTEEL.NS', 'KOTAKBANK.NS', 'LT.NS', 'M&M.NS', 'MARUTI.NS',
-    'NESTLEIND.NS', 'NTPC.NS', 'ONGC.NS', 'POWERGRID.NS', 'RELIANCE.NS',
-    'SBILIFE.NS', 'SBIN.NS', 'SHREECEM.NS', 'SHRIRAMFIN.NS', 'SUNPHARMA.NS',
-    'TATACONSUM.NS', 'TCS.NS', 'TATAMOTORS.NS', 'TATASTEEL.NS', 'TECHM.NS',
-    'TITAN.NS', 'TRENT.NS', 'ULTRACEMCO.NS', 'WIPRO.NS'
+# Make the shared market_core package and this folder importable when run standalone
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(APP_DIR)
+for path in (ROOT_DIR, APP_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import market_core.fundamentals_store as fundamentals_store
+from market_core.async_fetch import fetch_all, iter_fetch
+from market_core.cache import INFO_TTL_SECONDS, cached_info
+from market_core.providers import get_provider
+from market_core.rate_limit import RateLimiter
+from universes import DEFAULT_UNIVERSE, load_universe
+
+# Default universe; the dashboard can switch to any constituent file under universes/
+TICKERS = load_universe(DEFAULT_UNIVERSE)
+
+# Loader tuning: concurrent requests in flight, per-request timeout,
+# and one upstream rate limit shared by every request
+MAX_WORKERS = 8
+REQUEST_TIMEOUT_SECONDS = 20
+REQUESTS_PER_SECOND = 8
+# Snapshot rows older than this are fetched again, so prices and ratios refresh during the session;
+# once the market has closed the shared info cache answers without going upstream
+SNAPSHOT_MAX_AGE_SECONDS = INFO_TTL_SECONDS
+
+COLUMNS = [
+    "Company Name", "Current Price", "Book Value", "EPS", "P/E Ratio",
+    "Revenue Growth", "P/B Ratio", "Intrinsic Value", "ROE (%)"
 ]
+NUMERIC_COLUMNS = COLUMNS[1:]
+
+def _numeric(df):
+    # A batch whose column is all None (failed or incomplete tickers) would otherwise be object
+    # dtype and turn the whole column into object when batches are concatenated
+    df[NUMERIC_COLUMNS] = df[NUMERIC_COLUMNS].apply(pd.to_numeric, errors="coerce").astype(float)
+    return df
+
+def _empty_row(ticker):
+    row = {"Ticker": ticker}
+    row.update({col: None for col in COLUMNS})
+    return row
+
+def _project_info(ticker, info):
+    current_price = info.get("currentPrice")
+    book_value = info.get("bookValue")
+    eps = info.get("trailingEps")
+    pe = info.get("trailingPE")
+    revenue_growth = info.get("revenueGrowth")
+    return_on_equity = info.get("returnOnEquity")
+
+    pb_ratio = (current_price / book_value) if current_price and book_value else None
+    growth_rate = revenue_growth * 100 if revenue_growth else 0
+    intrinsic_value = (eps * (8.5 + 2 * growth_rate)) if eps else None
+
+    # ROE calculation: use provided ROE or calculate manually via EPS / Book Value
+    if return_on_equity is not None:
+        roe_percent = return_on_equity * 100
+    elif eps is not None and book_value not in [None, 0]:
+        roe_percent = (eps / book_value) * 100
+    else:
+        roe_percent = None
+
+    return {
+        "Ticker": ticker,
+        "Company Name": info.get("longName"),
+        "Current Price": current_price,
+        "Book Value": book_value,
+        "EPS": eps,
+        "P/E Ratio": pe,
+        "Revenue Growth": revenue_growth,
+        "P/B Ratio": pb_ratio,
+        "Intrinsic Value": intrinsic_value,
+        "ROE (%)": roe_percent
+    }
+
+# Created on first use and shared by every load and stream in the process, so concurrent
+# sessions together stay under the upstream rate instead of each getting its own budget
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def _shared_limiter(requests_per_second):
+    with _limiters_lock:
+        if requests_per_second not in _limiters:
+            _limiters[requests_per_second] = RateLimiter(requests_per_second)
+        return _limiters[requests_per_second]
 
-def fetch_nifty50_data():
-    all_data = []
-
-    for ticker in TICKERS:
-        try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-
-            current_price = info.get("currentPrice")
-            book_value = info.get("bookValue")
-            eps = info.get("trailingEps")
-            pe = info.get("trailingPE")
-            revenue_growth = info.get("revenueGrowth")
-            return_on_equity = info.get("returnOnEquity")
-
-            pb_ratio = (current_price / book_value) if current_price and book_value else None
-            growth_rate = revenue_growth * 100 if revenue_growth else 0
-            intrinsic_value = (eps * (8.5 + 2 * growth_rate)) if eps else None
-
-            # ROE calculation: use provided ROE or calculate manually via EPS / Book Value
-            if return_on_equity is not None:
-                roe_percent = return_on_equity * 100
-            elif eps is not None and book_value not in [None, 0]:
-                roe_percent = (eps / book_value) * 100
-            else:
-                roe_percent = None
-
-            all_data.append({
-                "Ticker": ticker,
-                "Company Name": info.get("longName"),
-                "Current Price": current_price,
-                "Book Value": book_value,
-                "EPS": eps,
-                "P/E Ratio": pe,
-                "Revenue Growth": revenue_growth,
-                "P/B Ratio": pb_ratio,
-                "Intrinsic Value": intrinsic_value,
-                "ROE (%)": roe_percent
-            })
-        except Exception as e:
-            print(f"Error for {ticker}: {e}")
-            all_data.append({
-                "Ticker": ticker,
-                "Company Name": None,
-                "Current Price": None,
-                "Book Value": None,
-                "EPS": None,
-                "P/E Ratio": None,
-                "Revenue Growth": None,
-                "P/B Ratio": None,
-                "Intrinsic Value": None,
-                "ROE (%)": None
-            })
-        time.sleep(1)
-
-    df = pd.DataFrame(all_data)
+def _rate_limited_info(requests_per_second):
+    limiter = _shared_limiter(requests_per_second)
+    provider = get_provider()
+
+    def load_info(ticker):
+        # Only cache misses go upstream, so only they spend rate-limit tokens
+        def upstream():
+            limiter.acquire()
+            return provider.info(ticker)
+        return cached_info(ticker, loader=upstream)
+    return load_info
+
+def load_fundamentals(tickers, max_workers=MAX_WORKERS, requests_per_second=REQUESTS_PER_SECOND,
+                      timeout=REQUEST_TIMEOUT_SECONDS, progress=None, cancel_event=None):
+    """Fetch fundamentals for ``tickers`` concurrently.
+
+    Returns ``(df, statuses)`` where ``statuses`` maps every ticker to ``"ok"``
+    or ``"error: <reason>"``. Failed tickers keep an all-empty row so the frame
+    always covers the full list in its original order. ``progress`` and
+    ``cancel_event`` are passed through to ``fetch_all``.
+    """
+    infos, errors = fetch_all(tickers, _rate_limited_info(requests_per_second), concurrency=max_workers,
+                              timeout=timeout, on_progress=progress, cancel_event=cancel_event)
+    return _rows_frame(tickers, infos, errors)
+
+def _rows_frame(tickers, infos, errors):
+    all_data, statuses = [], {}
+    for ticker in tickers:
+        if ticker in infos:
+            all_data.append(_project_info(ticker, infos[ticker]))
+            statuses[ticker] = "ok"
+        else:
+            print(f"Error for {ticker}: {errors[ticker]}")
+            all_data.append(_empty_row(ticker))
+            statuses[ticker] = f"error: {errors[ticker]}"
+
+    df = _numeric(pd.DataFrame(all_data, columns=["Ticker"] + COLUMNS))
     df.set_index("Ticker", inplace=True)
     df["Date"] = date.today()
+    return df, statuses
+
+def stream_nifty50_data(tickers=TICKERS, refresh=False, max_workers=MAX_WORKERS,
+                        requests_per_second=REQUESTS_PER_SECOND, timeout=REQUEST_TIMEOUT_SECONDS,
+                        max_age=SNAPSHOT_MAX_AGE_SECONDS):
+    """Yield today's fundamentals for ``tickers`` in batches as they become available.
+
+    Each item is ``(rows, statuses, from_snapshot)``: a frame of ``COLUMNS``
+    indexed by ticker, the per-ticker ``"ok"`` / ``"error: ..."`` outcome, and
+    whether the rows came from today's snapshot. Snapshot rows younger than
+    ``max_age`` seconds arrive first in one batch; upstream rows follow as each group of fetches completes. Rows
+    fetched successfully are saved to the snapshot when the stream ends, even
+    if the consumer stops early.
+    """
+    store = fundamentals_store.default_store
+    stale = list(tickers) if refresh else store.stale(tickers, max_age=max_age)
+    stale_set = set(stale)
+    cached = [t for t in tickers if t not in stale_set]
+    if cached:
+        snapshot = _numeric(store.load().reindex(index=cached, columns=COLUMNS))
+        snapshot.index.name = "Ticker"
+        snapshot["Date"] = date.today()
+        yield snapshot, {t: "ok" for t in cached}, True
+    if not stale:
+        return
+
+    fetched = []
+    try:
+        for batch in iter_fetch(stale, _rate_limited_info(requests_per_second), concurrency=max_workers,
+                                timeout=timeout):
+            keys = [key for key, _, _ in batch]
+            rows, statuses = _rows_frame(keys, {k: v for k, v, e in batch if e is None},
+                                         {k: e for k, v, e in batch if e is not None})
+            fetched.append(rows.loc[[k for k in keys if statuses[k] == "ok"], COLUMNS])
+            yield rows, statuses, False
+    finally:
+        if fetched:
+            store.save(pd.concat(fetched))
+
+def combine_batches(tickers, batches):
+    """One frame over ``tickers`` from ``stream_nifty50_data`` items, in ticker order.
+
+    Tickers none of the batches covered yet (still in flight, or cut off by a
+    stopped stream) have status ``"pending"`` and an empty row.
+    """
+    chunks = [rows for rows, _, _ in batches]
+    df = pd.concat(chunks) if chunks else pd.DataFrame(columns=COLUMNS + ["Date"])
+    df = _numeric(df.reindex(index=list(tickers)))
+    df.index.name = "Ticker"
+    statuses = {t: status for _, batch_statuses, _ in batches for t, status in batch_statuses.items()}
+    # Per-ticker outcome travels with the frame without changing its columns
+    df.attrs["fetch_status"] = {t: statuses.get(t, "pending") for t in tickers}
+    df.attrs["refreshed"] = sum(len(rows) for rows, _, from_snapshot in batches if not from_snapshot)
     return df
 
+def fetch_nifty50_data(tickers=TICKERS, refresh=False, progress=None, max_age=SNAPSHOT_MAX_AGE_SECONDS):
+    """Today's fundamentals for ``tickers``, served from the daily snapshot store.
+
+    Only tickers missing from today's snapshot, or whose row is older than
+    ``max_age`` seconds (all of them with ``refresh=True``), go upstream; successful rows are written back so the
+    next visit, and the P/B / ROE history, need no extra upstream calls.
+    ``progress(done, total)`` counts the upstream fetches.
+    """
+    batches, from_store, refreshed = [], 0, 0
+    for batch in stream_nifty50_data(tickers, refresh=refresh, max_age=max_age):
+        batches.append(batch)
+        rows, _, from_snapshot = batch
+        if from_snapshot:
+            from_store = len(rows)
+        else:
+            refreshed += len(rows)
+            if progress is not None:
+                progress(refreshed, len(tickers) - from_store)
+    return combine_batches(tickers, batches)
+
+def fundamentals_history(column, tickers=TICKERS):
+    """Dates x tickers series of one snapshot column (e.g. "P/B Ratio"), read from disk only."""
+    return fundamentals_store.default_store.history(column, tickers=tickers)
+
 # Example usage
 if __name__ == "__main__":
     df = fetch_nifty50_data()
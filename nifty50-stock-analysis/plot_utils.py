@@ -1,10 +1,19 @@
 import seaborn as sns
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
 
-def plot_dark_mode(df):
-    plt.style.use('dark_background')
-    fig, ax1 = plt.subplots(figsize=(15, 10))
+DARK_MODE_TITLE = 'Nifty 50 - Current Price, Book Value, P/B Ratio & ROE (%)'
+
+def plot_dark_mode(df, title=DARK_MODE_TITLE):
+    # Standalone Figure (not tracked by pyplot) with the dark style scoped to it
+    with plt.style.context('dark_background'):
+        fig = Figure(figsize=(15, 10))
+        draw_dark_mode(fig, df, title)
+    return fig
+
+def draw_dark_mode(fig, df, title=DARK_MODE_TITLE):
+    ax1 = fig.subplots()
 
     # Bar plot for Current Price
     sns.barplot(x=df.index, y='Current Price', data=df, color='#1f77b4', ax=ax1)
@@ -33,7 +42,7 @@ def plot_dark_mode(df):
     ax3.tick_params(axis='y', labelcolor='#ff7f0e')
 
     # Titles and labels
-    ax1.set_title('Nifty 50 - Current Price, Book Value, P/B Ratio & ROE (%)', color='white')
+    ax1.set_title(title, color='white')
     ax1.set_xlabel('Ticker', color='white')
     ax1.set_ylabel('Price / Book Value', color='white')
 
@@ -60,4 +69,23 @@ def plot_dark_mode(df):
     ax1.legend(handles=legend_elements, loc='upper left')
 
     fig.tight_layout()
-    return fig
+
+# Above this many names the axes are left unlabeled; the heatmap itself still shows every pair
+MAX_LABELED_TICKERS = 60
+
+def draw_correlation_heatmap(fig, corr, title):
+    ax = fig.subplots()
+    # imshow draws the whole matrix as one image, so 500 x 500 stays cheap
+    image = ax.imshow(corr.to_numpy(), cmap='RdYlGn', vmin=-1, vmax=1, interpolation='nearest')
+    fig.colorbar(image, ax=ax, fraction=0.046, pad=0.04, label='Correlation')
+    if len(corr) <= MAX_LABELED_TICKERS:
+        labels = [t.replace('.NS', '') for t in corr.index]
+        ax.set_xticks(range(len(corr)))
+        ax.set_xticklabels(labels, rotation=90, fontsize=7, color='white')
+        ax.set_yticks(range(len(corr)))
+        ax.set_yticklabels(labels, fontsize=7, color='white')
+    else:
+        ax.set_xticks([])
+        ax.set_yticks([])
+    ax.set_title(title, color='white')
+    fig.tight_layout()
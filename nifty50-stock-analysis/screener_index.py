@@ -0,0 +1,79 @@
+# screener_index.py - columnar fundamentals index with precomputed sort orders
+#
+# The snapshot is split into NumPy columns once and every column's row order is
+# argsorted up front, so each table interaction (sort, filter, page) is a mask
+# and a slice over at most a few hundred integers instead of a DataFrame sort.
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from market_core.cache import history_cache
+from market_core.render import data_fingerprint
+
+PAGE_SIZES = [25, 50, 100]
+
+class ScreenerIndex:
+    def __init__(self, df):
+        self.frame = df
+        self.columns = list(df.columns)
+        self._values = {}
+        self._order = {}
+        self._valid = {}
+        for column in df.columns:
+            series = df[column]
+            if pd.api.types.is_numeric_dtype(series):
+                values = series.to_numpy(dtype=float)
+                missing = np.isnan(values)
+                order = np.argsort(values, kind="stable")  # NaN sorts last
+                self._values[column] = values
+            else:
+                missing = series.isna().to_numpy()
+                keys = series.fillna("").astype(str).str.lower().to_numpy(dtype=str)
+                order = np.lexsort((keys, missing))
+            self._order[column] = order
+            self._valid[column] = int((~missing).sum())
+        names = df["Company Name"].fillna("") if "Company Name" in df else ""
+        self._search = (df.index.to_series().astype(str) + " " + names).str.lower().to_numpy(dtype=str)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def sort_order(self, column=None, ascending=True):
+        """Row positions ordered by ``column``; missing values stay last in both directions."""
+        if column is None:
+            return np.arange(len(self))
+        order, valid = self._order[column], self._valid[column]
+        return order if ascending else np.concatenate((order[:valid][::-1], order[valid:]))
+
+    def mask(self, search="", ranges=None):
+        """Rows whose ticker/company contains ``search`` and whose values fall in ``ranges``.
+
+        ``ranges`` maps a numeric column to ``(low, high)``; either bound may be
+        None, and rows missing that value are excluded.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if search:
+            keep &= np.char.find(self._search, search.strip().lower()) >= 0
+        for column, (low, high) in (ranges or {}).items():
+            values = self._values[column]
+            with np.errstate(invalid="ignore"):
+                if low is not None:
+                    keep &= values >= low
+                if high is not None:
+                    keep &= values <= high
+        return keep
+
+    def query(self, sort_by=None, ascending=True, search="", ranges=None, page=1, page_size=PAGE_SIZES[1]):
+        """One page of the filtered, sorted snapshot; returns ``(page_frame, matching_rows, page_count)``."""
+        order = self.sort_order(sort_by, ascending)
+        rows = order[self.mask(search, ranges)[order]]
+        pages = max(1, math.ceil(len(rows) / page_size))
+        page = min(max(page, 1), pages)
+        start = (page - 1) * page_size
+        return self.frame.iloc[rows[start:start + page_size]], len(rows), pages
+
+def cached_index(df):
+    """``ScreenerIndex`` of ``df``, built once per distinct snapshot and shared by every session."""
+    return history_cache.get_or_load(("screener_index", data_fingerprint(df)), lambda: ScreenerIndex(df))
@@ -0,0 +1,59 @@
+# universes.py - index universes read from local constituent files
+#
+# Every *.csv / *.txt in universes/ is a selectable universe. Files can be NSE's
+# published constituent lists (ind_nifty100list.csv, ind_nifty500list.csv, with a
+# "Symbol" column) or one symbol per line; bare NSE symbols get the ".NS" suffix.
+
+import csv
+import io
+import os
+import re
+
+UNIVERSE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "universes")
+DEFAULT_UNIVERSE = "Nifty 50"
+SUFFIX = ".NS"
+
+def universe_label(filename):
+    """``nifty500.csv`` / ``ind_nifty500list.csv`` -> ``Nifty 500``; other files keep their stem."""
+    stem = os.path.splitext(os.path.basename(filename))[0].lower()
+    stem = re.sub(r"^ind_(.+)list$", r"\1", stem)
+    match = re.fullmatch(r"nifty[ _]?(\d+)", stem)
+    return f"Nifty {match.group(1)}" if match else stem.replace("_", " ").title()
+
+def available_universes(directory=UNIVERSE_DIR):
+    """Label -> path of every constituent file in ``directory``, smallest Nifty index first."""
+    files = sorted(f for f in os.listdir(directory) if f.lower().endswith((".csv", ".txt")))
+    universes = {universe_label(f): os.path.join(directory, f) for f in files}
+    def order(label):
+        match = re.fullmatch(r"Nifty (\d+)", label)
+        return (0, int(match.group(1)), "") if match else (1, 0, label)
+    return {label: universes[label] for label in sorted(universes, key=order)}
+
+def parse_constituents(text):
+    """Tickers from constituent-file text, in file order without duplicates."""
+    rows = [row for row in csv.reader(io.StringIO(text)) if row and row[0].strip()]
+    column = 0
+    if rows:
+        header = [cell.strip().lower() for cell in rows[0]]
+        if "symbol" in header:
+            column = header.index("symbol")
+            rows = rows[1:]
+    tickers = []
+    for row in rows:
+        symbol = row[column].strip().upper() if column < len(row) else ""
+        if not symbol or symbol.startswith("#"):
+            continue
+        if "." not in symbol and not symbol.startswith("^"):
+            symbol += SUFFIX
+        tickers.append(symbol)
+    return list(dict.fromkeys(tickers))
+
+def read_constituents(path):
+    with open(path, encoding="utf-8-sig") as f:
+        return parse_constituents(f.read())
+
+def load_universe(label=DEFAULT_UNIVERSE, directory=UNIVERSE_DIR):
+    universes = available_universes(directory)
+    if label not in universes:
+        raise KeyError(f"unknown universe {label!r}; available: {', '.join(universes)}")
+    return read_constituents(universes[label])
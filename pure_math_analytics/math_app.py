@@ -1,12 +1,150 @@
+import os
+import sys
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
-import matplotlib.pyplot as plt
+
+# Make the shared market_core package importable when this folder runs standalone
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from market_core.cache import cached_history, cached_intraday, history_cache
+from market_core.indicators import indicator_frame, sma
+from market_core.intraday import RESAMPLE_MINUTES
+from market_core.metrics import phase
+from market_core.render import data_fingerprint, render_figure
+from entropy_engine import (multiscale_entropy, rolling_permutation_entropy, rolling_sample_entropy,
+                            rolling_shannon_entropy)
+
+def draw_analytics_panels(fig, df, ticker_input, period_choice, window_size):
+    ax1, ax2, ax3, ax4, ax5 = fig.subplots(5, 1, sharex=True)
+
+    # Panel A: Stock Prices
+    ax1.plot(df.index, df['Close'], color='dodgerblue', linewidth=1.5, label='Close Price')
+    ax1.plot(df.index, df['SMA'], color='navy', linestyle='--', label=f'{window_size} SMA')
+    if period_choice in ["5y", "10y", "MAX"]:
+        ax1.set_yscale('log')
+        ax1.set_title(f"{ticker_input} Financial Price Runway (Log Scale Enabled)", fontweight='bold')
+    else:
+        ax1.set_title(f"{ticker_input} Financial Price Runway", fontweight='bold')
+    ax1.grid(True, alpha=0.15)
+    ax1.legend()
+
+    # Panel B: RSI Bounds
+    ax2.plot(df.index, df['RSI'], color='darkorange', label='14-Day RSI')
+    ax2.axhline(70, color='red', linestyle=':')
+    ax2.axhline(30, color='green', linestyle=':')
+    ax2.fill_between(df.index, df['RSI'], 70, where=(df['RSI'] > 70), color='red', alpha=0.2)
+    ax2.fill_between(df.index, df['RSI'], 30, where=(df['RSI'] < 30), color='green', alpha=0.2)
+    ax2.set_ylabel("RSI Range")
+    ax2.set_ylim(10, 90)
+    ax2.grid(True, alpha=0.15)
+
+    # Panel C: MACD System
+    ax3.plot(df.index, df['MACD'], color='blue', label='MACD')
+    ax3.plot(df.index, df['Signal_Line'], color='orange', label='Signal')
+    ax3.bar(df.index, df['MACD_Diff'], color=np.where(df['MACD_Diff'] >= 0, 'green', 'red'), alpha=0.4)
+    ax3.set_ylabel("MACD Scale")
+    ax3.grid(True, alpha=0.15)
+
+    # Panel D: Shannon Entropy Disclosures
+    ax4.plot(df.index, df['Entropy'], color='purple', linewidth=1.5, label='Shannon Entropy')
+    ax4.set_ylabel("Entropy Bit Value")
+    ax4.grid(True, alpha=0.15)
+    ax4.legend(loc='upper left')
+
+    # Panel E: Ordinal and Template Complexity (permutation entropy left axis, sample entropy right)
+    ax5.plot(df.index, df['Permutation_Entropy'], color='teal', linewidth=1.2, label='Permutation Entropy')
+    ax5.set_ylabel("Permutation (0-1)")
+    ax5.set_xlabel("Market Evaluation Timeline")
+    ax5.grid(True, alpha=0.15)
+    ax5_right = ax5.twinx()
+    ax5_right.plot(df.index, df['Sample_Entropy'], color='crimson', linewidth=1.2, label='Sample Entropy')
+    ax5_right.set_ylabel("Sample Entropy")
+    lines = ax5.get_lines() + ax5_right.get_lines()
+    ax5.legend(lines, [line.get_label() for line in lines], loc='upper left')
+
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+def analytics_frame(ticker_input, period_choice, bar_interval=None):
+    """Display window of prices, indicators, entropy and SMA for one ticker/horizon; None when empty."""
+    # 1. Horizon Scale Ingestion Filters
+    if period_choice in ["1d", "5d"]:
+        # Base bars are stored once; each interval is resampled locally with its session index
+        with phase("fetch"):
+            bars = cached_intraday(ticker_input).resample(bar_interval)
+        raw_history = bars.frame.copy()
+        target_lookback_days = 1 if period_choice == "1d" else 5
+        display_mask = bars.session_mask(target_lookback_days)
+    elif period_choice == "MAX":
+        with phase("fetch"):
+            raw_history = cached_history(ticker_input, period="max", interval="1d")
+        display_mask = pd.Series(True, index=raw_history.index)
+    else:
+        buffer_days = 60
+        if period_choice == "1mo": total_days = buffer_days + 30
+        elif period_choice == "3mo": total_days = buffer_days + 90
+        elif period_choice == "1y": total_days = buffer_days + 365
+        elif period_choice == "5y": total_days = buffer_days + (365 * 5)
+        else: total_days = buffer_days + (365 * 10)
+        
+        with phase("fetch"):
+            raw_history = cached_history(ticker_input, period=f"{total_days}d", interval="1d")
+        display_mask = raw_history.index >= raw_history.index[-1] - pd.Timedelta(days=total_days - buffer_days)
+
+    if raw_history.empty:
+        return None
+
+    # 2. Pure Technical Indicator Mathematics (shared NumPy engine, single pass)
+    with phase("indicators"):
+        indicators = indicator_frame(raw_history['Close'], rsi_window=14, fast=12, slow=26, signal=9, sma_windows=())
+    raw_history['RSI'] = indicators['RSI']
+    raw_history['EMA12'] = indicators['EMA12']
+    raw_history['EMA26'] = indicators['EMA26']
+    raw_history['MACD'] = indicators['MACD']
+    raw_history['Signal_Line'] = indicators['Signal']
+    raw_history['MACD_Diff'] = indicators['MACD_Diff']
+
+    # Complexity measures warm up on the lookback buffer, like the indicators above
+    with phase("entropy"):
+        raw_history['Permutation_Entropy'] = rolling_permutation_entropy(raw_history['Close'])
+        raw_history['Sample_Entropy'] = rolling_sample_entropy(raw_history['Close'])
+
+    # Isolate focused workspace array
+    df = raw_history.loc[display_mask].copy()
+    if df.empty:
+        df = raw_history.tail(10).copy()
+
+    # 3. ROLLING SHANNON ENTROPY (vectorized over every window at once)
+    with phase("entropy"):
+        df['Entropy'] = rolling_shannon_entropy(df['Close'])
+
+    # Panel SMA: short for intraday, long for multi-year horizons
+    window_size = 5 if period_choice in ["1d", "5d"] else (200 if period_choice in ["5y", "10y", "MAX"] else 20)
+    df['SMA'] = sma(df['Close'].to_numpy(), window_size)
+    return df, window_size
+
+def analytics_png(df, ticker_input, period_choice, window_size):
+    # Cached per ticker/horizon/data, so the warm-up job and every session share one render
+    panel_columns = ['Close', 'SMA', 'RSI', 'MACD', 'Signal_Line', 'MACD_Diff', 'Entropy',
+                     'Permutation_Entropy', 'Sample_Entropy']
+    chart_key = (ticker_input, period_choice, "math_panels", data_fingerprint(df[panel_columns]))
+    return render_figure(
+        chart_key,
+        lambda fig: draw_analytics_panels(fig, df, ticker_input, period_choice, window_size),
+        figsize=(11, 12),
+    )
+
+def multiscale_series(close):
+    # Shared per dataset: sample entropy over 20 coarse-grained copies of the series
+    return history_cache.get_or_load(("multiscale_entropy", data_fingerprint(close)),
+                                     lambda: multiscale_entropy(close))
 
 def run_pure_math_dashboard_ui():
     st.header("⚙️ Pure Math Technical Analytics Engine")
-    st.caption("Runs localized mathematical indicators and advanced Shannon Entropy metrics entirely offline.")
+    st.caption("Runs localized mathematical indicators and Shannon, permutation, sample and multiscale entropy metrics entirely offline.")
     
     col_input1, col_input2 = st.columns(2)
     with col_input1:
@@ -15,81 +153,17 @@ def run_pure_math_dashboard_ui():
         period_choice = st.selectbox("Select Time Period Horizon:", [
             "1d", "5d", "1mo", "3mo", "1y", "5y", "10y", "MAX"
         ], index=3) # Default index pointing to 3mo
-    
+    bar_interval = None
+    if period_choice in ["1d", "5d"]:
+        bar_interval = st.radio("Bar Interval:", list(RESAMPLE_MINUTES), index=1, horizontal=True)
+
     if ticker_input:
         try:
-            asset = yf.Ticker(ticker_input)
-            
-            # 1. Horizon Scale Ingestion Filters
-            if period_choice in ["1d", "5d"]:
-                raw_history = asset.history(period="1mo", interval="15m")
-                target_lookback_days = 1 if period_choice == "1d" else 5
-                unique_dates = pd.to_datetime(raw_history.index).date
-                min_target_date = sorted(list(set(unique_dates)))[-target_lookback_days]
-                display_mask = pd.to_datetime(raw_history.index).date >= min_target_date
-            elif period_choice == "MAX":
-                raw_history = asset.history(period="max", interval="1d")
-                display_mask = pd.Series(True, index=raw_history.index)
-            else:
-                buffer_days = 60
-                if period_choice == "1mo": total_days = buffer_days + 30
-                elif period_choice == "3mo": total_days = buffer_days + 90
-                elif period_choice == "1y": total_days = buffer_days + 365
-                elif period_choice == "5y": total_days = buffer_days + (365 * 5)
-                else: total_days = buffer_days + (365 * 10)
-                
-                raw_history = asset.history(period=f"{total_days}d", interval="1d")
-                display_mask = raw_history.index >= raw_history.index[-1] - pd.Timedelta(days=total_days - buffer_days)
-
-            if raw_history.empty:
+            analytics = analytics_frame(ticker_input, period_choice, bar_interval)
+            if analytics is None:
                 st.error(f"Ticker structure '{ticker_input}' returned empty arrays.")
                 return
-
-            # 2. Pure Technical Indicator Mathematics
-            delta = raw_history['Close'].diff()
-            gain = delta.clip(lower=0)
-            loss = -1 * delta.clip(upper=0)
-            avg_gain = gain.ewm(com=13, adjust=False).mean()
-            avg_loss = loss.ewm(com=13, adjust=False).mean()
-            rs = avg_gain / (avg_loss + 1e-10)
-            raw_history['RSI'] = 100 - (100 / (1 + rs))
-
-            raw_history['EMA12'] = raw_history['Close'].ewm(span=12, adjust=False).mean()
-            raw_history['EMA26'] = raw_history['Close'].ewm(span=26, adjust=False).mean()
-            raw_history['MACD'] = raw_history['EMA12'] - raw_history['EMA26']
-            raw_history['Signal_Line'] = raw_history['MACD'].ewm(span=9, adjust=False).mean()
-            raw_history['MACD_Diff'] = raw_history['MACD'] - raw_history['Signal_Line']
-
-            # Isolate focused workspace array
-            df = raw_history.loc[display_mask].copy()
-            if df.empty:
-                df = raw_history.tail(10).copy()
-
-            # 3. CRITICAL SHANNON ENTROPY CALCULATION LOOP
-            log_returns = np.log(df['Close'] / df['Close'].shift(1)).dropna()
-            entropy_window = 10 if len(log_returns) > 15 else 3
-            entropy_list = []
-            
-            for i in range(len(df)):
-                if i < entropy_window:
-                    entropy_list.append(0.0) # Pad cold initialization periods
-                    continue
-                
-                slice_data = log_returns.iloc[max(0, i - entropy_window):i]
-                counts, bin_edges = np.histogram(slice_data, bins=5, density=True)
-                probs = counts / np.sum(counts) if np.sum(counts) > 0 else []
-                probs = [p for p in probs if p > 0]
-                
-                shannon_ent = -np.sum(probs * np.log2(probs)) if probs else 0.0
-                entropy_list.append(shannon_ent)
-
-            # --- STAGE-GATE ALIGNMENT REPAIR (LINE 92 FIX) ---
-            active_dates = df.index
-            if len(entropy_list) != len(active_dates):
-                entropy_list = entropy_list[-len(active_dates):]
-            
-            entropy_df = pd.DataFrame({"Shannon Entropy Value": list(entropy_list)}, index=active_dates)
-            df['Entropy'] = entropy_df["Shannon Entropy Value"]
+            df, window_size = analytics
 
             # 4. Interface Rendering Pipeline Display Elements
             latest_price = df['Close'].iloc[-1]
@@ -107,49 +181,23 @@ def run_pure_math_dashboard_ui():
             col4.metric("🔴 Overbought Periods Detected", f"{overbought_days} Blocks")
             col5.metric("🟢 Oversold Periods Detected", f"{oversold_days} Blocks")
 
+            latest_permutation = df['Permutation_Entropy'].iloc[-1]
+            latest_sample = df['Sample_Entropy'].iloc[-1]
+            col6, col7 = st.columns(2)
+            col6.metric("Permutation Entropy (0-1)", "-" if pd.isna(latest_permutation) else f"{latest_permutation:.4f}")
+            col7.metric("Sample Entropy", "-" if pd.isna(latest_sample) else f"{latest_sample:.4f}")
+
             # 5. Multi-Pane Integrated Graphic Output Rendering
-            fig, (ax1, ax2, ax3, ax4) = plt.subplots(4, 1, figsize=(11, 10), sharex=True)
-            
-            # Panel A: Stock Prices
-            window_size = 5 if period_choice in ["1d", "5d"] else (200 if period_choice in ["5y", "10y", "MAX"] else 20)
-            df['SMA'] = df['Close'].rolling(window=window_size).mean()
-            ax1.plot(df.index, df['Close'], color='dodgerblue', linewidth=1.5, label='Close Price')
-            ax1.plot(df.index, df['SMA'], color='navy', linestyle='--', label=f'{window_size} SMA')
-            if period_choice in ["5y", "10y", "MAX"]:
-                ax1.set_yscale('log')
-                ax1.set_title(f"{ticker_input} Financial Price Runway (Log Scale Enabled)", fontweight='bold')
+            st.image(analytics_png(df, ticker_input, period_choice, window_size), use_container_width=True)
+
+            # 6. Multiscale Entropy: complexity across time scales rather than along the timeline
+            with phase("entropy"):
+                mse = multiscale_series(df['Close']).dropna()
+            st.markdown("**Multiscale Sample Entropy** (returns averaged over 1-20 bars)")
+            if mse.empty:
+                st.info("Too few bars in this horizon for multiscale entropy; try a longer period.")
             else:
-                ax1.set_title(f"{ticker_input} Financial Price Runway", fontweight='bold')
-            ax1.grid(True, alpha=0.15)
-            ax1.legend()
-
-            # Panel B: RSI Bounds
-            ax2.plot(df.index, df['RSI'], color='darkorange', label='14-Day RSI')
-            ax2.axhline(70, color='red', linestyle=':')
-            ax2.axhline(30, color='green', linestyle=':')
-            ax2.fill_between(df.index, df['RSI'], 70, where=(df['RSI'] > 70), color='red', alpha=0.2)
-            ax2.fill_between(df.index, df['RSI'], 30, where=(df['RSI'] < 30), color='green', alpha=0.2)
-            ax2.set_ylabel("RSI Range")
-            ax2.set_ylim(10, 90)
-            ax2.grid(True, alpha=0.15)
-
-            # Panel C: MACD System
-            ax3.plot(df.index, df['MACD'], color='blue', label='MACD')
-            ax3.plot(df.index, df['Signal_Line'], color='orange', label='Signal')
-            ax3.bar(df.index, df['MACD_Diff'], color=np.where(df['MACD_Diff'] >= 0, 'green', 'red'), alpha=0.4)
-            ax3.set_ylabel("MACD Scale")
-            ax3.grid(True, alpha=0.15)
-
-            # Panel D: Shannon Entropy Disclosures
-            ax4.plot(df.index, df['Entropy'], color='purple', linewidth=1.5, label='Shannon Entropy')
-            ax4.set_ylabel("Entropy Bit Value")
-            ax4.set_xlabel("Market Evaluation Timeline")
-            ax4.grid(True, alpha=0.15)
-            ax4.legend(loc='upper left')
-
-            fig.autofmt_xdate()
-            plt.tight_layout()
-            st.pyplot(fig)
+                st.line_chart(mse.rename("Sample Entropy"))
 
         except Exception as err:
             st.error(f"Execution Error within calculation layer: {err}")
@@ -0,0 +1,247 @@
+# backtest.py - vectorized backtests and parameter sweeps for the dashboard's signal rules
+#
+# Usage:
+#   python stock_analysis/backtest.py --symbol RELIANCE.NS --period 10y --rule rsi
+#   python stock_analysis/backtest.py --symbol TCS.NS --rule macd --fast 8,12,16 --slow 21,26,34 --signal 5,9,13
+#   python stock_analysis/backtest.py --symbol INFY.NS --rule all --workers 8 --out results/backtest
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Make the shared market_core package and this folder importable from any working directory
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(APP_DIR)
+for path in (ROOT_DIR, APP_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from market_core.indicators import compute_indicators
+from signals import RSI_OVERBOUGHT, RSI_OVERSOLD, TREND_LOOKBACK
+
+TRADING_DAYS = 252
+CHUNK_SIZE = 100
+
+# rsi      - enter when RSI < oversold, exit when RSI > overbought
+# macd     - long while MACD is above its signal line (bullish crossover state)
+# rsi_macd - long while MACD is bullish and RSI not overbought, or whenever RSI is oversold
+# trend    - the long-term MACD trend meter: long when bullish, flat when bearish, hold when neutral
+RULES = ("rsi", "macd", "rsi_macd", "trend")
+
+DEFAULT_PARAMS = {
+    "rsi_window": 14, "oversold": RSI_OVERSOLD, "overbought": RSI_OVERBOUGHT,
+    "fast": 12, "slow": 26, "signal": 9, "trend_lookback": TREND_LOOKBACK,
+}
+
+# ------------------- Indicators (memoised per close series) -------------------
+
+class IndicatorCache:
+    """Indicators of one close array, each computed once however many parameter sets read it."""
+
+    def __init__(self, close):
+        self.close = np.ascontiguousarray(close, dtype=float)
+        self._rsi = {}
+        self._macd = {}
+
+    def rsi(self, window):
+        if window not in self._rsi:
+            self._rsi[window] = compute_indicators(self.close, rsi_window=window, sma_windows=(), warmup=True)["RSI"]
+        return self._rsi[window]
+
+    def macd(self, fast, slow, signal):
+        key = (fast, slow, signal)
+        if key not in self._macd:
+            ind = compute_indicators(self.close, fast=fast, slow=slow, signal=signal, sma_windows=(), warmup=True)
+            self._macd[key] = ind["MACD"], ind["Signal"]
+        return self._macd[key]
+
+# Set in each worker process by the pool initializer
+_worker_cache = None
+
+def _init_worker(close):
+    global _worker_cache
+    _worker_cache = IndicatorCache(close)
+
+# ------------------- Positions -------------------
+
+def _hold_between(events):
+    """Forward-fill 1 (enter) / 0 (exit) events over NaN bars; flat before the first event."""
+    known = ~np.isnan(events)
+    last = np.maximum.accumulate(np.where(known, np.arange(len(events)), -1))
+    return np.where(last >= 0, events[np.maximum(last, 0)], 0.0)
+
+def _rolling_nanmean(values, window):
+    # Mean of the non-NaN values among the last ``window`` bars, like Series.tail(window).mean()
+    valid = ~np.isnan(values)
+    sums = np.cumsum(np.where(valid, values, 0.0))
+    counts = np.cumsum(valid)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+def positions(rule, params, cache):
+    """Target position (1 long, 0 flat) at the close of every bar for ``rule``."""
+    p = {**DEFAULT_PARAMS, **params}
+    with np.errstate(invalid="ignore"):
+        if rule == "rsi":
+            rsi = cache.rsi(p["rsi_window"])
+            events = np.where(rsi < p["oversold"], 1.0, np.where(rsi > p["overbought"], 0.0, np.nan))
+            return _hold_between(events)
+        macd, signal = cache.macd(p["fast"], p["slow"], p["signal"])
+        if rule == "macd":
+            return (macd > signal).astype(float)
+        if rule == "rsi_macd":
+            rsi = cache.rsi(p["rsi_window"])
+            return (((macd > signal) & ~(rsi > p["overbought"])) | (rsi < p["oversold"])).astype(float)
+        if rule == "trend":
+            avg = _rolling_nanmean(macd, p["trend_lookback"])
+            events = np.where((avg > 0) & (macd > 0), 1.0, np.where((avg < 0) & (macd < 0), 0.0, np.nan))
+            return _hold_between(events)
+    raise ValueError(f"rule must be one of {RULES}")
+
+# ------------------- Performance -------------------
+
+def performance(position, close, fee_bps=0.0):
+    """Metrics of trading ``position`` (decided at each close, held over the next bar)."""
+    returns = np.zeros(len(close))
+    returns[1:] = close[1:] / close[:-1] - 1.0
+    held = np.zeros(len(close))
+    held[1:] = position[:-1]
+    turnover = np.abs(np.diff(held, prepend=0.0))
+    strategy = held * returns - turnover * fee_bps / 10_000
+
+    log_growth = np.concatenate(([0.0], np.cumsum(np.log1p(strategy))))
+    equity = np.exp(log_growth[1:])
+    drawdown = equity / np.maximum.accumulate(equity) - 1.0
+
+    # Trades are runs of held == 1; each one's return from the log-growth at its ends
+    edges = np.diff(np.concatenate(([0.0], held, [0.0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    trade_returns = np.exp(log_growth[ends] - log_growth[starts]) - 1.0
+
+    years = len(close) / TRADING_DAYS
+    std = strategy.std()
+    return {
+        "Total Return": equity[-1] - 1.0,
+        "CAGR": equity[-1] ** (1.0 / years) - 1.0 if years > 0 and equity[-1] > 0 else np.nan,
+        "Volatility": std * np.sqrt(TRADING_DAYS),
+        "Sharpe": strategy.mean() / std * np.sqrt(TRADING_DAYS) if std > 0 else np.nan,
+        "Max Drawdown": drawdown.min(),
+        "Trades": len(starts),
+        "Hit Rate": (trade_returns > 0).mean() if len(starts) else np.nan,
+        "Exposure": held.mean(),
+    }
+
+def _evaluate_chunk(rule, param_sets, fee_bps, cache=None):
+    cache = cache or _worker_cache
+    rows = []
+    for params in param_sets:
+        rows.append({"Rule": rule, **params, **performance(positions(rule, params, cache), cache.close, fee_bps)})
+    return rows
+
+# ------------------- Public API -------------------
+
+def parameter_grid(**choices):
+    """Cartesian product of the given parameter lists, dropping inconsistent sets (fast >= slow, ...)."""
+    names = list(choices)
+    grid = []
+    for values in itertools.product(*(choices[n] for n in names)):
+        params = dict(zip(names, values))
+        merged = {**DEFAULT_PARAMS, **params}
+        if merged["fast"] >= merged["slow"] or merged["oversold"] >= merged["overbought"]:
+            continue
+        grid.append(params)
+    return grid
+
+def backtest(close, rule, params=None, fee_bps=0.0):
+    """Backtest one parameter set over a close-price Series (or array); returns the metrics dict."""
+    cache = IndicatorCache(close)
+    return performance(positions(rule, params or {}, cache), cache.close, fee_bps)
+
+def buy_and_hold(close):
+    close = np.ascontiguousarray(close, dtype=float)
+    return performance(np.ones(len(close)), close)
+
+def run_sweep(close, rule, grid, workers=None, chunk_size=CHUNK_SIZE, fee_bps=0.0):
+    """Evaluate every parameter set in ``grid`` across a process pool.
+
+    Returns one row per parameter set, best total return first.
+    """
+    close = np.ascontiguousarray(close, dtype=float)
+    chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+    workers = workers or min(len(chunks), os.cpu_count() or 1) or 1
+
+    rows = []
+    if workers == 1:
+        cache = IndicatorCache(close)
+        for chunk in chunks:
+            rows.extend(_evaluate_chunk(rule, chunk, fee_bps, cache))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(close,)) as pool:
+            for chunk_rows in pool.map(_evaluate_chunk, [rule] * len(chunks), chunks, [fee_bps] * len(chunks)):
+                rows.extend(chunk_rows)
+    return pd.DataFrame(rows).sort_values("Total Return", ascending=False, ignore_index=True)
+
+# ------------------- CLI -------------------
+
+def _ints(text):
+    return [int(v) for v in text.split(",") if v.strip()]
+
+def main(argv=None):
+    from market_core.ohlcv_store import get_history
+    from screener import write_results
+
+    parser = argparse.ArgumentParser(description="Backtest and sweep the RSI / MACD / trend signal rules.")
+    parser.add_argument("--symbol", required=True)
+    parser.add_argument("--period", default="10y", help="History period (yfinance style)")
+    parser.add_argument("--rule", default="all", choices=RULES + ("all",))
+    parser.add_argument("--rsi-window", default="7,10,14,21,28")
+    parser.add_argument("--oversold", default="20,25,30,35")
+    parser.add_argument("--overbought", default="65,70,75,80")
+    parser.add_argument("--fast", default="8,12,16")
+    parser.add_argument("--slow", default="21,26,34")
+    parser.add_argument("--signal", default="5,9,13")
+    parser.add_argument("--trend-lookback", default="20,30,50")
+    parser.add_argument("--fee-bps", type=float, default=0.0, help="Cost per unit of turnover, in basis points")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--out", default="backtest_results", help="Output path prefix for .parquet/.csv")
+    args = parser.parse_args(argv)
+
+    frame = get_history(args.symbol, period=args.period)
+    if frame.empty:
+        parser.error(f"no history for {args.symbol}")
+    close = frame["Close"].dropna().to_numpy()
+
+    # Each rule only sweeps the parameters it reads
+    rule_params = {
+        "rsi": ("rsi_window", "oversold", "overbought"),
+        "macd": ("fast", "slow", "signal"),
+        "rsi_macd": ("rsi_window", "oversold", "overbought", "fast", "slow", "signal"),
+        "trend": ("fast", "slow", "trend_lookback"),
+    }
+    rules = RULES if args.rule == "all" else (args.rule,)
+
+    started = time.perf_counter()
+    tables = []
+    for rule in rules:
+        grid = parameter_grid(**{name: _ints(getattr(args, name)) for name in rule_params[rule]})
+        tables.append(run_sweep(close, rule, grid, workers=args.workers, fee_bps=args.fee_bps))
+    results = pd.concat(tables, ignore_index=True).sort_values("Total Return", ascending=False, ignore_index=True)
+    paths = write_results(results, args.out)
+
+    hold = buy_and_hold(close)
+    print(f"Swept {len(results)} parameter sets over {len(close)} bars in {time.perf_counter() - started:.1f}s "
+          f"-> {', '.join(paths)}")
+    print(f"Buy & hold: total return {hold['Total Return']:.1%}, max drawdown {hold['Max Drawdown']:.1%}")
+    print(results.head(10).to_string())
+    return results
+
+if __name__ == "__main__":
+    main()
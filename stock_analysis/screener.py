@@ -0,0 +1,131 @@
+# screener.py - headless universe screener built on the dashboard's signal pipeline
+#
+# Usage:
+#   python stock_analysis/screener.py --symbols RELIANCE.NS,TCS.NS,INFY.NS
+#   python stock_analysis/screener.py --symbols-file universe.txt --period 1y --workers 8 --out results/screen
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Make the shared market_core package and this folder importable from any working directory
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(APP_DIR)
+for path in (ROOT_DIR, APP_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from market_core.indicators import compute_indicators
+from market_core.ohlcv_store import get_history_many
+from signals import TREND_LOOKBACK, classify_rsi, classify_macd, classify_long_term_trend
+
+CHUNK_SIZE = 50
+
+def evaluate_signals(close):
+    """Apply the dashboard's indicators and signal rules to one close-price Series."""
+    ind = compute_indicators(close.to_numpy(), rsi_window=14, sma_windows=(20, 50), warmup=True)
+    rsi, macd, signal = ind["RSI"], ind["MACD"], ind["Signal"]
+    diff = macd - signal
+    avg_macd = pd.Series(macd).tail(TREND_LOOKBACK).mean()
+    return {
+        "Last Date": close.index[-1],
+        "Close": close.iloc[-1],
+        "RSI": rsi[-1],
+        "MACD": macd[-1],
+        "Signal": signal[-1],
+        "SMA20": ind["SMA20"][-1],
+        "SMA50": ind["SMA50"][-1],
+        "RSI State": classify_rsi(rsi[-1]),
+        "MACD State": classify_macd(macd[-1], signal[-1]),
+        # A crossover happened on the latest bar when MACD - Signal changed sign
+        "MACD Crossover": len(diff) > 1 and (diff[-1] > 0) != (diff[-2] > 0),
+        "Long-Term Trend": classify_long_term_trend(avg_macd, macd[-1]),
+    }
+
+def screen_chunk(symbols, period):
+    """Fetch one chunk in batched calls, then score each symbol; runs inside a worker process."""
+    started = time.perf_counter()
+    try:
+        frames = get_history_many(symbols, period=period)
+        fetch_error = None
+    except Exception as e:
+        frames, fetch_error = {}, str(e)
+    # One batched call serves the whole chunk, so per-symbol fetch time is only known as the chunk's average
+    chunk_seconds_per_symbol = (time.perf_counter() - started) / max(1, len(symbols))
+
+    rows = []
+    for symbol in symbols:
+        row = {"Symbol": symbol, "Status": "ok", "Chunk Fetch Seconds / Symbol": chunk_seconds_per_symbol}
+        compute_started = time.perf_counter()
+        frame = frames.get(symbol)
+        if fetch_error is not None:
+            row["Status"] = f"error: {fetch_error}"
+        elif frame is None or frame.empty or "Close" not in frame.columns:
+            row["Status"] = "error: no historical data"
+        else:
+            try:
+                row.update(evaluate_signals(frame["Close"].dropna()))
+            except Exception as e:
+                row["Status"] = f"error: {e}"
+        row["Compute Seconds"] = time.perf_counter() - compute_started
+        rows.append(row)
+    return rows
+
+def run_screen(symbols, period="1y", workers=None, chunk_size=CHUNK_SIZE):
+    """Screen ``symbols`` across a process pool; returns one row per symbol in input order."""
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    if not symbols:
+        return pd.DataFrame(index=pd.Index([], name="Symbol"))
+    chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+    workers = workers or min(len(chunks), os.cpu_count() or 1) or 1
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_rows in pool.map(screen_chunk, chunks, [period] * len(chunks)):
+            rows.extend(chunk_rows)
+    return pd.DataFrame(rows).set_index("Symbol")
+
+def write_results(results, out_prefix):
+    """Write ``<out_prefix>.parquet`` and ``<out_prefix>.csv``; returns both paths."""
+    folder = os.path.dirname(out_prefix)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    parquet_path, csv_path = f"{out_prefix}.parquet", f"{out_prefix}.csv"
+    results.to_parquet(parquet_path)
+    results.to_csv(csv_path)
+    return parquet_path, csv_path
+
+def read_symbols_file(path):
+    with open(path) as f:
+        lines = [line.split(",")[0].strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#") and line.lower() != "symbol"]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a symbol universe for RSI / MACD signals.")
+    parser.add_argument("--symbols", default="", help="Comma-separated symbols")
+    parser.add_argument("--symbols-file", help="File with one symbol per line (first CSV column)")
+    parser.add_argument("--period", default="1y", help="History period per symbol (yfinance style)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Symbols per worker task")
+    parser.add_argument("--out", default="screen_results", help="Output path prefix for .parquet/.csv")
+    args = parser.parse_args(argv)
+
+    symbols = [s for s in args.symbols.split(",") if s.strip()]
+    if args.symbols_file:
+        symbols += read_symbols_file(args.symbols_file)
+    if not symbols:
+        parser.error("no symbols given; use --symbols or --symbols-file")
+
+    started = time.perf_counter()
+    results = run_screen(symbols, period=args.period, workers=args.workers, chunk_size=args.chunk_size)
+    paths = write_results(results, args.out)
+    ok = int((results["Status"] == "ok").sum())
+    print(f"Screened {len(results)} symbols ({ok} ok) in {time.perf_counter() - started:.1f}s -> {', '.join(paths)}")
+    return results
+
+if __name__ == "__main__":
+    main()
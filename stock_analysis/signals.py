@@ -0,0 +1,57 @@
+# signals.py - RSI / MACD signal rules shared by the dashboard, screener and backtests.
+# Kept free of Streamlit so it can run headless and inside worker processes.
+
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+TREND_LOOKBACK = 30
+
+def classify_rsi(latest_rsi, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT):
+    if latest_rsi < oversold:
+        return "oversold"
+    elif latest_rsi > overbought:
+        return "overbought"
+    return "neutral"
+
+def classify_macd(latest_macd, latest_signal):
+    return "bullish" if latest_macd > latest_signal else "bearish"
+
+def classify_long_term_trend(avg_macd, latest_macd):
+    if avg_macd < 0 and latest_macd < 0:
+        return "bearish"
+    elif avg_macd > 0 and latest_macd > 0:
+        return "bullish"
+    return "neutral"
+
+def signal_message(latest_rsi, latest_macd, latest_signal):
+    messages = []
+    rsi_state = classify_rsi(latest_rsi)
+    if rsi_state == "oversold":
+        messages.append("🔼 RSI suggests the stock may be **oversold**.")
+    elif rsi_state == "overbought":
+        messages.append("🔽 RSI suggests the stock may be **overbought**.")
+
+    if classify_macd(latest_macd, latest_signal) == "bullish":
+        messages.append("📈 MACD indicates a **bullish** crossover.")
+    else:
+        messages.append("📉 MACD indicates a **bearish** crossover.")
+
+    return " ".join(messages)
+
+def generate_signal(rsi, macd, signal_line):
+    try:
+        return signal_message(rsi.iloc[-1], macd.iloc[-1], signal_line.iloc[-1])
+    except:
+        return "Unable to generate signal summary."
+
+def long_term_trend_message(avg_macd, latest_macd):
+    trend = classify_long_term_trend(avg_macd, latest_macd)
+    if trend == "bearish":
+        return "📉 Long-Term MACD Trend: **Bearish**", "red"
+    elif trend == "bullish":
+        return "📈 Long-Term MACD Trend: **Bullish**", "green"
+    else:
+        return "⚖️ Long-Term MACD Trend: **Neutral / Uncertain**", "orange"
+
+def get_long_term_macd_trend(macd_series):
+    recent_macd = macd_series.tail(TREND_LOOKBACK)
+    return long_term_trend_message(recent_macd.mean(), macd_series.iloc[-1])
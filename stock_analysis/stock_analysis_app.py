@@ -1,13 +1,28 @@
+import os
+import sys
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import matplotlib.pyplot as plt
 import plotly.graph_objects as go
-import ta
-import pytz
-from datetime import datetime, time
-
-st.set_page_config(page_title="📈 Stock Analysis App", layout="wide")
+from datetime import datetime
+
+# Make the shared market_core package importable when this folder runs standalone
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from market_core.cache import cached_history, cached_info, cached_major_holders
+from market_core.exchange_calendar import calendar_for
+from market_core.indicators import IndicatorState, indicator_frame
+from market_core.metrics import phase
+from market_core.render import data_fingerprint, render_figure
+from backtest import RULES, backtest, buy_and_hold
+from signals import (TREND_LOOKBACK, generate_signal, get_long_term_macd_trend,
+                     long_term_trend_message, signal_message)
+
+# Live quotes accept a shared cached copy this young, so simultaneous refreshes coalesce
+LIVE_PRICE_TTL_SECONDS = 15
+# Default polling interval of the live mode
+LIVE_REFRESH_SECONDS = 30
 
 # ------------------- Utilities -------------------
 
@@ -17,31 +32,17 @@ def get_currency_symbol(currency_code):
 
 def format_close_time(last_date, symbol):
     try:
-        symbol_lower = symbol.lower()
-        if symbol_lower.endswith('.ns'):
-            local_tz = pytz.timezone('Asia/Kolkata')
-            close_time = time(15, 30)
-        elif symbol_lower.endswith('.hk'):
-            local_tz = pytz.timezone('Asia/Hong_Kong')
-            close_time = time(16, 0)
-        elif symbol_lower.endswith('.us') or symbol_lower.endswith('.nasdaq') or symbol_lower.endswith('.nyse'):
-            local_tz = pytz.timezone('US/Eastern')
-            close_time = time(16, 0)
-        else:
-            local_tz = pytz.UTC
-            close_time = time(16, 0)
-
-        dt_naive = datetime.combine(last_date.date(), close_time)
-        dt_localized = local_tz.localize(dt_naive)
-        offset = dt_localized.strftime('%z')
+        # The listing exchange's close for that session, early closes included
+        close = calendar_for(symbol).session_close(last_date)
+        offset = close.strftime('%z')
         offset_formatted = f"GMT{offset[:3]}:{offset[3:]}"
-        return f"At close: {dt_localized.strftime('%B %d at %I:%M:%S %p')} {offset_formatted}"
+        return f"At close: {close.strftime('%B %d at %I:%M:%S %p')} {offset_formatted}"
     except Exception as e:
         return f"At close: (time formatting unavailable: {e})"
 
-def print_major_holders(stock):
+def print_major_holders(symbol):
     try:
-        mh = stock.major_holders
+        mh = cached_major_holders(symbol)
         if mh is None or mh.empty:
             st.write("No major holders data available.")
             return
@@ -73,53 +74,18 @@ def print_major_holders(stock):
         st.write(f"Error fetching major holders: {e}")
 
 def fetch_stock_data(symbol, period):
-    stock = yf.Ticker(symbol)
-    hist = stock.history(period=period)
+    with phase("fetch"):
+        hist = cached_history(symbol, period=period)
     if hist.empty:
-        return None, None, "No historical data found."
+        return None, "No historical data found."
 
     hist.dropna(inplace=True)
-    hist['SMA20'] = hist['Close'].rolling(window=20).mean()
-    hist['SMA50'] = hist['Close'].rolling(window=50).mean()
-    hist['RSI'] = ta.momentum.RSIIndicator(hist['Close'], window=14).rsi()
-    macd = ta.trend.MACD(hist['Close'])
-    hist['MACD'] = macd.macd()
-    hist['Signal'] = macd.macd_signal()
-
-    return stock, hist, None
-
-def generate_signal(rsi, macd, signal_line):
-    try:
-        latest_rsi = rsi.iloc[-1]
-        latest_macd = macd.iloc[-1]
-        latest_signal = signal_line.iloc[-1]
-
-        messages = []
-        if latest_rsi < 30:
-            messages.append("🔼 RSI suggests the stock may be **oversold**.")
-        elif latest_rsi > 70:
-            messages.append("🔽 RSI suggests the stock may be **overbought**.")
-
-        if latest_macd > latest_signal:
-            messages.append("📈 MACD indicates a **bullish** crossover.")
-        else:
-            messages.append("📉 MACD indicates a **bearish** crossover.")
+    # ta-compatible warm-up: indicators stay NaN until each has a full window
+    with phase("indicators"):
+        indicators = indicator_frame(hist['Close'], rsi_window=14, sma_windows=(20, 50), warmup=True)
+    hist[['SMA20', 'SMA50', 'RSI', 'MACD', 'Signal']] = indicators[['SMA20', 'SMA50', 'RSI', 'MACD', 'Signal']]
 
-        return " ".join(messages)
-    except:
-        return "Unable to generate signal summary."
-
-def get_long_term_macd_trend(macd_series):
-    recent_macd = macd_series.tail(30)
-    avg_macd = recent_macd.mean()
-    latest_macd = macd_series.iloc[-1]
-
-    if avg_macd < 0 and latest_macd < 0:
-        return "📉 Long-Term MACD Trend: **Bearish**", "red"
-    elif avg_macd > 0 and latest_macd > 0:
-        return "📈 Long-Term MACD Trend: **Bullish**", "green"
-    else:
-        return "⚖️ Long-Term MACD Trend: **Neutral / Uncertain**", "orange"
+    return hist, None
 
 def plot_candlestick_chart(hist):
     fig = go.Figure(data=[go.Candlestick(
@@ -140,15 +106,58 @@ def plot_candlestick_chart(hist):
         They help visualize market sentiment, trends, and reversals.
         """)
 
-def plot_sma_chart(hist):
-    fig, ax = plt.subplots()
+def draw_sma_chart(fig, hist):
+    ax = fig.subplots()
     ax.plot(hist.index, hist['Close'], label='Close', color='blue')
     ax.plot(hist.index, hist['SMA20'], label='SMA 20', color='green')
     ax.plot(hist.index, hist['SMA50'], label='SMA 50', color='red')
     ax.legend()
     ax.grid(True)
     fig.autofmt_xdate()
-    st.pyplot(fig)
+
+def draw_volume_chart(fig, hist):
+    ax = fig.subplots()
+    ax.bar(hist.index, hist['Volume'], color='gray')
+    ax.set_title("Trading Volume")
+    fig.autofmt_xdate()
+
+def draw_rsi_chart(fig, hist):
+    ax = fig.subplots()
+    ax.plot(hist.index, hist['RSI'], color='purple')
+    ax.axhline(70, color='red', linestyle='--', label='Overbought')
+    ax.axhline(30, color='green', linestyle='--', label='Oversold')
+    ax.set_title("RSI")
+    ax.legend()
+    fig.autofmt_xdate()
+
+def draw_macd_chart(fig, hist):
+    ax = fig.subplots()
+    ax.plot(hist.index, hist['MACD'], label='MACD', color='black')
+    ax.plot(hist.index, hist['Signal'], label='Signal Line', color='orange')
+    ax.axhline(0, color='gray', linestyle='--')
+    ax.legend()
+    fig.autofmt_xdate()
+
+# Chart type -> (columns it reads, draw function)
+CHARTS = {
+    "sma": (['Close', 'SMA20', 'SMA50'], draw_sma_chart),
+    "volume": (['Volume'], draw_volume_chart),
+    "rsi": (['RSI'], draw_rsi_chart),
+    "macd": (['MACD', 'Signal'], draw_macd_chart),
+}
+
+def chart_png(hist, symbol, period, chart_type):
+    # Rendered once per (symbol, period, chart, data) and served from the image cache afterwards
+    columns, draw = CHARTS[chart_type]
+    data = hist[columns]
+    key = (symbol, period, chart_type, data_fingerprint(data))
+    return render_figure(key, lambda fig: draw(fig, data))
+
+def show_chart(hist, symbol, period, chart_type):
+    st.image(chart_png(hist, symbol, period, chart_type), use_container_width=True)
+
+def plot_sma_chart(hist, symbol, period):
+    show_chart(hist, symbol, period, "sma")
 
     with st.expander("📘 Learn More about Simple Moving Averages (SMA)"):
         st.markdown("""
@@ -158,12 +167,8 @@ def plot_sma_chart(hist):
         Crossovers between SMAs can signal potential buy or sell points.
         """)
 
-def plot_volume_chart(hist):
-    fig, ax = plt.subplots()
-    ax.bar(hist.index, hist['Volume'], color='gray')
-    ax.set_title("Trading Volume")
-    fig.autofmt_xdate()
-    st.pyplot(fig)
+def plot_volume_chart(hist, symbol, period):
+    show_chart(hist, symbol, period, "volume")
 
     with st.expander("📘 Learn More about Trading Volume"):
         st.markdown("""
@@ -171,15 +176,8 @@ def plot_volume_chart(hist):
         High volume often confirms price movements; low volume may indicate weak interest.
         """)
 
-def plot_rsi_chart(hist):
-    fig, ax = plt.subplots()
-    ax.plot(hist.index, hist['RSI'], color='purple')
-    ax.axhline(70, color='red', linestyle='--', label='Overbought')
-    ax.axhline(30, color='green', linestyle='--', label='Oversold')
-    ax.set_title("RSI")
-    ax.legend()
-    fig.autofmt_xdate()
-    st.pyplot(fig)
+def plot_rsi_chart(hist, symbol, period):
+    show_chart(hist, symbol, period, "rsi")
 
     with st.expander("📘 Learn More about RSI (Relative Strength Index)"):
         st.markdown("""
@@ -189,14 +187,8 @@ def plot_rsi_chart(hist):
         RSI helps identify momentum shifts.
         """)
 
-def plot_macd_chart(hist):
-    fig, ax = plt.subplots()
-    ax.plot(hist.index, hist['MACD'], label='MACD', color='black')
-    ax.plot(hist.index, hist['Signal'], label='Signal Line', color='orange')
-    ax.axhline(0, color='gray', linestyle='--')
-    ax.legend()
-    fig.autofmt_xdate()
-    st.pyplot(fig)
+def plot_macd_chart(hist, symbol, period):
+    show_chart(hist, symbol, period, "macd")
 
     with st.expander("📘 Learn More about MACD and Signal Line"):
         st.markdown("""
@@ -221,23 +213,117 @@ def explain_macd_difference(macd_series, signal_series):
         Larger magnitude = stronger momentum.
         """)
 
+def show_signal_backtest(hist):
+    # Default 14 / 30-70 / 12-26-9 / 30-bar rules replayed over the whole fetched history
+    with phase("backtest"):
+        rows = {rule: backtest(hist['Close'], rule) for rule in RULES}
+        rows["buy & hold"] = buy_and_hold(hist['Close'])
+    table = pd.DataFrame(rows).T[["Total Return", "Max Drawdown", "Hit Rate", "Trades", "Exposure", "Sharpe"]]
+    st.subheader("📐 How These Signal Rules Performed on This History")
+    st.dataframe(table.style.format({
+        "Total Return": "{:.1%}", "Max Drawdown": "{:.1%}", "Hit Rate": "{:.0%}",
+        "Trades": "{:.0f}", "Exposure": "{:.0%}", "Sharpe": "{:.2f}",
+    }, na_rep="N/A"), use_container_width=True)
+
+    with st.expander("📘 Learn More about the Signal Backtest"):
+        st.markdown("""
+        Each rule decides a long / flat position at every close and holds it over the next bar (no costs):
+        - **rsi:** Buy when RSI drops below 30, sell when it rises above 70.
+        - **macd:** Long while MACD is above its signal line.
+        - **rsi_macd:** Long while MACD is bullish and RSI is not overbought, or whenever RSI is oversold.
+        - **trend:** The long-term MACD meter; long when bullish, flat when bearish.
+        **Hit Rate** is the share of trades that closed with a gain. Parameter sweeps run headless via `stock_analysis/backtest.py`.
+        """)
+
+def live_indicator_state(symbol, period, hist):
+    # Seeded once per fetched history; every later tick is a constant-time update
+    key = (symbol, period, data_fingerprint(hist[['Close']]))
+    live = st.session_state.get("live_indicators")
+    if live is None or live["key"] != key:
+        state = IndicatorState.from_closes(hist['Close'], rsi_window=14, sma_windows=(20, 50),
+                                           trend_lookback=TREND_LOOKBACK, warmup=True)
+        live = st.session_state["live_indicators"] = {"key": key, "state": state, "bar_date": hist.index[-1].date()}
+    return live
+
+def quote_session(symbol, quote):
+    # The exchange session the quote was struck in; weekends, holidays and the pre-open map to the last session
+    quote_time = quote.get('regularMarketTime')
+    ts = pd.Timestamp(quote_time, unit='s', tz='UTC') if pd.api.types.is_number(quote_time) else None
+    return calendar_for(symbol).session_date(ts)
+
+def apply_live_price(live, price, session):
+    # A quote from a later session opens a new bar; otherwise it revises the current one
+    if session > live["bar_date"]:
+        live["bar_date"] = session
+        return live["state"].append(price)
+    return live["state"].update(price)
+
+def show_live_panel(symbol, period, hist, currency_symbol, live_mode, interval):
+    live = live_indicator_state(symbol, period, hist)
+
+    # Only this fragment reruns on each poll; the history and charts above are not recomputed or redrawn
+    @st.fragment(run_every=interval if live_mode else None)
+    def panel():
+        st.subheader("⚡ Live Price and Indicators")
+        refresh = st.button("🔄 Refresh Current Price")
+        if not (live_mode or refresh):
+            st.caption("Refresh the price, or turn on Live mode in the sidebar to poll automatically.")
+            return
+        try:
+            quote = cached_info(symbol, ttl=LIVE_PRICE_TTL_SECONDS)
+        except (LookupError, ValueError, OSError) as e:
+            # Rate limits propagate to the router, which reports them for every page
+            st.error(f"Could not fetch live price: {e}")
+            return
+        live_price = quote.get('currentPrice')
+        if live_price is None:
+            st.warning(f"No current price in the latest {symbol} quote; indicators left unchanged.")
+            return
+        values = apply_live_price(live, float(live_price), quote_session(symbol, quote))
+
+        def fmt(value, spec=".2f"):
+            # Short histories leave slow indicators in their warm-up (NaN) phase
+            return "N/A" if pd.isna(value) else format(value, spec)
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Live Price", f"{currency_symbol}{live_price:.2f}")
+        col2.metric("RSI", fmt(values['RSI']))
+        col3.metric("MACD", fmt(values['MACD'], ".4f"), f"{fmt(values['MACD_Diff'], '+.4f')} vs Signal")
+        col4.metric("SMA 20 / SMA 50", f"{fmt(values['SMA20'])} / {fmt(values['SMA50'])}")
+        st.info(signal_message(values['RSI'], values['MACD'], values['Signal']))
+        trend_text, trend_color = long_term_trend_message(values['MACD_Avg'], values['MACD'])
+        st.markdown(f"<h4 style='color:{trend_color}'>{trend_text}</h4>", unsafe_allow_html=True)
+        st.caption(f"Last update: {datetime.now().strftime('%H:%M:%S')}")
+
+    panel()
+
 # ------------------- Main App -------------------
 
 def main():
+    st.set_page_config(page_title="📈 Stock Analysis App", layout="wide")
     st.sidebar.title("📋 Stock Controls")
     symbol = st.sidebar.text_input("Stock Symbol (e.g., AAPL, RELIANCE.NS):", value="RELIANCE.NS")
     period = st.sidebar.selectbox("Time Period", ['1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max'])
     fetch_button = st.sidebar.button("📥 Fetch Stock Data")
+    live_mode = st.sidebar.toggle("🔴 Live mode", value=False)
+    live_interval = st.sidebar.number_input("Live refresh interval (seconds)", min_value=5, max_value=600,
+                                            value=LIVE_REFRESH_SECONDS, step=5)
 
     st.title("📊 Welcome to Stock Analysis Tool")
 
     if fetch_button:
-        stock, hist, error = fetch_stock_data(symbol, period)
+        # Keep the analysis on screen across reruns so the live panel has something to update
+        st.session_state["stock_view"] = (symbol, period)
+
+    if "stock_view" in st.session_state:
+        symbol, period = st.session_state["stock_view"]
+        hist, error = fetch_stock_data(symbol, period)
         if error:
             st.error(error)
             return
 
-        info = stock.info
+        with phase("fetch"):
+            info = cached_info(symbol)
         longName = info.get('longName', 'Unknown Company')
         currency = info.get('currency', 'INR')
         currency_symbol = get_currency_symbol(currency)
@@ -312,8 +398,11 @@ def main():
             - Neutral = Mixed signals.
             """)
 
+        # Signal rules replayed over the history
+        show_signal_backtest(hist)
+
         # Major Holders
-        print_major_holders(stock)
+        print_major_holders(symbol)
 
         # Candlestick Chart
         st.subheader("🕯️ Candlestick Chart")
@@ -321,19 +410,19 @@ def main():
 
         # SMA Plot
         st.subheader("📈 Price History with SMA")
-        plot_sma_chart(hist)
+        plot_sma_chart(hist, symbol, period)
 
         # Volume Chart
         st.subheader("📊 Volume Chart")
-        plot_volume_chart(hist)
+        plot_volume_chart(hist, symbol, period)
 
         # RSI Plot
         st.subheader("📉 RSI Indicator")
-        plot_rsi_chart(hist)
+        plot_rsi_chart(hist, symbol, period)
 
         # MACD Plot
         st.subheader("📈 MACD Indicator")
-        plot_macd_chart(hist)
+        plot_macd_chart(hist, symbol, period)
 
         # MACD vs Signal difference
         explain_macd_difference(hist['MACD'], hist['Signal'])
@@ -342,13 +431,8 @@ def main():
         csv = hist.to_csv()
         st.download_button("📥 Download Historical Data", data=csv, file_name=f"{symbol}_{period}_data.csv", mime='text/csv')
 
-        # Live price refresh
-        if st.button("🔄 Refresh Current Price"):
-            try:
-                live_price = yf.Ticker(symbol).info.get('currentPrice')
-                st.metric("Live Price", f"{currency_symbol}{live_price:.2f}")
-            except:
-                st.error("Could not fetch live price.")
+        # Live price and indicator refresh
+        show_live_panel(symbol, period, hist, currency_symbol, live_mode, live_interval)
 
 if __name__ == "__main__":
     main()
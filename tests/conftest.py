@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# Same import roots combined_app.py sets up: the repo, each dashboard folder, and the benchmark fixtures
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in ("", "benchmarks", "stock_analysis", "nifty50-stock-analysis", "pure_math_analytics",
+               "Quantum-AI-Portfolio"):
+    path = os.path.join(ROOT_DIR, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+@pytest.fixture
+def fixture_market(tmp_path):
+    """Offline synthetic provider with throwaway stores and empty process caches."""
+    import fixture_provider
+    from market_core.cache import history_cache, info_cache
+
+    history_cache.clear()
+    info_cache.clear()
+    with fixture_provider.installed(store_dir=str(tmp_path)) as provider:
+        yield provider
+    history_cache.clear()
+    info_cache.clear()
@@ -0,0 +1,42 @@
+import sys
+import threading
+
+import pytest
+
+from market_core.app_loader import load_app_module
+
+
+def test_module_executes_once_across_threads(tmp_path):
+    path = tmp_path / "slow_app.py"
+    path.write_text("import time\ntime.sleep(0.2)\nREADY = True\n")
+    seen = []
+
+    def load():
+        module = load_app_module("loader_test_slow_app", str(path))
+        seen.append((module, getattr(module, "READY", False)))
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Every caller got the same, fully executed module
+        assert len({id(module) for module, _ in seen}) == 1
+        assert all(ready for _, ready in seen)
+    finally:
+        sys.modules.pop("loader_test_slow_app", None)
+
+
+def test_failed_import_is_not_published(tmp_path):
+    path = tmp_path / "broken_app.py"
+    path.write_text("import sys\nPUBLISHED = 'loader_test_broken_app' in sys.modules\nraise RuntimeError('boom')\n")
+    with pytest.raises(RuntimeError):
+        load_app_module("loader_test_broken_app", str(path))
+    assert "loader_test_broken_app" not in sys.modules
+
+    path.write_text("import sys\nPUBLISHED = 'loader_test_broken_app' in sys.modules\n")
+    try:
+        assert load_app_module("loader_test_broken_app", str(path)).PUBLISHED is False
+    finally:
+        sys.modules.pop("loader_test_broken_app", None)
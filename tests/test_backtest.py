@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import (RULES, TRADING_DAYS, IndicatorCache, backtest, buy_and_hold, parameter_grid, positions,
+                      run_sweep)
+from market_core.indicators import indicator_frame
+from signals import classify_long_term_trend, classify_macd, classify_rsi
+
+
+def random_close(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n))),
+                     index=pd.bdate_range("2018-01-01", periods=n))
+
+
+def loop_positions(close, rule, rsi_window=14, oversold=30, overbought=70, fast=12, slow=26, signal=9,
+                   trend_lookback=30):
+    """Walk the bars one at a time applying the dashboard's classify_* rules, as a trader would."""
+    ind = indicator_frame(close, rsi_window=rsi_window, fast=fast, slow=slow, signal=signal, sma_windows=(),
+                          warmup=True)
+    held, out = 0.0, []
+    for i in range(len(close)):
+        rsi_state = classify_rsi(ind["RSI"].iloc[i], oversold, overbought)
+        macd_state = classify_macd(ind["MACD"].iloc[i], ind["Signal"].iloc[i])
+        if rule == "rsi":
+            held = {"oversold": 1.0, "overbought": 0.0}.get(rsi_state, held)
+        elif rule == "macd":
+            held = float(macd_state == "bullish")
+        elif rule == "rsi_macd":
+            held = float((macd_state == "bullish" and rsi_state != "overbought") or rsi_state == "oversold")
+        else:
+            avg = ind["MACD"].iloc[:i + 1].tail(trend_lookback).mean()
+            trend = classify_long_term_trend(avg, ind["MACD"].iloc[i])
+            held = {"bullish": 1.0, "bearish": 0.0}.get(trend, held)
+        out.append(held)
+    return np.array(out)
+
+
+def loop_performance(position, close, fee_bps=0.0):
+    """Compound the position bar by bar: decided at one close, held over the next bar."""
+    equity, peak, worst, daily = 1.0, 1.0, 0.0, [0.0]
+    trades, entry_equity = [], None
+    for i in range(1, len(close)):
+        held, before = position[i - 1], position[i - 2] if i >= 2 else 0.0
+        if held and not before:
+            entry_equity = equity
+        if before and not held:
+            trades.append(equity / entry_equity - 1.0)   # the exit fee lands on the next bar, not the trade
+        r = held * (close[i] / close[i - 1] - 1.0) - abs(held - before) * fee_bps / 10_000
+        equity *= 1.0 + r
+        daily.append(r)
+        peak = max(peak, equity)
+        worst = min(worst, equity / peak - 1.0)
+    if position[-2]:
+        trades.append(equity / entry_equity - 1.0)
+    daily = np.array(daily)
+    return {
+        "Total Return": equity - 1.0,
+        "Max Drawdown": worst,
+        "Trades": len(trades),
+        "Hit Rate": np.mean(np.array(trades) > 0) if trades else np.nan,
+        "Sharpe": daily.mean() / daily.std() * np.sqrt(TRADING_DAYS),
+        "Exposure": position[:-1].sum() / len(close),
+    }
+
+
+@pytest.mark.parametrize("rule", RULES)
+@pytest.mark.parametrize("params", [{}, {"rsi_window": 7, "oversold": 35, "overbought": 65, "fast": 8, "slow": 21,
+                                         "signal": 5, "trend_lookback": 20}])
+def test_positions_match_bar_by_bar_rules(rule, params):
+    close = random_close(seed=len(params))
+    np.testing.assert_array_equal(positions(rule, params, IndicatorCache(close)), loop_positions(close, rule, **params))
+
+
+@pytest.mark.parametrize("fee_bps", [0.0, 10.0])
+def test_performance_matches_loop(fee_bps):
+    close = random_close(seed=5)
+    position = loop_positions(close, "rsi_macd")
+    ours = backtest(close, "rsi_macd", fee_bps=fee_bps)
+    expected = loop_performance(position, close.to_numpy(), fee_bps)
+    for name, value in expected.items():
+        assert ours[name] == pytest.approx(value, rel=1e-9, nan_ok=True), name
+
+
+def test_buy_and_hold_and_fees():
+    close = random_close(seed=6)
+    hold = buy_and_hold(close)
+    assert hold["Total Return"] == pytest.approx(close.iloc[-1] / close.iloc[0] - 1.0)
+    assert hold["Trades"] == 1 and hold["Exposure"] == pytest.approx(1 - 1 / len(close))
+    assert backtest(close, "macd", fee_bps=20)["Total Return"] < backtest(close, "macd")["Total Return"]
+
+
+def test_grid_drops_inconsistent_sets():
+    grid = parameter_grid(fast=[8, 26], slow=[21, 26])
+    assert grid == [{"fast": 8, "slow": 21}, {"fast": 8, "slow": 26}]
+    assert parameter_grid(oversold=[30, 80]) == [{"oversold": 30}]
+
+
+def test_sweep_in_processes_matches_in_process():
+    close = random_close(seed=7).to_numpy()
+    grid = parameter_grid(fast=[8, 12], slow=[21, 26], signal=[5, 9])
+    serial = run_sweep(close, "macd", grid, workers=1, chunk_size=3)
+    pooled = run_sweep(close, "macd", grid, workers=2, chunk_size=3)
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert len(serial) == len(grid) and serial["Total Return"].is_monotonic_decreasing
+    best = serial.iloc[0]
+    single = backtest(close, "macd", {k: int(best[k]) for k in ("fast", "slow", "signal")})
+    assert single["Total Return"] == pytest.approx(best["Total Return"])
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+import market_core.cache as cache
+from market_core.cache import TTLCache
+
+
+class Clock:
+    """Stands in for the ``time`` module so entries can be aged without sleeping."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+def test_concurrent_misses_share_one_load():
+    store, calls, release = TTLCache("test"), [], threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get_or_load("k", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while store.coalesced < len(threads) - 1:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1] and results == ["value"] * len(threads)
+    assert (store.misses, store.coalesced) == (1, len(threads) - 1)
+    assert store.get_or_load("k", loader) == "value" and store.hits == 1
+
+
+def test_loader_error_reaches_every_waiter_then_clears():
+    store, release = TTLCache("test"), threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            store.get_or_load("k", failing)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while store.coalesced < len(threads) - 1:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == len(threads) and all(e is errors[0] for e in errors)
+    # Nothing cached and nothing left in flight: the next call loads afresh
+    assert store._inflight == {}
+    assert store.get_or_load("k", lambda: "recovered") == "recovered"
+
+
+def test_maxsize_evicts_least_recently_used():
+    store = TTLCache("test", maxsize=2)
+    store.get_or_load("a", lambda: 1)
+    store.get_or_load("b", lambda: 2)
+    store.get_or_load("a", lambda: 0)     # touch "a" so "b" is the oldest
+    store.get_or_load("c", lambda: 3)
+
+    assert list(store._entries) == ["a", "c"]
+    assert store.get_or_load("b", lambda: 20) == 20
+
+
+def test_ttl_expiry(clock):
+    store = TTLCache("test", ttl=60)
+    store.get_or_load("k", lambda: "old")
+    clock.now += 59
+    assert store.get_or_load("k", lambda: "new") == "old"
+    # A per-read ttl only accepts younger entries
+    assert store.get_or_load("k", lambda: "new", ttl=30) == "new"
+    clock.now += 61
+    assert store.get_or_load("k", lambda: "newer") == "newer"
+
+
+def test_expires_replaces_the_ttl(clock):
+    store = TTLCache("test", ttl=60)
+    store.get_or_load("k", lambda: "old", expires=lambda: clock.now + 3600)
+    clock.now += 600
+    assert store.get_or_load("k", lambda: "new") == "old"
+    clock.now += 3000
+    assert store.get_or_load("k", lambda: "new") == "new"
@@ -0,0 +1,158 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_core import correlation as corr_module
+from market_core.correlation import (RollingCovariance, cluster_order, correlation, covariance, daily_returns,
+                                     rolling_correlation)
+
+
+def random_returns(days, assets, seed=0):
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 0.01, (days, 1))
+    values = common + rng.normal(0, 0.01, (days, assets))
+    return pd.DataFrame(values, index=pd.bdate_range("2023-01-02", periods=days),
+                        columns=[f"T{i}" for i in range(assets)])
+
+
+def full_recompute(returns, window):
+    """Every window's mean pairwise correlation, straight from the correlation matrix."""
+    averages = {}
+    n = returns.shape[1]
+    for end in range(window, len(returns) + 1):
+        matrix = correlation(returns.iloc[end - window:end]).to_numpy()
+        averages[returns.index[end - 1]] = (matrix.sum() - n) / (n * (n - 1))
+    return correlation(returns.iloc[-window:]), pd.Series(averages)
+
+
+def test_matches_full_recompute():
+    returns = random_returns(300, 8)
+    matrix, average = rolling_correlation(returns, 60)
+    expected_matrix, expected_average = full_recompute(returns, 60)
+    np.testing.assert_allclose(matrix, expected_matrix, atol=1e-10)
+    pd.testing.assert_series_equal(average, expected_average, check_freq=False, atol=1e-10)
+
+
+def test_new_day_update_matches_rebuild():
+    returns = random_returns(260, 6, seed=1)
+    key = ("test-new-day", "1y")
+    rolling_correlation(returns.iloc[:-1], 40, key=key)
+    state = corr_module._states[(key, 40)].state
+    matrix, average = rolling_correlation(returns, 40, key=key)
+    # The same state object took the one new row
+    assert corr_module._states[(key, 40)].state is state
+    expected_matrix, expected_average = rolling_correlation(returns, 40)
+    np.testing.assert_allclose(matrix, expected_matrix, atol=1e-12)
+    pd.testing.assert_series_equal(average, expected_average, atol=1e-12)
+
+
+def test_revised_rows_rebuild_the_state():
+    returns = random_returns(200, 5, seed=2)
+    key = ("test-revised", "1y")
+    rolling_correlation(returns, 30, key=key)
+    # Today's live bar moved, then a split adjustment rewrote a row inside the window
+    revised = returns.copy()
+    revised.iloc[-1] *= 3.0
+    revised.iloc[-10] = -revised.iloc[-10]
+    matrix, average = rolling_correlation(revised, 30, key=key)
+    expected_matrix, expected_average = full_recompute(revised, 30)
+    np.testing.assert_allclose(matrix, expected_matrix, atol=1e-10)
+    np.testing.assert_allclose(average.iloc[-30:], expected_average.iloc[-30:], atol=1e-10)
+
+
+def test_average_is_capped_to_the_callers_history():
+    returns = random_returns(400, 4, seed=3)
+    key = ("test-cap", "1y")
+    for end in range(252, 400, 7):
+        _, average = rolling_correlation(returns.iloc[end - 252:end], 20, key=key)
+    entry = corr_module._states[(key, 20)]
+    # Bounded by the caller's history however many days have been pushed
+    assert len(entry.average) <= 252
+    assert min(entry.average) >= returns.index[end - 252]
+    assert average.index[-1] == returns.index[end - 1]
+
+
+def test_resync_removes_drift():
+    rng = np.random.default_rng(4)
+    # A large common offset makes the incremental co-moment lose precision quickly
+    rows = 1e4 + rng.normal(0, 1e-3, (5000, 3))
+    drifting = RollingCovariance(50, 3, resync_every=10**9)
+    resyncing = RollingCovariance(50, 3, resync_every=100)
+    for row in rows:
+        drifting.push(row)
+        resyncing.push(row)
+    exact = np.cov(rows[-50:], rowvar=False)
+    assert np.abs(resyncing.covariance() - exact).max() < np.abs(drifting.covariance() - exact).max()
+    np.testing.assert_allclose(resyncing.covariance(), exact, rtol=1e-6)
+
+
+def test_keys_update_concurrently_and_independently():
+    frames = {f"U{i}": random_returns(150, 5, seed=10 + i) for i in range(4)}
+    results = {}
+
+    def run(name):
+        for end in range(100, 151, 10):
+            results[name] = rolling_correlation(frames[name].iloc[:end], 30, key=(name, "6mo"))
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in frames]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for name, returns in frames.items():
+        np.testing.assert_allclose(results[name][0], correlation(returns.iloc[-30:]), atol=1e-10)
+
+
+def test_daily_returns_drops_sparse_tickers():
+    prices = pd.DataFrame({"A": np.linspace(100, 120, 50), "B": np.linspace(50, 40, 50)},
+                          index=pd.bdate_range("2024-01-01", periods=50))
+    prices["NEW"] = np.nan
+    prices.iloc[40:, 2] = 10.0
+    returns = daily_returns(prices)
+    assert list(returns.columns) == ["A", "B"]
+    assert len(returns) == 49
+    np.testing.assert_allclose(covariance(returns), returns.cov())
+
+
+def flat_column_prices(days=120):
+    rng = np.random.default_rng(20)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (days, 5)), axis=0)),
+                          index=pd.bdate_range("2024-01-01", periods=days), columns=list("ABCDE"))
+    prices["C"] = 50.0   # suspended all period, forward-filled
+    return prices
+
+
+def test_flat_ticker_is_dropped_from_returns():
+    returns = daily_returns(flat_column_prices())
+    assert list(returns.columns) == ["A", "B", "D", "E"]
+    assert np.isfinite(correlation(returns).to_numpy()).all()
+
+
+def test_flat_window_keeps_clustering_and_average_finite():
+    prices = flat_column_prices()
+    prices["C"] = np.r_[np.linspace(40, 50, 60), np.full(60, 50.0)]   # halted for the latest window
+    returns = daily_returns(prices)
+    assert "C" in returns.columns
+    matrix, average = rolling_correlation(returns, 30)
+    assert matrix["C"].drop("C").isna().all()
+    order = cluster_order(matrix)
+    assert sorted(order) == list("ABCDE")
+    # Windows where C is flat average the other four assets' correlations
+    expected = correlation(returns[["A", "B", "D", "E"]].iloc[-30:]).to_numpy()
+    assert average.notna().all()
+    assert average.iloc[-1] == pytest.approx((expected.sum() - 4) / 12)
+
+
+def test_states_are_bounded_lru(monkeypatch):
+    monkeypatch.setattr(corr_module, "MAX_STATES", 3)
+    returns = random_returns(80, 3, seed=30)
+    for name in ("a", "b", "c"):
+        rolling_correlation(returns, 20, key=("lru", name))
+    rolling_correlation(returns, 20, key=("lru", "a"))      # a becomes most recent
+    rolling_correlation(returns, 20, key=("lru", "d"))      # evicts b
+    keys = [key for key in corr_module._states if key[0][0] == "lru"]
+    assert keys == [(("lru", "c"), 20), (("lru", "a"), 20), (("lru", "d"), 20)]
+    assert len(corr_module._states) <= 3
+    assert set(corr_module._key_locks) <= set(corr_module._states)
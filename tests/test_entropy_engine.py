@@ -0,0 +1,135 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from entropy_engine import (default_complexity_window, multiscale_entropy, rolling_entropy_panel,
+                            rolling_permutation_entropy, rolling_sample_entropy, rolling_shannon_entropy,
+                            sample_entropy)
+
+
+def loop_entropy(close):
+    """The per-bar loop math_app ran before the vectorized engine, kept verbatim as the reference."""
+    df = pd.DataFrame({"Close": close})
+    log_returns = np.log(df['Close'] / df['Close'].shift(1)).dropna()
+    entropy_window = 10 if len(log_returns) > 15 else 3
+    entropy_list = []
+    for i in range(len(df)):
+        if i < entropy_window:
+            entropy_list.append(0.0)
+            continue
+        slice_data = log_returns.iloc[max(0, i - entropy_window):i]
+        counts, bin_edges = np.histogram(slice_data, bins=5, density=True)
+        probs = counts / np.sum(counts) if np.sum(counts) > 0 else []
+        probs = [p for p in probs if p > 0]
+        shannon_ent = -np.sum(probs * np.log2(probs)) if probs else 0.0
+        entropy_list.append(shannon_ent)
+    return np.array(entropy_list)
+
+
+def random_close(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+                     index=pd.bdate_range("2020-01-01", periods=n))
+
+
+@pytest.mark.parametrize("n", [5, 12, 16, 40, 750])
+def test_matches_loop(n):
+    close = random_close(n, n)
+    np.testing.assert_allclose(rolling_shannon_entropy(close), loop_entropy(close), atol=1e-12)
+
+
+def test_matches_loop_on_flat_and_repeated_prices():
+    # Flat stretches give zero-width windows, rounded prices put returns exactly on bin edges
+    close = random_close(300, 7).round(0)
+    close.iloc[100:130] = close.iloc[100]
+    np.testing.assert_allclose(rolling_shannon_entropy(close), loop_entropy(close), atol=1e-12)
+
+
+def test_panel_matches_single_series():
+    closes = pd.DataFrame({f"T{i}": random_close(200, i) for i in range(3)})
+    closes.iloc[:20, 1] = np.nan  # a later listing
+    panel = rolling_entropy_panel(closes, windows=(10, 20))
+    for ticker in closes.columns:
+        series = closes[ticker].dropna()
+        for window in (10, 20):
+            expected = rolling_shannon_entropy(series, window=window)
+            np.testing.assert_allclose(panel[(ticker, window)].dropna().to_numpy(), expected, atol=1e-12)
+
+
+# ---- Complexity measures ----
+
+def naive_permutation_entropy(close, window, order=3, delay=1):
+    returns = np.log(close / close.shift(1)).dropna().to_numpy()
+    span = (order - 1) * delay
+    patterns = [tuple(np.argsort(returns[k:k + span + 1:delay], kind="stable")) for k in range(len(returns) - span)]
+    out = np.full(len(close), np.nan)
+    for s in range(len(patterns) - window + 1):
+        _, counts = np.unique(np.array(patterns[s:s + window]), axis=0, return_counts=True)
+        p = counts / window
+        out[window + span + s] = -(p * np.log(p)).sum() / math.log(math.factorial(order))
+    return out
+
+
+def naive_sample_entropy(x, m, r):
+    templates = len(x) - m
+    b = a = 0
+    for i in range(templates):
+        for j in range(i + 1, templates):
+            if max(abs(x[i + k] - x[j + k]) for k in range(m)) <= r:
+                b += 1
+                a += abs(x[i + m] - x[j + m]) <= r
+    return -math.log(a / b) if a and b else np.nan
+
+
+def standardized(close):
+    returns = np.log(close / close.shift(1)).dropna().to_numpy()
+    return (returns - returns.mean()) / returns.std()
+
+
+@pytest.mark.parametrize("order, delay", [(3, 1), (4, 2)])
+def test_permutation_entropy_matches_naive(order, delay):
+    close = random_close(300, order)
+    np.testing.assert_allclose(rolling_permutation_entropy(close, 40, order, delay),
+                               naive_permutation_entropy(close, 40, order, delay), atol=1e-12, equal_nan=True)
+
+
+def test_permutation_entropy_with_ties_and_default_window():
+    close = random_close(200, 3).round(0)   # many equal returns: ties rank by position
+    window = default_complexity_window(len(close) - 3)   # one return less per bar, two per pattern
+    np.testing.assert_allclose(rolling_permutation_entropy(close),
+                               naive_permutation_entropy(close, window), atol=1e-12, equal_nan=True)
+    # Ever-faster growth: returns only rise, so every window holds a single pattern
+    trend = pd.Series(np.exp(np.cumsum(np.linspace(0.001, 0.05, 80))))
+    assert np.nanmax(rolling_permutation_entropy(trend, 20)) == 0.0
+
+
+def test_sample_entropy_matches_naive():
+    x = standardized(random_close(150, 4))
+    assert sample_entropy(x, 2, 0.2) == pytest.approx(naive_sample_entropy(x, 2, 0.2))
+    assert sample_entropy(x, 3, 0.5) == pytest.approx(naive_sample_entropy(x, 3, 0.5))
+    assert np.isnan(sample_entropy(np.arange(10.0), 2, 0.1))
+
+
+def test_rolling_sample_entropy_matches_naive():
+    close = random_close(160, 5)
+    x = standardized(close)
+    window = 40
+    expected = np.full(len(close), np.nan)
+    for s in range(len(x) - window + 1):
+        expected[window + s] = naive_sample_entropy(x[s:s + window], 2, 0.2)
+    np.testing.assert_allclose(rolling_sample_entropy(close, window), expected, atol=1e-12, equal_nan=True)
+
+
+def test_multiscale_entropy_matches_naive():
+    close = random_close(400, 6)
+    x = standardized(close)
+    ours = multiscale_entropy(close, scales=range(1, 6), min_points=70)
+    for scale in range(1, 6):
+        usable = len(x) // scale
+        coarse = np.array([x[k * scale:(k + 1) * scale].mean() for k in range(usable)])
+        expected = naive_sample_entropy(coarse, 2, 0.2) if usable >= 70 else np.nan
+        np.testing.assert_allclose(ours[scale], expected, atol=1e-12, equal_nan=True)
+    assert ours.notna().sum() == 5
+    assert multiscale_entropy(close, scales=[10], min_points=50).isna().all()   # 39 coarse points
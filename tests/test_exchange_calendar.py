@@ -0,0 +1,100 @@
+import datetime
+import logging
+
+import pandas as pd
+import pytest
+
+import market_core.exchange_calendar as exchange_calendar
+from market_core.exchange_calendar import (SETTLE_MINUTES, ExchangeCalendar, data_expiry, easter, exchange_of,
+                                           get_calendar)
+
+
+def ts(text, tz):
+    return pd.Timestamp(text, tz=tz)
+
+
+@pytest.mark.parametrize("year, expected", [(2024, "2024-03-31"), (2025, "2025-04-20"), (2026, "2026-04-05"),
+                                            (2038, "2038-04-25")])
+def test_easter(year, expected):
+    assert easter(year) == datetime.date.fromisoformat(expected)
+
+
+@pytest.mark.parametrize("symbol, exchange", [
+    ("AAPL", "NYSE"), ("BRK.B", "NYSE"), ("bf.a", "NYSE"), ("RELIANCE.NS", "NSE"), ("500325.BO", "BSE"),
+    ("0700.HK", "HKEX"), ("VOD.L", "LSE"), ("SHOP.TO", "UTC"), ("7203.T", "UTC"), ("^NSEI", "NSE"),
+    ("^GSPC", "UTC"),
+])
+def test_exchange_of(symbol, exchange):
+    assert exchange_of(symbol) == exchange
+
+
+@pytest.mark.parametrize("exchange, day", [
+    ("NSE", "2026-03-03"),    # Holi, from the circular
+    ("NSE", "2026-01-26"),    # Republic Day, by rule
+    ("HKEX", "2026-02-18"),   # Lunar New Year
+    ("HKEX", "2026-12-28"),   # first weekday after Christmas
+    ("NYSE", "2026-11-26"),   # Thanksgiving
+    ("NYSE", "2026-07-03"),   # Independence Day observed
+    ("LSE", "2026-12-28"),    # Boxing Day substitute
+])
+def test_holidays_are_not_sessions(exchange, day):
+    calendar = get_calendar(exchange)
+    assert not calendar.is_session(day)
+    assert pd.Timestamp(day) not in calendar.sessions
+
+
+def test_announced_tables_cover_2026():
+    for exchange in exchange_calendar.ANNOUNCED_EVERY_YEAR:
+        assert any(day.startswith("2026-") for day in exchange_calendar.ANNOUNCED_HOLIDAYS[exchange])
+
+
+def test_warns_when_this_year_has_no_announced_table(monkeypatch, caplog):
+    monkeypatch.setitem(exchange_calendar.ANNOUNCED_HOLIDAYS, "NSE", ["2001-01-01"])
+    with caplog.at_level(logging.WARNING, logger="market_core.exchange_calendar"):
+        ExchangeCalendar("NSE", "Asia/Kolkata", datetime.time(9, 15), datetime.time(15, 30))
+    assert "No announced NSE holidays" in caplog.text
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="market_core.exchange_calendar"):
+        ExchangeCalendar("LSE", "Europe/London", datetime.time(8, 0), datetime.time(16, 30))
+    assert caplog.text == ""
+
+
+def test_early_close_and_dst():
+    nyse = get_calendar("NYSE")
+    # Day after Thanksgiving closes at 13:00 New York time
+    assert nyse.session_close("2026-11-27") == ts("2026-11-27 13:00", "America/New_York")
+    assert nyse.is_open(ts("2026-11-27 12:59", "America/New_York"))
+    assert not nyse.is_open(ts("2026-11-27 13:01", "America/New_York"))
+    # 09:30 local both sides of the March DST change
+    assert nyse.next_open(ts("2026-03-06 17:00", "America/New_York")) == ts("2026-03-09 09:30", "America/New_York")
+
+
+def test_session_date_and_last_close():
+    nse = get_calendar("NSE")
+    # A Saturday quote belongs to Friday's bar; the Holi morning quote to the session before
+    assert nse.session_date(ts("2026-03-07 11:00", "Asia/Kolkata")) == datetime.date(2026, 3, 6)
+    assert nse.session_date(ts("2026-03-03 11:00", "Asia/Kolkata")) == datetime.date(2026, 3, 2)
+    assert nse.last_close(ts("2026-03-03 11:00", "Asia/Kolkata")) == ts("2026-03-02 15:30", "Asia/Kolkata")
+    assert nse.next_open(ts("2026-03-02 16:00", "Asia/Kolkata")) == ts("2026-03-04 09:15", "Asia/Kolkata")
+
+
+def test_data_expiry_follows_the_session():
+    nse = get_calendar("NSE")
+    # While trading: the ttl, capped at the close
+    assert nse.data_expiry(ts("2026-03-04 10:00", "Asia/Kolkata"), ttl=600) == ts("2026-03-04 10:10", "Asia/Kolkata")
+    assert nse.data_expiry(ts("2026-03-04 15:25", "Asia/Kolkata"), ttl=600) == ts("2026-03-04 15:30", "Asia/Kolkata")
+    # Settling: until the final bars are due
+    settling = ts("2026-03-04 15:35", "Asia/Kolkata")
+    assert not nse.is_settled(settling)
+    assert nse.data_expiry(settling) == ts("2026-03-04 15:30", "Asia/Kolkata") + pd.Timedelta(minutes=SETTLE_MINUTES)
+    # Settled on Friday evening: valid over the weekend until Monday's open
+    friday = ts("2026-03-06 18:00", "Asia/Kolkata")
+    assert nse.is_settled(friday)
+    assert nse.data_expiry(friday, ttl=600) == ts("2026-03-09 09:15", "Asia/Kolkata")
+
+
+def test_mixed_symbols_expire_with_the_earliest_exchange():
+    at = ts("2026-03-06 18:00", "Asia/Kolkata")   # NSE settled, NYSE trading
+    expected = get_calendar("NYSE").data_expiry(at, ttl=600)
+    assert data_expiry(["RELIANCE.NS", "AAPL"], ttl=600, ts=at) == expected.timestamp()
+    assert data_expiry([], ts=at) is None
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_core.indicators import IndicatorState, compute_indicators, indicator_frame
+
+
+# ---- Reference implementations the engine replaced ----
+
+def ta_ema(series, periods):
+    # ta.utils._ema
+    return series.ewm(span=periods, min_periods=periods, adjust=False).mean()
+
+
+def ta_rsi(close, window=14):
+    # ta.momentum.RSIIndicator(close, window).rsi()
+    diff = close.diff(1)
+    up_direction = diff.where(diff > 0, 0.0)
+    down_direction = -diff.where(diff < 0, 0.0)
+    emaup = up_direction.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    emadn = down_direction.ewm(alpha=1 / window, min_periods=window, adjust=False).mean()
+    relative_strength = emaup / emadn
+    return pd.Series(np.where(emadn == 0, 100, 100 - (100 / (1 + relative_strength))), index=close.index)
+
+
+def stock_app_reference(close):
+    """stock_analysis_app.fetch_stock_data before the engine: rolling SMAs plus ``ta`` RSI and MACD."""
+    macd = ta_ema(close, 12) - ta_ema(close, 26)
+    return pd.DataFrame({
+        "SMA20": close.rolling(window=20).mean(),
+        "SMA50": close.rolling(window=50).mean(),
+        "RSI": ta_rsi(close, 14),
+        "MACD": macd,
+        "Signal": ta_ema(macd, 9),
+    })
+
+
+def math_app_reference(close):
+    """math_app's hand-rolled ``ewm`` RSI and MACD before the engine."""
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = -1 * delta.clip(upper=0)
+    avg_gain = gain.ewm(com=13, adjust=False).mean()
+    avg_loss = loss.ewm(com=13, adjust=False).mean()
+    rs = avg_gain / (avg_loss + 1e-10)
+    ema12 = close.ewm(span=12, adjust=False).mean()
+    ema26 = close.ewm(span=26, adjust=False).mean()
+    macd = ema12 - ema26
+    return pd.DataFrame({
+        "RSI": 100 - (100 / (1 + rs)),
+        "EMA12": ema12,
+        "EMA26": ema26,
+        "MACD": macd,
+        "Signal_Line": macd.ewm(span=9, adjust=False).mean(),
+    })
+
+
+def random_close(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.015, n))), index=pd.bdate_range("2015-01-01", periods=n))
+
+
+# ---- Batch engine ----
+
+@pytest.mark.parametrize("n", [10, 60, 1500])
+def test_warmup_matches_ta_and_rolling(n):
+    close = random_close(n, n)
+    ours = indicator_frame(close, rsi_window=14, sma_windows=(20, 50), warmup=True)
+    expected = stock_app_reference(close)
+    for column in expected.columns:
+        pd.testing.assert_series_equal(ours[column], expected[column], check_names=False, rtol=1e-9, atol=1e-9)
+
+
+def test_warmup_matches_installed_ta():
+    ta = pytest.importorskip("ta")
+    close = random_close(400, 3)
+    ours = indicator_frame(close, warmup=True, sma_windows=())
+    macd = ta.trend.MACD(close)
+    np.testing.assert_allclose(ours["RSI"], ta.momentum.RSIIndicator(close, window=14).rsi(), rtol=1e-9)
+    np.testing.assert_allclose(ours["MACD"], macd.macd(), rtol=1e-9)
+    np.testing.assert_allclose(ours["Signal"], macd.macd_signal(), rtol=1e-9)
+
+
+def test_plain_ewm_matches_math_app():
+    close = random_close(800, 5)
+    ours = indicator_frame(close, rsi_window=14, fast=12, slow=26, signal=9, sma_windows=())
+    expected = math_app_reference(close)
+    # The reference's +1e-10 guard against a zero loss moves RSI in the ~1e-8 range at most
+    np.testing.assert_allclose(ours["RSI"].iloc[1:], expected["RSI"].iloc[1:], rtol=1e-6)
+    for ours_column, column in [("EMA12", "EMA12"), ("EMA26", "EMA26"), ("MACD", "MACD"), ("Signal", "Signal_Line")]:
+        np.testing.assert_allclose(ours[ours_column], expected[column], rtol=1e-12, atol=1e-12)
+
+
+def test_batched_rows_match_single_series():
+    closes = np.vstack([random_close(300, seed).to_numpy() for seed in range(4)])
+    closes[1, :40] = np.nan  # a later listing
+    batched = compute_indicators(closes, warmup=True)
+    for row in range(len(closes)):
+        single = compute_indicators(closes[row], warmup=True)
+        for name, values in single.items():
+            np.testing.assert_allclose(batched[name][row], values, rtol=1e-12, equal_nan=True)
+
+
+def test_float32_close_to_float64():
+    close = random_close(500, 9).to_numpy()
+    wide = compute_indicators(close, warmup=True)
+    narrow = compute_indicators(close, warmup=True, dtype=np.float32)
+    for name, values in wide.items():
+        assert narrow[name].dtype == np.float32
+        np.testing.assert_allclose(narrow[name], values, rtol=1e-3, atol=1e-2, equal_nan=True)
+
+
+def test_flat_prices_give_rsi_100():
+    ours = compute_indicators(np.full(40, 50.0), warmup=True)
+    expected = ta_rsi(pd.Series(np.full(40, 50.0)))
+    np.testing.assert_allclose(ours["RSI"], expected, equal_nan=True)
+
+
+# ---- Incremental state ----
+
+def test_state_append_matches_batch_at_every_bar():
+    close = random_close(250, 11)
+    batch = indicator_frame(close, sma_windows=(20, 50), warmup=True)
+    batch["MACD_Avg"] = batch["MACD"].rolling(30, min_periods=1).mean()
+    state = IndicatorState(sma_windows=(20, 50), trend_lookback=30)
+    for i, price in enumerate(close):
+        values = state.append(price)
+        for column in batch.columns:
+            np.testing.assert_allclose(values[column], batch[column].iloc[i], rtol=1e-9, atol=1e-9,
+                                       equal_nan=True, err_msg=f"{column} at bar {i}")
+
+
+def test_state_update_revises_only_the_live_bar():
+    close = random_close(120, 13)
+    state = IndicatorState.from_closes(close.iloc[:-1])
+    for tick in (close.iloc[-1] * 0.98, close.iloc[-1] * 1.03, close.iloc[-1]):
+        live = state.update(tick)
+        revised = close.copy()
+        revised.iloc[-2] = tick
+        expected = indicator_frame(revised.iloc[:-1], warmup=True).iloc[-1]
+        for column in expected.index:
+            np.testing.assert_allclose(live[column], expected[column], rtol=1e-9, equal_nan=True)
+    # Repeated ticks on the same bar leave the committed state untouched
+    assert state.update(close.iloc[-1]) == state.latest()
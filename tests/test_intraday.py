@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fixture_provider import synthetic_intraday
+from market_core.intraday import RESAMPLE_MINUTES, IntradayBars
+
+OHLC = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+@pytest.fixture(params=[None, "Asia/Kolkata"])
+def bars(request):
+    frame = synthetic_intraday("RELIANCE.NS", days=10, minutes=5, end="2026-03-13")
+    # Distinct open/high/low so each aggregate is actually exercised
+    rng = np.random.default_rng(0)
+    frame["Open"] = frame["Close"] * (1 + rng.normal(0, 0.001, len(frame)))
+    frame["High"] = frame[["Open", "Close"]].max(axis=1) * (1 + rng.uniform(0, 0.002, len(frame)))
+    frame["Low"] = frame[["Open", "Close"]].min(axis=1) * (1 - rng.uniform(0, 0.002, len(frame)))
+    # The last session stops mid-bucket, as it does while the market is open
+    frame = frame.iloc[:-7]
+    if request.param:
+        frame.index = frame.index.tz_localize(request.param)
+    return frame[list(OHLC)]
+
+
+def reference(frame, minutes):
+    # Sessions open at 09:15, so pandas bins anchored there match session-anchored buckets
+    return frame.resample(f"{minutes}min", offset="9h15min").agg(OHLC).dropna(subset=["Close"])
+
+
+@pytest.mark.parametrize("interval", list(RESAMPLE_MINUTES))
+def test_resample_matches_pandas(bars, interval):
+    resampled = IntradayBars(bars).resample(interval).frame
+    expected = reference(bars, RESAMPLE_MINUTES[interval])
+    pd.testing.assert_frame_equal(resampled, expected, check_freq=False)
+
+
+def test_partial_last_bucket(bars):
+    hourly = IntradayBars(bars).resample("1h").frame
+    last_day = bars[bars.index.normalize() == bars.index[-1].normalize()]
+    tail = last_day[last_day.index >= hourly.index[-1]]
+    assert 0 < len(tail) < 12
+    assert hourly["Volume"].iloc[-1] == tail["Volume"].sum()
+    assert hourly["Close"].iloc[-1] == bars["Close"].iloc[-1]
+    assert hourly["High"].iloc[-1] == tail["High"].max()
+
+
+def test_resample_is_memoised_and_validated(bars):
+    intraday = IntradayBars(bars)
+    assert intraday.resample("15m") is intraday.resample("15m")
+    with pytest.raises(ValueError):
+        intraday.resample("2h")
+
+
+@pytest.mark.parametrize("sessions", [1, 3, 100])
+def test_session_mask_selects_the_last_trading_days(bars, sessions):
+    intraday = IntradayBars(bars)
+    days = bars.index.normalize().unique()
+    expected = bars[bars.index.normalize() >= days[-min(sessions, len(days))]]
+    pd.testing.assert_frame_equal(intraday.last_sessions(sessions), expected)
+    assert intraday.sessions == len(days)
+
+
+def test_empty_bars():
+    intraday = IntradayBars(pd.DataFrame(columns=list(OHLC), index=pd.DatetimeIndex([])))
+    assert intraday.sessions == 0
+    assert not intraday.session_mask(5).any()
+    assert intraday.resample("1h").frame.empty
@@ -0,0 +1,74 @@
+import threading
+
+from market_core import metrics
+from market_core.async_fetch import fetch_all, iter_fetch
+from nifty50_data import fetch_nifty50_data
+
+TICKERS = ["RELIANCE.NS", "TCS.NS", "INFY.NS", "HDFCBANK.NS"]
+
+
+def test_rerun_trace_counts_fetch_worker_calls(fixture_market):
+    metrics.begin_rerun("nifty")
+    try:
+        fetch_nifty50_data(TICKERS)
+    finally:
+        trace = metrics.end_rerun()
+    calls = sum(value for label, value in trace["counters"].items() if label.startswith("upstream_calls_total"))
+    assert calls >= len(TICKERS)
+    assert trace["phases"].get("upstream", 0) > 0
+    assert metrics.current_rerun() is None
+
+
+def test_rerun_trace_follows_helper_threads():
+    seen = []
+
+    def fetch(key):
+        seen.append(metrics.current_rerun())
+        metrics.increment("test_fetches_total")
+        return key
+
+    metrics.begin_rerun("page")
+    try:
+        fetch_all(range(3), fetch)
+        for _ in iter_fetch(range(3), fetch):
+            pass
+    finally:
+        trace = metrics.end_rerun()
+    assert seen and all(item is trace for item in seen)
+    assert trace["counters"]["test_fetches_total"] == 6
+
+
+def test_reruns_on_other_threads_are_separate():
+    metrics.begin_rerun("outer")
+    other = {}
+
+    def rerun():
+        other["before"] = metrics.current_rerun()
+        metrics.begin_rerun("inner")
+        other["trace"] = metrics.end_rerun()
+
+    thread = threading.Thread(target=rerun)
+    thread.start()
+    thread.join()
+    trace = metrics.end_rerun()
+    assert other["before"] is None
+    assert other["trace"]["page"] == "inner" and trace["page"] == "outer"
+
+
+def test_metrics_server_binds_localhost_by_default(monkeypatch):
+    bound = {}
+
+    class FakeServer:
+        def __init__(self, address, handler):
+            bound["address"] = address
+
+        def serve_forever(self):
+            pass
+
+    monkeypatch.setattr(metrics, "ThreadingHTTPServer", FakeServer)
+    monkeypatch.setattr(metrics, "_server", None)
+    metrics.start_metrics_server(9999)
+    assert bound["address"] == ("127.0.0.1", 9999)
+    monkeypatch.setattr(metrics, "_server", None)
+    metrics.start_metrics_server(9999, host="0.0.0.0")
+    assert bound["address"] == ("0.0.0.0", 9999)
@@ -0,0 +1,59 @@
+import pandas as pd
+
+import nifty50_data
+from nifty50_data import COLUMNS, NUMERIC_COLUMNS, combine_batches, stream_nifty50_data
+from screener_index import ScreenerIndex
+
+TICKERS = ["RELIANCE.NS", "TCS.NS", "INFY.NS", "BAD.NS", "HDFCBANK.NS"]
+
+
+def test_failed_ticker_keeps_numeric_columns(fixture_market, monkeypatch):
+    info = fixture_market.info
+
+    def failing_info(symbol):
+        if symbol == "BAD.NS":
+            raise LookupError("no such symbol")
+        return info(symbol)
+
+    monkeypatch.setattr(fixture_market, "info", failing_info)
+    # One ticker per batch, so the failed ticker's batch is all None in every column
+    monkeypatch.setattr(nifty50_data, "MAX_WORKERS", 1)
+    batches = list(stream_nifty50_data(TICKERS, max_workers=1))
+    df = combine_batches(TICKERS, batches)
+
+    assert list(df.index) == TICKERS
+    for column in NUMERIC_COLUMNS:
+        assert pd.api.types.is_float_dtype(df[column]), column
+    assert df.loc["BAD.NS", NUMERIC_COLUMNS].isna().all()
+    assert df.attrs["fetch_status"]["BAD.NS"].startswith("error")
+
+    # The screener sorts numerically, with the failed row last
+    order = ScreenerIndex(df).query("P/B Ratio", True, "", None, page=1, page_size=len(TICKERS))[0]
+    assert order.index[-1] == "BAD.NS"
+    assert order["P/B Ratio"].iloc[:-1].is_monotonic_increasing
+
+
+def test_all_failed_batch_then_snapshot_stays_numeric():
+    failed = nifty50_data._rows_frame(["BAD.NS"], {}, {"BAD.NS": "boom"})[0]
+    good = nifty50_data._rows_frame(["RELIANCE.NS"], {"RELIANCE.NS": {"currentPrice": 10.0, "bookValue": 5.0}}, {})[0]
+    df = combine_batches(["RELIANCE.NS", "BAD.NS"], [(failed, {"BAD.NS": "error: boom"}, False),
+                                                     (good, {"RELIANCE.NS": "ok"}, False)])
+    assert df["P/B Ratio"].dtype == float
+    assert df.loc["RELIANCE.NS", "P/B Ratio"] == 2.0
+    assert list(df.columns[:len(COLUMNS)]) == COLUMNS
+
+
+def test_uncovered_tickers_are_pending():
+    good = nifty50_data._rows_frame(["RELIANCE.NS"], {"RELIANCE.NS": {"currentPrice": 10.0, "bookValue": 5.0}}, {})[0]
+    df = combine_batches(["RELIANCE.NS", "TCS.NS"], [(good, {"RELIANCE.NS": "ok"}, False)])
+    assert df.attrs["fetch_status"] == {"RELIANCE.NS": "ok", "TCS.NS": "pending"}
+    assert df.loc["TCS.NS", NUMERIC_COLUMNS].isna().all()
+    assert combine_batches(["TCS.NS"], []).attrs["fetch_status"] == {"TCS.NS": "pending"}
+
+
+def test_rate_limiter_is_shared_across_calls(fixture_market):
+    first = nifty50_data._shared_limiter(nifty50_data.REQUESTS_PER_SECOND)
+    nifty50_data.load_fundamentals(TICKERS[:2])
+    list(stream_nifty50_data(TICKERS[2:3], refresh=True))
+    assert nifty50_data._shared_limiter(nifty50_data.REQUESTS_PER_SECOND) is first
+    assert list(nifty50_data._limiters) == [nifty50_data.REQUESTS_PER_SECOND]
@@ -0,0 +1,187 @@
+import os
+
+import pandas as pd
+import pytest
+
+import market_core.ohlcv_store as ohlcv_store
+from fixture_provider import synthetic_daily
+from market_core.ohlcv_store import BACKFILL_PAD, OHLCVStore, period_start
+
+
+class Upstream:
+    """Synthetic daily bars with a settable last bar, recording every call."""
+
+    def __init__(self):
+        self.calls = []
+        self.end = None
+        self.failing = False
+
+    def frame(self, symbol, start):
+        frame = synthetic_daily(symbol)
+        if self.end is not None:
+            frame = frame[frame.index <= self.end]
+        if start is None:
+            return frame
+        return frame[frame.index >= (start.tz_convert("UTC").tz_localize(None) if start.tz else start)]
+
+    def fetch(self, symbol, interval, start=None):
+        self.calls.append(("one", symbol, start))
+        return self.frame(symbol, start)
+
+    def fetch_many(self, symbols, interval, start=None):
+        self.calls.append(("many", tuple(symbols), start))
+        if self.failing:
+            raise ConnectionError("upstream down")
+        return {symbol: self.frame(symbol, start) for symbol in symbols}
+
+
+class Calendar:
+    settled = True
+
+    def is_settled(self):
+        return self.settled
+
+    def last_settled(self):
+        return pd.Timestamp.now(tz="UTC") - pd.Timedelta(hours=1)
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    upstream, calendar = Upstream(), Calendar()
+    monkeypatch.setattr(ohlcv_store, "calendar_for", lambda symbol: calendar)
+    store = OHLCVStore(str(tmp_path), fetcher=upstream.fetch, batch_fetcher=upstream.fetch_many,
+                       min_refresh_seconds=0)
+    return store, upstream, calendar
+
+
+def age(store, symbol, seconds, interval="1d"):
+    frame, meta = store.load(symbol, interval)
+    meta["updated_at"] -= seconds
+    store._save(symbol, interval, frame, meta)
+
+
+def test_period_start():
+    now = pd.Timestamp("2026-03-15 10:00", tz="UTC")
+    assert period_start("max", now) is None
+    assert period_start("ytd", now) == pd.Timestamp("2026-01-01", tz="UTC")
+    assert period_start("3mo", now) == pd.Timestamp("2025-12-15 10:00", tz="UTC")
+    assert period_start("2wk", now) == pd.Timestamp("2026-03-01 10:00", tz="UTC")
+    with pytest.raises(ValueError):
+        period_start("3q", now)
+
+
+def test_backfill_then_served_from_disk(setup):
+    store, upstream, _ = setup
+    frame = store.history("RELIANCE.NS", period="1y")
+    assert len(upstream.calls) == 1
+    _, _, start = upstream.calls[0]
+    assert pd.Timestamp.now(tz="UTC") - pd.DateOffset(years=1) - start < BACKFILL_PAD + pd.Timedelta(minutes=1)
+    expected = synthetic_daily("RELIANCE.NS")
+    expected = expected[expected.index >= frame.index[0]]
+    pd.testing.assert_frame_equal(frame, expected, check_freq=False)
+
+    # Settled since the last sync: shorter periods come from disk
+    assert len(store.history("RELIANCE.NS", period="3mo")) < len(frame)
+    assert len(upstream.calls) == 1
+    # A longer period backfills once, and "max" marks the file complete
+    store.history("RELIANCE.NS", period="max")
+    assert upstream.calls[-1][2] is None and store.load("RELIANCE.NS")[1]["covers_from"] == "max"
+    store.history("RELIANCE.NS", period="5y")
+    assert len(upstream.calls) == 2
+
+
+def test_trading_session_fetches_from_the_last_bar(setup):
+    store, upstream, calendar = setup
+    upstream.end = synthetic_daily("TCS.NS").index[-5]
+    store.history("TCS.NS", period="6mo")
+    calendar.settled = False
+    upstream.end = None
+    frame = store.history("TCS.NS", period="6mo")
+    assert upstream.calls[-1][2] == pd.Timestamp(store.load("TCS.NS")[0].index[-5])
+    assert frame.index[-1] == synthetic_daily("TCS.NS").index[-1]
+    assert frame.index.is_unique and frame.index.is_monotonic_increasing
+
+
+def test_revised_last_bar_keeps_newest_copy(setup):
+    store, upstream, calendar = setup
+    store.history("INFY.NS", period="1mo")
+    stored, meta = store.load("INFY.NS")
+    stored.iloc[-1, stored.columns.get_loc("Close")] = -1.0   # a partial bar from mid-session
+    store._save("INFY.NS", "1d", stored, meta)
+    calendar.settled = False
+    frame = store.history("INFY.NS", period="1mo")
+    assert frame["Close"].iloc[-1] == synthetic_daily("INFY.NS")["Close"].iloc[-1]
+
+
+def test_min_refresh_throttles_upstream(tmp_path, monkeypatch):
+    upstream, calendar = Upstream(), Calendar()
+    calendar.settled = False
+    monkeypatch.setattr(ohlcv_store, "calendar_for", lambda symbol: calendar)
+    store = OHLCVStore(str(tmp_path), fetcher=upstream.fetch, min_refresh_seconds=60)
+    store.history("AAPL", period="1mo")
+    store.history("AAPL", period="1mo")
+    assert len(upstream.calls) == 1
+    age(store, "AAPL", 120)
+    store.history("AAPL", period="1mo")
+    assert len(upstream.calls) == 2
+
+
+def test_sync_many_batches_and_survives_failures(setup, monkeypatch):
+    store, upstream, calendar = setup
+    monkeypatch.setattr(ohlcv_store, "BATCH_SIZE", 2)
+    symbols = ["A.NS", "B.NS", "C.NS"]
+    frames = store.history_many(symbols, period="1y")
+    # One backfill start shared by all three, split into batches of two
+    assert sorted(len(call[1]) for call in upstream.calls) == [1, 2]
+    assert all(len(frames[s]) > 200 for s in symbols)
+
+    calendar.settled = False
+    upstream.failing = True
+    calls = len(upstream.calls)
+    again = store.history_many(symbols, period="1y")
+    assert len(upstream.calls) > calls
+    for symbol in symbols:
+        pd.testing.assert_frame_equal(again[symbol], frames[symbol], check_freq=False)
+    assert sorted(os.listdir(os.path.join(store.root, "1d"))) == sorted(
+        f"{s}.{ext}" for s in symbols for ext in ("json", "parquet"))
+
+
+def test_empty_refresh_still_counts_as_a_refresh(tmp_path, monkeypatch):
+    upstream, calendar = Upstream(), Calendar()
+    calendar.settled = False
+    monkeypatch.setattr(ohlcv_store, "calendar_for", lambda symbol: calendar)
+    store = OHLCVStore(str(tmp_path), fetcher=upstream.fetch, min_refresh_seconds=60)
+    store.history("AAPL", period="1mo")
+    covers_from = store.load("AAPL")[1]["covers_from"]
+    age(store, "AAPL", 120)
+
+    # Nothing new upstream: the stamp moves on, coverage stays
+    upstream.end = store.load("AAPL")[0].index[0] - pd.Timedelta(days=1)
+    store.history("AAPL", period="1mo")
+    assert len(upstream.calls) == 2
+    meta = store.load("AAPL")[1]
+    assert meta["covers_from"] == covers_from and meta["updated_at"] > pd.Timestamp.now().timestamp() - 5
+    store.history("AAPL", period="1mo")
+    assert len(upstream.calls) == 2
+
+
+def test_sync_many_dedupes_symbols(setup):
+    store, upstream, _ = setup
+    frames = store.history_many(["A.NS", "B.NS", "A.NS"], period="1y")
+    assert upstream.calls == [("many", ("A.NS", "B.NS"), upstream.calls[0][2])]
+    assert set(frames) == {"A.NS", "B.NS"}
+
+
+def test_sync_many_keeps_a_concurrent_backfill(setup):
+    store, upstream, _ = setup
+
+    def fetch_many(symbols, interval, start=None):
+        # Another session backfills the full history while this batch is in flight
+        store.history("A.NS", period="max")
+        return upstream.fetch_many(symbols, interval, start)
+
+    store.batch_fetcher = fetch_many
+    store.history_many(["A.NS"], period="1y")
+    frame, meta = store.load("A.NS")
+    assert meta["covers_from"] == "max"
+    pd.testing.assert_frame_equal(frame, synthetic_daily("A.NS"), check_freq=False)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from optimizer import (max_sharpe, mean_variance, min_variance, monte_carlo_frontier, optimal_weights,
+                       portfolio_point, return_stats)
+from portfolio_engine import TRADING_DAYS
+
+
+@pytest.fixture
+def market():
+    # Four assets with positive premia and moderate correlation: every optimum is interior
+    mu = np.array([0.08, 0.10, 0.12, 0.09])
+    vol = np.array([0.15, 0.20, 0.25, 0.18])
+    corr = np.full((4, 4), 0.3) + 0.7 * np.eye(4)
+    return mu, corr * np.outer(vol, vol)
+
+
+def test_return_stats_match_pandas():
+    rng = np.random.default_rng(0)
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (300, 3)), axis=0)), columns=list("ABC"))
+    mu, cov = return_stats(prices)
+    returns = prices.pct_change().dropna()
+    np.testing.assert_allclose(mu, returns.mean() * TRADING_DAYS)
+    np.testing.assert_allclose(cov, returns.cov() * TRADING_DAYS)
+
+
+def test_min_variance_matches_closed_form(market):
+    _, cov = market
+    inv = np.linalg.solve(cov, np.ones(len(cov)))
+    weights, expected = min_variance(cov), inv / inv.sum()
+    # The objective is flat at the optimum: weights agree to ~1e-6, the variance much more closely
+    np.testing.assert_allclose(weights, expected, atol=1e-5)
+    assert weights @ cov @ weights == pytest.approx(expected @ cov @ expected, rel=1e-9)
+
+
+def test_max_sharpe_matches_tangency_portfolio(market):
+    mu, cov = market
+    tangency = np.linalg.solve(cov, mu - 0.02)
+    np.testing.assert_allclose(max_sharpe(mu, cov, risk_free=0.02), tangency / tangency.sum(), atol=1e-5)
+
+
+def test_mean_variance_matches_kkt_solution(market):
+    mu, cov = market
+    gamma = 4.0
+    # w = C^-1 (mu - lambda 1) / gamma with lambda set by sum(w) = 1
+    a, b = np.linalg.solve(cov, mu), np.linalg.solve(cov, np.ones(len(mu)))
+    lam = (a.sum() - gamma) / b.sum()
+    np.testing.assert_allclose(mean_variance(mu, cov, risk_aversion=gamma), (a - lam * b) / gamma, atol=1e-5)
+
+
+def test_long_only_and_capped(market):
+    mu, cov = market
+    mu = mu.copy()
+    mu[0] = -0.20   # nobody should hold a strongly losing asset when maximising Sharpe
+    for weights in (max_sharpe(mu, cov), mean_variance(mu, cov), min_variance(cov, max_weight=0.3)):
+        assert weights.min() >= 0 and weights.sum() == pytest.approx(1.0)
+    assert max_sharpe(mu, cov)[0] == pytest.approx(0.0, abs=1e-6)
+    assert min_variance(cov, max_weight=0.3).max() <= 0.3 + 1e-9
+    np.testing.assert_allclose(optimal_weights("Equal Weight", mu, cov), np.full(4, 0.25))
+
+
+def test_frontier_is_dominated_by_the_optimisers(market):
+    mu, cov = market
+    frontier = monte_carlo_frontier(mu, cov, samples=20_000, risk_free=0.02, seed=1)
+    best = max_sharpe(mu, cov, risk_free=0.02)
+    assert portfolio_point(best, mu, cov, 0.02)[2] >= frontier["sharpe"].max() - 1e-9
+    assert portfolio_point(min_variance(cov), mu, cov)[1] <= frontier["volatility"].min() + 1e-9
+
+
+def test_frontier_chunking_keeps_the_best_samples(market):
+    mu, cov = market
+    frontier = monte_carlo_frontier(mu, cov, samples=5_003, risk_free=0.01, seed=2, chunk=997)
+    assert len(frontier["returns"]) == 5_003
+    for weights, key, pick in [(frontier["best_sharpe_weights"], "sharpe", np.max),
+                               (frontier["min_volatility_weights"], "volatility", np.min)]:
+        ret, vol, sharpe = portfolio_point(weights, mu, cov, 0.01)
+        assert {"sharpe": sharpe, "volatility": vol}[key] == pytest.approx(pick(frontier[key]))
+    # Every sample is a valid long-only point: returns lie within the assets' range
+    assert mu.min() - 1e-12 <= frontier["returns"].min() and frontier["returns"].max() <= mu.max() + 1e-12
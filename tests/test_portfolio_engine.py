@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio_engine import (TRADING_DAYS, common_window, normalize_weights, parse_weights, portfolio_metrics,
+                              portfolio_values)
+
+
+@pytest.fixture
+def prices():
+    index = pd.bdate_range("2024-01-01", periods=5)
+    return pd.DataFrame({"A": [100.0, 110.0, 120.0, 90.0, 150.0],
+                         "B": [50.0, 50.0, 25.0, 75.0, 100.0]}, index=index)
+
+
+def test_buy_and_hold_matches_share_counts(prices):
+    weights = np.array([0.25, 0.75])
+    values = portfolio_values(prices, weights, investment_amount=1000.0)
+
+    # Shares bought on day one are held, so the value is a fixed share count times each price
+    shares = weights * 1000.0 / prices.iloc[0]
+    pd.testing.assert_series_equal(values, (prices * shares).sum(axis=1), check_names=False)
+    assert values.iloc[0] == pytest.approx(1000.0)
+
+
+def test_stacked_weights_value_each_portfolio(prices):
+    stack = np.array([[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]])
+    values = portfolio_values(prices, stack)
+    assert values.shape == (len(prices), 3)
+    for k, weights in enumerate(stack):
+        np.testing.assert_allclose(values[k], portfolio_values(prices, weights))
+
+
+def test_metrics(prices):
+    weights = np.array([0.5, 0.5])
+    metrics = portfolio_metrics(portfolio_values(prices, weights, 200.0), weights)
+
+    assert metrics["initial_value"] == pytest.approx(200.0)
+    assert metrics["current_value"] == pytest.approx(150.0 + 200.0)
+    assert metrics["total_return_pct"] == pytest.approx(75.0)
+    assert metrics["volatility"] == pytest.approx(metrics["daily_returns"].std() * np.sqrt(TRADING_DAYS))
+    assert metrics["hhi"] == pytest.approx(0.5)
+
+
+def test_common_window_starts_once_every_ticker_has_a_price(prices):
+    gappy = prices.copy()
+    gappy.iloc[:2, 1] = np.nan     # B lists on day three
+    gappy.iloc[3, 0] = np.nan      # A misses a quote later on
+    window = common_window(gappy)
+
+    assert window.index[0] == prices.index[2]
+    assert window.notna().all().all()
+    assert window.iloc[1, 0] == prices.iloc[2, 0]    # carried forward
+    assert common_window(gappy.assign(B=np.nan)).empty
+
+
+def test_weights_parsing_and_normalization():
+    assert parse_weights("", 2) is None
+    assert parse_weights("1, x", 2) is None
+    assert parse_weights("1, 2, 3", 2) is None
+    assert parse_weights("1, -1", 2) is None
+    np.testing.assert_allclose(parse_weights("1, 3", 2), [1.0, 3.0])
+    np.testing.assert_allclose(normalize_weights(np.array([1.0, 3.0]), 2), [0.25, 0.75])
+    np.testing.assert_allclose(normalize_weights(None, 4), [0.25] * 4)
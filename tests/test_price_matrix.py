@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_core.price_matrix import align_prices, load_price_matrix
+
+
+def frame(dates, closes):
+    return pd.DataFrame({"Close": closes}, index=pd.DatetimeIndex(dates))
+
+
+@pytest.fixture
+def frames():
+    # Different exchange calendars: B skips the 3rd, C lists on the 3rd, D has nothing
+    return {
+        "A": frame(["2024-01-02", "2024-01-03", "2024-01-04"], [1.0, 2.0, 3.0]),
+        "B": frame(["2024-01-02", "2024-01-04"], [10.0, 30.0]),
+        "C": frame(["2024-01-03", "2024-01-04"], [200.0, 300.0]),
+        "D": pd.DataFrame(),
+    }
+
+
+def test_ffill_carries_prices_but_not_before_a_listing(frames):
+    matrix, missing = align_prices(frames)
+    assert missing == ["D"] and list(matrix.columns) == ["A", "B", "C"]
+    assert matrix.loc["2024-01-03", "B"] == 10.0
+    assert np.isnan(matrix.loc["2024-01-02", "C"])
+
+
+def test_drop_and_keep(frames):
+    dropped, _ = align_prices(frames, missing="drop")
+    assert list(dropped.index) == [pd.Timestamp("2024-01-04")]
+    kept, _ = align_prices(frames, missing="keep")
+    assert kept.isna().sum().to_dict() == {"A": 0, "B": 1, "C": 1}
+    with pytest.raises(ValueError):
+        align_prices(frames, missing="zero")
+
+
+def test_all_missing():
+    matrix, missing = align_prices({"X": pd.DataFrame(), "Y": frame(["2024-01-02"], [np.nan])})
+    assert matrix.empty and missing == ["X", "Y"]
+
+
+def test_load_price_matrix_matches_per_symbol_history(fixture_market):
+    matrix, missing = load_price_matrix(["RELIANCE.NS", "TCS.NS"], period="6mo")
+    assert missing == []
+    for symbol in matrix.columns:
+        expected = fixture_market.history(symbol)["Close"]
+        pd.testing.assert_series_equal(matrix[symbol], expected.loc[matrix.index], check_names=False,
+                                       check_freq=False)
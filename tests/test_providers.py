@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from fixture_provider import FixtureProvider
+from market_core.providers import RecordingProvider, ReplayMissError, ReplayProvider
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    return RecordingProvider(str(tmp_path), inner=FixtureProvider())
+
+
+@pytest.fixture
+def replay(tmp_path):
+    return ReplayProvider(str(tmp_path))
+
+
+def test_full_history_round_trip(recorder, replay):
+    recorded = recorder.history("AAA.NS")
+    pd.testing.assert_frame_equal(replay.history("AAA.NS"), recorded, check_freq=False)
+
+    start = recorded.index[-50]
+    pd.testing.assert_frame_equal(replay.history("AAA.NS", start=start), recorded.iloc[-50:],
+                                  check_freq=False)
+
+
+def test_history_many_round_trip(recorder, replay):
+    start = pd.Timestamp("2020-01-01")
+    recorded = recorder.history_many(["AAA.NS", "BBB.NS"], start=start)
+    for symbol, frame in recorded.items():
+        pd.testing.assert_frame_equal(replay.history(symbol, start=start), frame, check_freq=False)
+
+
+def test_request_older_than_recording_misses(recorder, replay):
+    recorder.history("AAA.NS", start=pd.Timestamp("2020-01-01"))
+
+    assert not replay.history("AAA.NS", start=pd.Timestamp("2021-01-01", tz="UTC")).empty
+    with pytest.raises(ReplayMissError):
+        replay.history("AAA.NS", start=pd.Timestamp("2019-01-01"))
+    with pytest.raises(ReplayMissError):
+        replay.history("AAA.NS")
+
+
+def test_coverage_widens_with_older_requests(recorder, replay):
+    recorder.history("AAA.NS", start=pd.Timestamp("2020-01-01"))
+    recorder.history("AAA.NS", start=pd.Timestamp("2018-01-01"))
+    assert replay.history("AAA.NS", start=pd.Timestamp("2018-01-01")).index[0] >= pd.Timestamp("2018-01-01")
+
+    recorder.history("AAA.NS")
+    recorder.history("AAA.NS", start=pd.Timestamp("2022-01-01"))
+    pd.testing.assert_frame_equal(replay.history("AAA.NS"), FixtureProvider().history("AAA.NS"),
+                                  check_freq=False)
+
+
+def test_unrecorded_requests_miss(replay):
+    with pytest.raises(ReplayMissError):
+        replay.history("AAA.NS")
+    with pytest.raises(ReplayMissError):
+        replay.info("AAA.NS")
+    assert replay.major_holders("AAA.NS").empty
+
+
+def test_info_and_holders_round_trip(recorder, replay):
+    info = recorder.info("AAA.NS")
+    holders = recorder.major_holders("AAA.NS")
+
+    assert replay.info("AAA.NS") == info
+    pd.testing.assert_frame_equal(replay.major_holders("AAA.NS"), holders)
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+import market_core.render as render
+from market_core.render import ImageCache, data_fingerprint, render_figure
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ImageCache()
+    monkeypatch.setattr(render, "image_cache", cache)
+    return cache
+
+
+def test_evicts_least_recently_used_by_total_bytes():
+    cache = ImageCache(max_bytes=100)
+    cache.put("a", b"x" * 40)
+    cache.put("b", b"x" * 40)
+    cache.get("a")                  # "b" is now the oldest
+    cache.put("c", b"x" * 40)
+
+    assert list(cache._images) == ["a", "c"] and cache._size == 80
+    # Replacing an entry counts only its new size
+    cache.put("a", b"x" * 10)
+    assert cache._size == 50
+    # An image bigger than the whole budget still stays, alone
+    cache.put("d", b"x" * 500)
+    assert list(cache._images) == ["d"] and cache._size == 500
+
+
+def test_hit_skips_the_draw(cache):
+    calls = []
+
+    def draw(fig):
+        calls.append(fig)
+        fig.add_subplot().plot([1, 2, 3])
+
+    first = render_figure(("RELIANCE.NS", "1y", "line"), draw, figsize=(2, 2), dpi=50)
+    second = render_figure(("RELIANCE.NS", "1y", "line"), draw, figsize=(2, 2), dpi=50)
+    assert first.startswith(b"\x89PNG") and second is first
+    assert len(calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+
+    # Format and dpi are part of the key
+    render_figure(("RELIANCE.NS", "1y", "line"), draw, figsize=(2, 2), dpi=60)
+    assert len(calls) == 2
+
+
+def test_failed_draw_caches_nothing(cache):
+    def draw(fig):
+        raise RuntimeError("bad data")
+
+    with pytest.raises(RuntimeError):
+        render_figure(("X",), draw)
+    assert cache._images == {}
+
+
+def test_fingerprint_tracks_values_index_and_columns():
+    frame = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.date_range("2024-01-01", periods=2))
+    assert data_fingerprint(frame) == data_fingerprint(frame.copy())
+    assert data_fingerprint(frame) != data_fingerprint(frame.assign(Close=[1.0, 2.5]))
+    assert data_fingerprint(frame) != data_fingerprint(frame.shift(freq="D"))
+    assert data_fingerprint(frame) != data_fingerprint(frame.rename(columns={"Close": "Open"}))
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from screener import evaluate_signals, run_screen, screen_chunk
+
+
+def test_screen_chunk_rows(fixture_market):
+    rows = screen_chunk(["RELIANCE.NS", "TCS.NS"], "1y")
+    assert [row["Symbol"] for row in rows] == ["RELIANCE.NS", "TCS.NS"]
+    for row in rows:
+        assert row["Status"] == "ok"
+        # One batched fetch per chunk: every row carries the same per-symbol average
+        assert row["Chunk Fetch Seconds / Symbol"] == rows[0]["Chunk Fetch Seconds / Symbol"]
+        assert row["Compute Seconds"] >= 0
+        assert row["RSI State"] and row["MACD State"]
+
+
+def test_failed_fetch_marks_every_row(fixture_market, monkeypatch):
+    def boom(symbols, interval="1d", start=None):
+        raise ConnectionError("upstream down")
+
+    monkeypatch.setattr(fixture_market, "history_many", boom)
+    monkeypatch.setattr(fixture_market, "history", lambda *args, **kwargs: boom(None))
+    rows = screen_chunk(["AAPL", "MSFT"], "1y")
+    assert all(row["Status"].startswith("error") for row in rows)
+
+
+def test_crossover_on_the_latest_bar():
+    # A long decline then a sharp rally turns MACD up through its signal line at some bar
+    close = pd.Series(np.r_[np.linspace(200, 100, 120), np.linspace(100, 140, 15)],
+                      index=pd.bdate_range("2024-01-01", periods=135))
+    crossed = [evaluate_signals(close.iloc[:end])["MACD Crossover"] for end in range(121, 136)]
+    assert sum(crossed) == 1
+
+
+def test_empty_universe_screens_to_an_empty_frame():
+    results = run_screen(["", "  "])
+    assert results.empty and results.index.name == "Symbol"
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener_index import ScreenerIndex
+
+
+@pytest.fixture
+def index():
+    df = pd.DataFrame({
+        "Company Name": ["Reliance Industries", "Tata Consultancy", None, "infosys", "HDFC Bank"],
+        "P/E Ratio": [25.0, 30.0, np.nan, 22.0, 18.0],
+        "ROE (%)": [9.0, 45.0, 12.0, np.nan, 16.0],
+    }, index=pd.Index(["RELIANCE.NS", "TCS.NS", "BAD.NS", "INFY.NS", "HDFCBANK.NS"], name="Ticker"))
+    return ScreenerIndex(df)
+
+
+def tickers(frame):
+    return list(frame.index)
+
+
+def test_numeric_sort_keeps_missing_last(index):
+    ascending = tickers(index.query("P/E Ratio", True, page_size=10)[0])
+    descending = tickers(index.query("P/E Ratio", False, page_size=10)[0])
+    assert ascending == ["HDFCBANK.NS", "INFY.NS", "RELIANCE.NS", "TCS.NS", "BAD.NS"]
+    assert descending == ["TCS.NS", "RELIANCE.NS", "INFY.NS", "HDFCBANK.NS", "BAD.NS"]
+
+
+def test_text_sort_is_case_insensitive_with_missing_last(index):
+    names = index.query("Company Name", True, page_size=10)[0]["Company Name"]
+    assert list(names[:-1]) == sorted(names[:-1], key=str.lower) and pd.isna(names.iloc[-1])
+    descending = index.query("Company Name", False, page_size=10)[0]["Company Name"]
+    assert list(descending[:-1]) == list(names[:-1])[::-1] and pd.isna(descending.iloc[-1])
+
+
+def test_unsorted_keeps_snapshot_order(index):
+    assert tickers(index.query(page_size=10)[0]) == list(index.frame.index)
+
+
+def test_search_matches_ticker_or_company(index):
+    assert tickers(index.query(search="tata")[0]) == ["TCS.NS"]
+    assert tickers(index.query(search=" INFY ")[0]) == ["INFY.NS"]
+    assert set(tickers(index.query(search=".ns", page_size=10)[0])) == set(index.frame.index)
+    assert index.query(search="none")[1] == 0
+
+
+def test_ranges_exclude_missing_values(index):
+    frame, rows, _ = index.query("ROE (%)", True, ranges={"ROE (%)": (10, None)}, page_size=10)
+    assert tickers(frame) == ["BAD.NS", "HDFCBANK.NS", "TCS.NS"] and rows == 3
+    frame, _, _ = index.query(ranges={"P/E Ratio": (20, 26), "ROE (%)": (None, 10)})
+    assert tickers(frame) == ["RELIANCE.NS"]
+
+
+def test_pages_are_clamped(index):
+    frame, rows, pages = index.query("P/E Ratio", True, page=2, page_size=2)
+    assert (tickers(frame), rows, pages) == (["RELIANCE.NS", "TCS.NS"], 5, 3)
+    assert tickers(index.query("P/E Ratio", True, page=9, page_size=2)[0]) == ["BAD.NS"]
+    assert tickers(index.query("P/E Ratio", True, page=0, page_size=2)[0]) == ["HDFCBANK.NS", "INFY.NS"]
+    assert index.query(search="nothing", page=3)[1:] == (0, 1)
@@ -0,0 +1,62 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from market_core.shared_frames import SharedFrameStore
+
+
+def frame(n, seed=0, tz=None):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=n, freq="D", tz=tz, name="Date")
+    return pd.DataFrame({"Close": rng.random(n), "Volume": rng.integers(0, 1000, n)}, index=index)
+
+
+def arrow_files(root):
+    return sorted(name for name in os.listdir(root) if name.endswith(".arrow"))
+
+
+def test_round_trip_and_copy_on_write(tmp_path):
+    store = SharedFrameStore(str(tmp_path))
+    original = frame(50, tz="Asia/Kolkata")
+    shared = store.share("RELIANCE.NS|1d", original)
+    pd.testing.assert_frame_equal(shared, original, check_freq=False)
+
+    # Copy-on-write: writing into a caller's copy leaves the mapped data alone
+    mine = shared.copy(deep=False)
+    mine.iloc[0, 0] = -1.0
+    mine["Extra"] = 1.0
+    assert store.share("RELIANCE.NS|1d", original).iloc[0, 0] == original.iloc[0, 0]
+
+
+def test_new_version_replaces_the_old_file(tmp_path):
+    store = SharedFrameStore(str(tmp_path))
+    store.share("TCS.NS|1d", frame(50))
+    store.share("TCS.NS|1d", frame(51))
+    assert len(arrow_files(tmp_path)) == 1
+
+
+def test_unshareable_frames_pass_through(tmp_path):
+    store = SharedFrameStore(str(tmp_path))
+    text = frame(5).assign(Name="x")
+    assert store.share("text", text) is text
+    assert not os.path.exists(tmp_path) or arrow_files(tmp_path) == []
+
+
+def test_directory_is_capped_least_recently_shared_first(tmp_path):
+    one = frame(1000)
+    store = SharedFrameStore(str(tmp_path))
+    store.share("A", one)
+    size = os.path.getsize(os.path.join(tmp_path, arrow_files(tmp_path)[0]))
+    store.max_bytes = int(size * 2.5)
+
+    store.share("B", frame(1000, 1))
+    past = time.time() - 60
+    for name in arrow_files(tmp_path):
+        os.utime(os.path.join(tmp_path, name), (past, past))
+    store.share("A", one)                  # A is used again, so B is now the oldest
+    store.share("C", frame(1000, 2))       # over the cap: B goes
+    names = " ".join(arrow_files(tmp_path))
+    assert len(arrow_files(tmp_path)) == 2
+    assert store._prefix("A") in names and store._prefix("C") in names and store._prefix("B") not in names
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+import stock_analysis_app as app
+from market_core.indicators import IndicatorState, indicator_frame
+
+
+def utc_seconds(ts):
+    return pd.Timestamp(ts).timestamp()
+
+
+def live_state(hist):
+    state = IndicatorState.from_closes(hist["Close"], sma_windows=(20, 50), warmup=True)
+    return {"key": None, "state": state, "bar_date": hist.index[-1].date()}
+
+
+def history(last_day, n=80):
+    index = pd.bdate_range(end=last_day, periods=n)
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.01, n)))
+    return pd.DataFrame({"Close": close}, index=index)
+
+
+def test_quote_session_uses_exchange_dates():
+    # Saturday evening in India, Friday's NSE session; Monday 08:00 IST is still before the open
+    assert str(app.quote_session("RELIANCE.NS", {"regularMarketTime": utc_seconds("2025-03-08 14:00Z")})) == "2025-03-07"
+    assert str(app.quote_session("RELIANCE.NS", {"regularMarketTime": utc_seconds("2025-03-10 02:30Z")})) == "2025-03-07"
+    assert str(app.quote_session("RELIANCE.NS", {"regularMarketTime": utc_seconds("2025-03-10 04:00Z")})) == "2025-03-10"
+    # 21:00 in New York is already the next UTC day, but still the same NYSE session
+    assert str(app.quote_session("AAPL", {"regularMarketTime": utc_seconds("2025-03-12 01:00Z")})) == "2025-03-11"
+    # Holi (NSE holiday): quotes stay on the previous session
+    assert str(app.quote_session("TCS.NS", {"regularMarketTime": utc_seconds("2025-03-14 06:00Z")})) == "2025-03-13"
+
+
+def test_same_session_quote_revises_the_last_bar():
+    hist = history("2025-03-07")
+    live = live_state(hist)
+    session = app.quote_session("RELIANCE.NS", {"regularMarketTime": utc_seconds("2025-03-08 14:00Z")})
+    price = hist["Close"].iloc[-1] * 1.02
+    values = app.apply_live_price(live, price, session)
+
+    revised = hist["Close"].copy()
+    revised.iloc[-1] = price
+    expected = indicator_frame(revised, sma_windows=(20, 50), warmup=True).iloc[-1]
+    for column in expected.index:
+        np.testing.assert_allclose(values[column], expected[column], rtol=1e-9, equal_nan=True)
+    assert live["bar_date"] == hist.index[-1].date()
+
+
+def test_new_session_quote_appends_once():
+    hist = history("2025-03-07")
+    live = live_state(hist)
+    session = app.quote_session("RELIANCE.NS", {"regularMarketTime": utc_seconds("2025-03-10 05:00Z")})
+    for price in (101.0, 102.5):
+        values = app.apply_live_price(live, price, session)
+
+    extended = pd.concat([hist["Close"], pd.Series([102.5], index=[pd.Timestamp("2025-03-10")])])
+    expected = indicator_frame(extended, sma_windows=(20, 50), warmup=True).iloc[-1]
+    for column in expected.index:
+        np.testing.assert_allclose(values[column], expected[column], rtol=1e-9, equal_nan=True)
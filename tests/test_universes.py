@@ -0,0 +1,40 @@
+import pytest
+
+from universes import (DEFAULT_UNIVERSE, available_universes, load_universe, parse_constituents,
+                       universe_label)
+
+
+def test_labels():
+    assert universe_label("nifty50.csv") == "Nifty 50"
+    assert universe_label("ind_nifty500list.csv") == "Nifty 500"
+    assert universe_label("my_watchlist.txt") == "My Watchlist"
+
+
+def test_symbol_column_csv(tmp_path):
+    # NSE's published layout: Symbol is not the first column, and the file starts with a BOM
+    (tmp_path / "ind_nifty100list.csv").write_text(
+        "Company Name,Industry,Symbol,Series,ISIN Code\n"
+        "Reliance Industries Ltd.,Oil Gas,RELIANCE,EQ,INE002A01018\n"
+        "Tata Consultancy Services Ltd.,IT,TCS,EQ,INE467B01029\n"
+        "Reliance Industries Ltd.,Oil Gas,RELIANCE,EQ,INE002A01018\n",
+        encoding="utf-8-sig",
+    )
+    (tmp_path / "watchlist.txt").write_text("# my picks\naapl\n^NSEI\nM&M.NS\n\n")
+    (tmp_path / "nifty50.csv").write_text("Symbol\nINFY.NS\n")
+    (tmp_path / "notes.md").write_text("ignored")
+
+    assert list(available_universes(str(tmp_path))) == ["Nifty 50", "Nifty 100", "Watchlist"]
+    assert load_universe("Nifty 100", str(tmp_path)) == ["RELIANCE.NS", "TCS.NS"]
+    assert load_universe("Watchlist", str(tmp_path)) == ["AAPL.NS", "^NSEI", "M&M.NS"]
+    with pytest.raises(KeyError):
+        load_universe("Nifty 200", str(tmp_path))
+
+
+def test_headerless_rows_keep_the_first_column():
+    assert parse_constituents("SBIN,State Bank\nITC.NS\n") == ["SBIN.NS", "ITC.NS"]
+
+
+def test_bundled_default_universe():
+    tickers = load_universe(DEFAULT_UNIVERSE)
+    assert "RELIANCE.NS" in tickers and all(t.endswith(".NS") for t in tickers)
+    assert len(set(tickers)) == len(tickers)